@@ -1,121 +1,171 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from pathlib import Path
-import shutil
-import torch
-
-from backend.ingestion.detect import detect_file_type
-from backend.ingestion.validate import validate_file
-from backend.ingestion.metadata import extract_metadata
-from backend.runtime.workspace import create_case_workspace
-from backend.gatekeeper.preprocess import preprocess_gatekeeper
-from backend.gatekeeper.infer import infer_gatekeeper
-from backend.router import route_case
-
-from backend.brain.preprocess import preprocess_brain_case
-from backend.chest.preprocess import preprocess_chest_image
-from backend.bone.preprocess import preprocess_bone_image
-
-from backend.brain.infer import infer_brain
-from backend.chest.infer import infer_chest
-from backend.bone.infer import infer_bone
-
-from backend.postprocess.aggregate import (
-    postprocess_brain_logits,
-    postprocess_chest_probs,
-    postprocess_bone_probs,
-)
-
-from backend.results.schema import (
-    build_brain_result,
-    build_chest_result,
-    build_bone_result,
-    result_to_dict,
-)
+import json
+from typing import List
 
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from backend.bulk import run_bulk_pipeline
+from backend.core.config import BATCH_MAX_EXTRACTED_MB, BATCH_MAX_ITEMS, BATCH_MAX_UPLOAD_MB
+from backend.ingestion.archive import is_archive, spool_archive
+from backend.ingestion.spool import SpooledUpload, UploadTooLargeError, spool_upload
+from backend.pipeline import run_case_pipeline
+from backend.router import RoutingError
+from backend.runtime.cache import get_result_cache, result_cache_key
+from backend.runtime.executor import run_stage
+from backend.runtime.jobs import JobQueueFullError, get_job_manager
+from backend.runtime.warmup import readiness
+
+from backend.core import metrics
 from backend.core.logging import get_logger
-from backend.core.config import (
-    BRAIN_MODEL_VERSION,
-    CHEST_MODEL_VERSION,
-    BONE_MODEL_VERSION,
-)
 
 router = APIRouter()
 logger = get_logger(__name__)
 
-DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+async def _spool(file: UploadFile):
+    """
+    Spool upload (single pass: hash, sniff, size limit)
+    """
+    try:
+        return await run_stage("upload", spool_upload, file.file, file.filename)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/analyze")
 async def analyze(file: UploadFile = File(...)):
-    # -------------------------------------------------
-    # Save uploaded file
-    # -------------------------------------------------
-    suffix = Path(file.filename).suffix
-    temp_path = Path("runtime/tmp") / f"upload{suffix}"
-    temp_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(temp_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    # -------------------------------------------------
-    # Ingestion
-    # -------------------------------------------------
-    detect_file_type(temp_path)
-    validate_file(temp_path)
-    case_info = extract_metadata(temp_path)
-
-    case_dir = create_case_workspace(case_info, temp_path)
-    logger.info(f"Case workspace created: {case_dir}")
-
-    # -------------------------------------------------
-    # Gatekeeper
-    # -------------------------------------------------
-    gate_tensor = preprocess_gatekeeper(case_dir)
-    gate_pred, gate_conf = infer_gatekeeper(gate_tensor, DEVICE)
-
-    route = route_case(gate_pred, gate_conf)
-    logger.info(f"Route locked: {route}")
+    upload = await _spool(file)
 
     # -------------------------------------------------
-    # Specialist pipelines
+    # Result cache (identical bytes + model versions)
     # -------------------------------------------------
-    if route == "brain":
-        volume = preprocess_brain_case(case_dir).unsqueeze(0)
-        logits = infer_brain(volume, DEVICE)
-        mask, conf = postprocess_brain_logits(logits)
-
-        result = build_brain_result(
-            case_id=case_info.case_id,
-            confidence=conf,
-            model_version=BRAIN_MODEL_VERSION,
-            tumor_present=conf > 0.5,
-        )
-
-    elif route == "chest":
-        tensor = preprocess_chest_image(temp_path).unsqueeze(0)
-        probs = infer_chest(tensor, DEVICE)
-        _, conf = postprocess_chest_probs(probs)
-
-        result = build_chest_result(
-            case_id=case_info.case_id,
-            confidence=conf,
-            model_version=CHEST_MODEL_VERSION,
-            abnormal=conf > 0.5,
+    try:
+        return await get_result_cache().get_or_compute(
+            result_cache_key(upload.sha256),
+            lambda: run_case_pipeline(upload),
         )
-
-    elif route == "bone":
-        tensor = preprocess_bone_image(temp_path)
-        probs = infer_bone(tensor, DEVICE)
-        _, conf = postprocess_bone_probs(probs)
-
-        result = build_bone_result(
-            case_id=case_info.case_id,
-            confidence=conf,
-            model_version=BONE_MODEL_VERSION,
-            fracture=conf > 0.5,
-        )
-
-    else:
-        raise HTTPException(status_code=400, detail="Ambiguous case")
-
-    return result_to_dict(result)
+    except RoutingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        # Cache hits and deduplicated requests never claim their spool file
+        upload.path.unlink(missing_ok=True)
+
+
+def _discard(entries: list):
+    for _, upload in entries:
+        if isinstance(upload, SpooledUpload):
+            upload.path.unlink(missing_ok=True)
+
+
+def _spool_bulk(files: List[UploadFile]) -> list:
+    """
+    Spool every uploaded file, expanding archives, into
+    (filename, SpooledUpload | Exception) entries. Archive members share
+    one decompressed-size budget. If the batch is rejected partway,
+    everything spooled so far is removed.
+    """
+    entries = []
+    extracted = 0
+    try:
+        for file in files:
+            if is_archive(file.filename):
+                archive = spool_upload(
+                    file.file,
+                    file.filename,
+                    max_bytes=BATCH_MAX_UPLOAD_MB * 1024 * 1024,
+                    sniff=False,
+                )
+                try:
+                    members = spool_archive(
+                        archive.path,
+                        max_members=BATCH_MAX_ITEMS - len(entries),
+                        max_bytes=BATCH_MAX_EXTRACTED_MB * 1024 * 1024 - extracted,
+                    )
+                    # One at a time, so members spooled before a failure are tracked
+                    for entry in members:
+                        entries.append(entry)
+                        if isinstance(entry[1], SpooledUpload):
+                            extracted += entry[1].size
+                finally:
+                    archive.path.unlink(missing_ok=True)
+                continue
+
+            if len(entries) >= BATCH_MAX_ITEMS:
+                raise ValueError(f"Batch has more than {BATCH_MAX_ITEMS} files")
+
+            try:
+                entries.append((file.filename, spool_upload(file.file, file.filename)))
+            except ValueError as e:
+                entries.append((file.filename, e))
+
+    except BaseException:
+        _discard(entries)
+        raise
+
+    return entries
+
+
+@router.post("/analyze/batch")
+async def analyze_batch(files: List[UploadFile] = File(...)):
+    """
+    Many files (or .zip / .tar archives) in one request. Streams one
+    NDJSON record per item as it completes.
+    """
+    try:
+        entries = await run_stage("upload", _spool_bulk, files)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        async for record in run_bulk_pipeline(entries):
+            yield json.dumps(record) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    upload = await _spool(file)
+
+    try:
+        job = await get_job_manager().submit(upload)
+    except JobQueueFullError as e:
+        upload.path.unlink(missing_ok=True)
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_public()
+
+
+@router.get("/healthz/live")
+def liveness():
+    return {"status": "ok"}
+
+
+@router.get("/healthz/ready")
+def readiness_probe():
+    """
+    200 only once every model is loaded and warm (when warm-up is on),
+    so the load balancer never routes to a cold worker.
+    """
+    ready = readiness.ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "models": readiness.snapshot()},
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def export_metrics():
+    return metrics.render_prometheus()
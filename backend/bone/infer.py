@@ -3,18 +3,15 @@ import torch.nn.functional as F
 from torchvision import models
 
 from backend.core.logging import get_logger
+from backend.runtime.backends import with_backend
+from backend.runtime.registry import model_registry
 from backend.core.config import BONE_MODEL_PATH
+from backend.runtime.batching import get_batcher
 
 logger = get_logger(__name__)
 
-_model = None
-
-
-def load_bone_model(device: torch.device):
-    global _model
-    if _model is not None:
-        return _model
 
+def build_bone_model(device: torch.device) -> torch.nn.Module:
     logger.info("Loading bone model")
 
     model = models.resnet18(weights=None)
@@ -24,22 +21,35 @@ def load_bone_model(device: torch.device):
     model.load_state_dict(state)
     model.to(device)
     model.eval()
+    return model
+
+
+model_registry.register("bone", with_backend("bone", build_bone_model))
 
-    _model = model
-    return _model
 
+def load_bone_model(device: torch.device) -> torch.nn.Module:
+    return model_registry.get("bone", device)
 
-def infer_bone(tensor: torch.Tensor, device: torch.device):
+
+def forward_bone(batch: torch.Tensor, device: torch.device) -> torch.Tensor:
     """
-    tensor: (3, 224, 224)
+    batch: (N, 3, 224, 224)
+    returns: per-image probabilities (N, 2)
     """
-    model = load_bone_model(device)
-
-    with torch.no_grad():
-        tensor = tensor.unsqueeze(0).to(device)
-        logits = model(tensor)
+    with model_registry.acquire("bone", device) as model, torch.no_grad():
+        batch = batch.to(device)
+        logits = model(batch)
         probs = F.softmax(logits, dim=1)
 
+    return probs
+
+
+async def infer_bone(tensor: torch.Tensor, device: torch.device):
+    """
+    tensor: (3, 224, 224)
+    """
+    probs = await get_batcher("bone", forward_bone, device).run_async(tensor.unsqueeze(0))
+
     confidence = probs.max().item()
     logger.info(f"Bone confidence: {confidence:.3f}")
     return probs
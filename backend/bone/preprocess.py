@@ -1,72 +1,55 @@
-from pathlib import Path
+from typing import List
+
 import numpy as np
 import torch
-from PIL import Image
-import pydicom
-from torchvision import transforms
 
 from backend.core.logging import get_logger
+from backend.image.intensity import ValueFn, map_values, percentiles
+from backend.image.radiograph import RadiographSource, preprocess_radiographs
 
 logger = get_logger(__name__)
 
-# -----------------------------
-# Locked constants
-# -----------------------------
-IMG_SIZE = 224
-IMAGENET_MEAN = [0.485, 0.456, 0.406]
-IMAGENET_STD = [0.229, 0.224, 0.225]
-
-_transform = transforms.Compose([
-    transforms.Resize((IMG_SIZE, IMG_SIZE)),
-    transforms.ToTensor(),
-    transforms.Normalize(IMAGENET_MEAN, IMAGENET_STD),
-])
 
+def clip_to_uint8(pixels: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Clip to [low, high] and scale to 0–255.
+    """
+    pixels = np.clip(pixels, low, high)
+    pixels = (pixels - low) / (high - low + 1e-6)
+    return (pixels * 255.0).astype(np.uint8)
 
-def load_dicom(path: Path) -> Image.Image:
-    ds = pydicom.dcmread(path)
-    pixels = ds.pixel_array.astype(np.float32)
-
-    if hasattr(ds, "RescaleSlope"):
-        pixels *= float(ds.RescaleSlope)
-    if hasattr(ds, "RescaleIntercept"):
-        pixels += float(ds.RescaleIntercept)
 
-    # Percentile clipping (bone-safe)
-    p1, p99 = np.percentile(pixels, (1, 99))
-    pixels = np.clip(pixels, p1, p99)
-    pixels = (pixels - p1) / (p99 - p1 + 1e-6)
-    pixels = (pixels * 255.0).astype(np.uint8)
+def percentile_clip(pixels: np.ndarray, rescale: ValueFn) -> np.ndarray:
+    """
+    Rescale + percentile clipping (bone-safe) of stored DICOM pixels.
+    Percentiles come from the value histogram and the clip is one
+    lookup-table gather for 8/16-bit data.
+    """
+    p1, p99 = percentiles(pixels, (1, 99), rescale)
+    return map_values(pixels, lambda values: clip_to_uint8(rescale(values), p1, p99))
 
-    return Image.fromarray(pixels).convert("RGB")
 
+def preprocess_bone_images(images: List[RadiographSource]) -> torch.Tensor:
+    """
+    Preprocess a batch of bone X-ray images (DICOM or PNG).
 
-def load_png(path: Path) -> Image.Image:
-    return Image.open(path).convert("RGB")
+    Output:
+      Tensor shape: (N, 3, 224, 224)
+    """
+    # Percentiles are taken over full-resolution stored values
+    batch = preprocess_radiographs(images, percentile_clip, "bone", elementwise=False)
+    logger.info(f"Bone tensor shape: {tuple(batch.shape)}")
+    return batch
 
 
-def preprocess_bone_image(image_path: Path) -> torch.Tensor:
+def preprocess_bone_image(image: RadiographSource) -> torch.Tensor:
     """
     Preprocess bone X-ray image.
 
     Input:
-      DICOM or PNG
+      DICOM or PNG, as a path or the request's case context
 
     Output:
       Tensor shape: (3, 224, 224)
     """
-
-    if image_path.suffix.lower() == ".dcm":
-        logger.info("Bone preprocessing: DICOM input")
-        img = load_dicom(image_path)
-
-    elif image_path.suffix.lower() == ".png":
-        logger.info("Bone preprocessing: PNG input")
-        img = load_png(image_path)
-
-    else:
-        raise ValueError(f"Unsupported bone format: {image_path}")
-
-    tensor = _transform(img)
-    logger.info(f"Bone tensor shape: {tuple(tensor.shape)}")
-    return tensor
+    return preprocess_bone_images([image])[0]
@@ -1,19 +1,42 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
 import torch
+from monai.inferers import sliding_window_inference
 from monai.networks.nets import UNet
 
+from backend.brain.preprocess import TARGET_SIZE
+from backend.core import metrics
 from backend.core.logging import get_logger
-from backend.core.config import BRAIN_MODEL_PATH
+from backend.runtime.backends import with_backend
+from backend.runtime.registry import model_registry
+from backend.core.config import (
+    BRAIN_MODEL_PATH,
+    BRAIN_SW_MAX_TILES_PER_BATCH,
+    BRAIN_SW_OVERLAP,
+)
 
 logger = get_logger(__name__)
 
-_model = None
+_SW_TILES_PER_SECOND = metrics.gauge(
+    "spectra_brain_sliding_window_tiles_per_second",
+    "Tile throughput of the last sliding-window brain inference",
+)
+_SW_PEAK_BYTES = metrics.gauge(
+    "spectra_brain_sliding_window_peak_bytes",
+    "Peak memory added by the last sliding-window brain inference "
+    "(CUDA: allocator peak, CPU: sampled RSS above the starting RSS)",
+)
 
+# How often resident memory is sampled during a CPU sliding-window run
+RSS_SAMPLE_INTERVAL_S = 0.01
 
-def load_brain_model(device: torch.device):
-    global _model
-    if _model is not None:
-        return _model
 
+def build_brain_model(device: torch.device) -> torch.nn.Module:
     logger.info("Loading brain model")
 
     model = UNet(
@@ -28,18 +51,21 @@ def load_brain_model(device: torch.device):
     model.load_state_dict(state)
     model.to(device)
     model.eval()
+    return model
+
+
+model_registry.register("brain", with_backend("brain", build_brain_model))
+
 
-    _model = model
-    return _model
+def load_brain_model(device: torch.device) -> torch.nn.Module:
+    return model_registry.get("brain", device)
 
 
 def infer_brain(volume: torch.Tensor, device: torch.device):
     """
     volume: (1, 4, 128, 128, 128)
     """
-    model = load_brain_model(device)
-
-    with torch.no_grad():
+    with model_registry.acquire("brain", device) as model, torch.no_grad():
         volume = volume.to(device)
         logits = model(volume)
 
@@ -47,3 +73,112 @@ def infer_brain(volume: torch.Tensor, device: torch.device):
     return logits
 
 
+# -------------------------------------------------
+# Sliding-window (full resolution) inference
+# -------------------------------------------------
+
+def count_tiles(spatial_shape, roi_size=TARGET_SIZE, overlap: float = BRAIN_SW_OVERLAP) -> int:
+    """
+    Number of roi_size tiles needed to cover spatial_shape with the given
+    overlap (same tiling rule as MONAI's sliding_window_inference).
+    """
+    tiles = 1
+    for size, roi in zip(spatial_shape, roi_size):
+        if size <= roi:
+            continue
+        interval = max(int(roi * (1 - overlap)), 1)
+        tiles *= math.ceil((size - roi) / interval) + 1
+    return tiles
+
+
+def _current_rss() -> Optional[int]:
+    # Linux: second field of statm is resident pages
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@contextmanager
+def _track_peak_memory(device: torch.device) -> Iterator[List[Optional[int]]]:
+    """
+    Peak memory added by the enclosed block, stored in the yielded
+    one-item list on exit: the CUDA allocator peak, or on CPU the highest
+    sampled RSS above the RSS at entry (None where RSS is unavailable).
+    """
+    result: List[Optional[int]] = [None]
+
+    if device.type == "cuda":
+        torch.cuda.reset_peak_memory_stats(device)
+        baseline = torch.cuda.memory_allocated(device)
+        try:
+            yield result
+        finally:
+            result[0] = torch.cuda.max_memory_allocated(device) - baseline
+        return
+
+    baseline = _current_rss()
+    if baseline is None:
+        yield result
+        return
+
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.wait(RSS_SAMPLE_INTERVAL_S):
+            peak = max(peak, _current_rss() or 0)
+
+    sampler = threading.Thread(target=sample, name="rss-sampler", daemon=True)
+    sampler.start()
+    try:
+        yield result
+    finally:
+        done.set()
+        sampler.join()
+        peak = max(peak, _current_rss() or 0)
+        result[0] = peak - baseline
+
+
+def infer_brain_sliding_window(
+    volume: torch.Tensor,
+    device: torch.device,
+    overlap: float = BRAIN_SW_OVERLAP,
+    max_tiles_per_batch: int = BRAIN_SW_MAX_TILES_PER_BATCH,
+):
+    """
+    volume: (1, 4, D, H, W), each spatial dim >= 128
+    returns: logits (1, 3, D, H, W)
+
+    Covers the whole volume with overlapping 128³ tiles, runs at most
+    max_tiles_per_batch tiles per forward pass and blends the overlapping
+    logits with Gaussian weights.
+    """
+    tiles = count_tiles(volume.shape[2:], TARGET_SIZE, overlap)
+
+    with model_registry.acquire("brain", device) as model, torch.no_grad():
+        with _track_peak_memory(device) as peak:
+            # Timed after acquire, so a cold checkpoint load is not counted
+            started = time.perf_counter()
+            logits = sliding_window_inference(
+                inputs=volume.to(device),
+                roi_size=TARGET_SIZE,
+                sw_batch_size=max_tiles_per_batch,
+                predictor=model,
+                overlap=overlap,
+                mode="gaussian",
+            )
+            elapsed = time.perf_counter() - started
+
+    _SW_TILES_PER_SECOND.set(tiles / elapsed)
+    peak_text = "n/a"
+    if peak[0] is not None:
+        _SW_PEAK_BYTES.set(peak[0])
+        peak_text = f"{peak[0] / 1e6:.0f} MB"
+    logger.info(
+        f"Brain sliding window: {tuple(volume.shape[2:])} in {tiles} tiles "
+        f"({tiles / elapsed:.2f} tiles/s, peak +{peak_text})"
+    )
+    return logits
@@ -1,9 +1,18 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 import torch
 import numpy as np
 import nibabel as nib
 
+from monai.data import MetaTensor
+from monai.data.utils import compute_shape_offset, zoom_affine
 from monai.transforms import (
+    SpatialCrop,
     Compose,
     LoadImaged,
     EnsureChannelFirstd,
@@ -14,10 +23,23 @@ from monai.transforms import (
     ToTensord,
 )
 
+from backend.core import metrics
+from backend.core.config import (
+    BRAIN_FOREGROUND_CROP,
+    BRAIN_FOREGROUND_MARGIN,
+    BRAIN_MODALITY_WORKERS,
+)
 from backend.core.logging import get_logger
+from backend.runtime.volume_cache import get_volume_cache, volume_cache_key
 
 logger = get_logger(__name__)
 
+_MODALITY_SECONDS = metrics.histogram(
+    "spectra_brain_modality_seconds",
+    "Per-modality brain preprocessing time by step (load | crop | resample | normalize)",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
 # -----------------------------
 # Locked brain preprocessing config
 # -----------------------------
@@ -26,54 +48,380 @@ TARGET_SIZE = (128, 128, 128)
 
 MODALITIES = ["t1", "t1ce", "t2", "flair"]
 
+# Part of the volume cache key: bump when the transform chain changes
+PREPROCESS_FINGERPRINT = (
+    f"brain-preprocess-2|spacing={TARGET_SPACING}|size={TARGET_SIZE}|"
+    f"modalities={','.join(MODALITIES)}"
+)
+
 
-def build_brain_preprocess():
+def build_brain_preprocess(keys=MODALITIES, crop: bool = True):
     """
     Returns MONAI preprocessing pipeline.
     This MUST match training preprocessing exactly.
+
+    Every transform acts on each key independently, so the pipeline for
+    a single modality gives the same result as the all-modality one.
+
+    crop=False keeps the whole resampled volume (padded up to at least
+    TARGET_SIZE) for sliding-window inference.
     """
 
+    cropping = [
+        # Center crop
+        CenterSpatialCropd(
+            keys=keys,
+            roi_size=TARGET_SIZE,
+        ),
+    ] if crop else []
+
     transforms = Compose([
         # Load NIfTI files
-        LoadImaged(keys=MODALITIES, image_only=True),
+        LoadImaged(keys=keys, image_only=True),
 
         # (D, H, W) -> (1, D, H, W)
-        EnsureChannelFirstd(keys=MODALITIES),
+        EnsureChannelFirstd(keys=keys),
 
         # Resample to 1mm³
         Spacingd(
-            keys=MODALITIES,
+            keys=keys,
             pixdim=TARGET_SPACING,
             mode="bilinear",
         ),
 
         # Z-score normalization (non-zero voxels only)
         NormalizeIntensityd(
-            keys=MODALITIES,
+            keys=keys,
             nonzero=True,
             channel_wise=True,
         ),
 
-        # Center crop
-        CenterSpatialCropd(
-            keys=MODALITIES,
-            roi_size=TARGET_SIZE,
-        ),
+        *cropping,
 
         # Pad if volume is smaller
         SpatialPadd(
-            keys=MODALITIES,
+            keys=keys,
             spatial_size=TARGET_SIZE,
         ),
 
         # Convert to torch.Tensor
-        ToTensord(keys=MODALITIES),
+        ToTensord(keys=keys),
     ])
 
     return transforms
 
 
-def preprocess_brain_case(case_dir: Path) -> torch.Tensor:
+# Transform class -> timing step reported per modality
+_STEPS = {
+    "LoadImaged": "load",
+    "EnsureChannelFirstd": "load",
+    "Spacingd": "resample",
+}
+
+
+@lru_cache(maxsize=None)
+def get_brain_preprocess(modality: str, crop: bool = True) -> Compose:
+    """
+    Single-modality preprocessing pipeline, built once per process.
+    """
+    return build_brain_preprocess(keys=[modality], crop=crop)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=BRAIN_MODALITY_WORKERS,
+                thread_name_prefix="brain-modality",
+            )
+        return _pool
+
+
+def _run_transforms(transforms, data: dict, timings: Dict[str, float]) -> dict:
+    for transform in transforms:
+        started = time.perf_counter()
+        data = transform(data)
+        step = _STEPS.get(type(transform).__name__, "normalize")
+        timings[step] = timings.get(step, 0.0) + time.perf_counter() - started
+    return data
+
+
+def _record_timings(modality: str, timings: Dict[str, float]):
+    for step, seconds in timings.items():
+        _MODALITY_SECONDS.observe(seconds, modality=modality, step=step)
+
+
+def _preprocess_modality(
+    modality: str,
+    path: str,
+    crop: bool,
+) -> Tuple[torch.Tensor, Dict[str, float]]:
+    """
+    Run one modality through its pipeline, timing each step.
+    Gzip decompression and NIfTI decoding count towards "load".
+    """
+    timings: Dict[str, float] = {}
+    data = _run_transforms(
+        get_brain_preprocess(modality, crop).transforms, {modality: path}, timings
+    )
+    _record_timings(modality, timings)
+    return data[modality], timings
+
+
+# -------------------------------------------------
+# Foreground-cropped pipeline
+# -------------------------------------------------
+
+def _stage(modality: str, crop: bool, *types) -> list:
+    return [t for t in get_brain_preprocess(modality, crop).transforms if isinstance(t, types)]
+
+
+def _foreground_box(images: List[torch.Tensor], margin: int) -> Optional[Tuple[slice, ...]]:
+    """
+    Non-zero bounding box over all (1, D, H, W) images, grown by margin
+    voxels. None if the images differ in shape or are all empty.
+    """
+    shape = images[0].shape[1:]
+    if any(image.shape[1:] != shape for image in images):
+        return None
+
+    foreground = torch.zeros(shape, dtype=torch.bool)
+    for image in images:
+        foreground |= image[0] != 0
+    if not foreground.any():
+        return None
+
+    box = []
+    for axis, size in enumerate(foreground.shape):
+        others = tuple(a for a in range(foreground.ndim) if a != axis)
+        hits = torch.nonzero(foreground.any(dim=others)).flatten()
+        box.append(slice(
+            max(hits[0].item() - margin, 0),
+            min(hits[-1].item() + margin + 1, size),
+        ))
+    return tuple(box)
+
+
+def _full_field_grid(image: torch.Tensor) -> Tuple[Tuple[int, ...], np.ndarray]:
+    """
+    Output shape and affine Spacingd would produce for the uncropped image.
+    """
+    affine = np.asarray(image.affine, dtype=np.float64)
+    target = zoom_affine(affine, TARGET_SPACING, diagonal=False)
+    shape, offset = compute_shape_offset(image.shape[1:], affine, target, False)
+    target[:3, -1] = offset[:3]
+    return tuple(int(s) for s in shape), target
+
+
+def _output_window(shape: Tuple[int, ...], crop: bool) -> List[Tuple[int, int]]:
+    """
+    (start, size) per axis of the final tensor in full-field resampled
+    coordinates: CenterSpatialCropd (if crop) followed by symmetric
+    SpatialPadd up to TARGET_SIZE.
+    """
+    window = []
+    for size, roi in zip(shape, TARGET_SIZE):
+        if size < roi:
+            window.append((-((roi - size) // 2), roi))
+        elif crop:
+            window.append((size // 2 - roi // 2, roi))
+        else:
+            window.append((0, size))
+    return window
+
+
+def _place(image: torch.Tensor, origin: np.ndarray, window: List[Tuple[int, int]]) -> torch.Tensor:
+    """
+    Copy the cropped-and-resampled image (whose voxel 0 sits at `origin`
+    in full-field coordinates) into the output window; everything outside
+    the foreground box is background (zero).
+    """
+    out = torch.zeros((image.shape[0],) + tuple(size for _, size in window), dtype=image.dtype)
+
+    src, dst = [slice(None)], [slice(None)]
+    for (start, size), o, extent in zip(window, origin, image.shape[1:]):
+        lo = max(start, o)
+        hi = min(start + size, o + extent)
+        if hi <= lo:
+            return out
+        src.append(slice(lo - o, hi - o))
+        dst.append(slice(lo - start, hi - start))
+
+    if isinstance(image, MetaTensor):
+        image = image.as_tensor()
+    out[tuple(dst)] = image[tuple(src)]
+    return out
+
+
+def _load_modality(modality: str, path: str, crop: bool, timings: Dict[str, float]) -> torch.Tensor:
+    loaders = _stage(modality, crop, LoadImaged, EnsureChannelFirstd)
+    return _run_transforms(loaders, {modality: path}, timings)[modality]
+
+
+def _grid_region(
+    box: Tuple[slice, ...],
+    source_affine: np.ndarray,
+    grid: np.ndarray,
+    shape: Tuple[int, ...],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    [start, stop) in full-field resampled voxels covering the foreground
+    box, plus one voxel for the interpolation footprint.
+    """
+    corners = np.array([
+        [x, y, z, 1.0]
+        for x in (box[0].start, box[0].stop - 1)
+        for y in (box[1].start, box[1].stop - 1)
+        for z in (box[2].start, box[2].stop - 1)
+    ]).T
+    voxels = np.linalg.solve(grid, source_affine @ corners)[:3]
+
+    start = np.maximum(np.floor(voxels.min(axis=1)).astype(int) - 1, 0)
+    stop = np.minimum(np.ceil(voxels.max(axis=1)).astype(int) + 2, shape)
+    return start, stop
+
+
+def _resample_box(
+    modality: str,
+    image: torch.Tensor,
+    box: Tuple[slice, ...],
+    crop: bool,
+    timings: Dict[str, float],
+) -> torch.Tensor:
+    """
+    Resample only the foreground box onto the exact voxel grid Spacingd
+    would use for the whole field of view, then normalize and place it
+    in the final window.
+    """
+    shape, grid = _full_field_grid(image)
+    source_affine = np.asarray(image.affine, dtype=np.float64)
+
+    # Spacingd leaves images already on the target grid untouched (MONAI's
+    # affine tolerance is 1e-3); mirror that, or resampling round-off would
+    # turn background into tiny non-zeros that NormalizeIntensityd counts
+    on_grid = shape == tuple(image.shape[1:]) and np.allclose(grid, source_affine, atol=1e-3)
+
+    started = time.perf_counter()
+    image = SpatialCrop(roi_slices=box)(image)
+    if on_grid:
+        start = np.array([b.start for b in box])
+    else:
+        start, stop = _grid_region(box, source_affine, grid, shape)
+    timings["crop"] = time.perf_counter() - started
+
+    if not on_grid:
+        # Same sample points and settings as the chain's Spacingd,
+        # restricted to the box (a sub-block of the full-field grid)
+        (spacing,) = _stage(modality, crop, Spacingd)
+        region = grid.copy()
+        region[:3, -1] = grid[:3, :3] @ start + grid[:3, -1]
+
+        started = time.perf_counter()
+        image = spacing.spacing_transform.sp_resample(
+            image,
+            dst_affine=torch.as_tensor(region),
+            spatial_size=[int(n) for n in stop - start],
+            mode=spacing.mode[0],
+            padding_mode=spacing.padding_mode[0],
+            align_corners=spacing.align_corners[0],
+            dtype=spacing.dtype[0],
+        )
+        timings["resample"] = time.perf_counter() - started
+
+    normalize = _stage(modality, crop, NormalizeIntensityd)
+    image = _run_transforms(normalize, {modality: image}, timings)[modality]
+
+    started = time.perf_counter()
+    out = _place(image, start, _output_window(shape, crop))
+    timings["crop"] += time.perf_counter() - started
+    return out
+
+
+def _finish_modality(modality: str, image: torch.Tensor, crop: bool, timings: Dict[str, float]) -> torch.Tensor:
+    """
+    Rest of the standard chain (Spacingd onwards) on an already loaded image.
+    """
+    rest = [
+        t for t in get_brain_preprocess(modality, crop).transforms
+        if not isinstance(t, (LoadImaged, EnsureChannelFirstd))
+    ]
+    return _run_transforms(rest, {modality: image}, timings)[modality]
+
+
+def _run_foreground_preprocess(data: dict, crop: bool) -> Dict[str, Tuple[torch.Tensor, Dict[str, float]]]:
+    """
+    Load all modalities, crop them to their shared non-zero bounding box,
+    then resample and normalize only the box (modalities in parallel).
+    Mismatched shapes or an empty case run the standard chain instead.
+    """
+    pool = _get_pool()
+    timings = {mod: {} for mod in MODALITIES}
+
+    loaded = {
+        mod: pool.submit(_load_modality, mod, data[mod], crop, timings[mod])
+        for mod in MODALITIES
+    }
+    images = {mod: future.result() for mod, future in loaded.items()}
+
+    started = time.perf_counter()
+    box = _foreground_box(list(images.values()), BRAIN_FOREGROUND_MARGIN)
+    box_seconds = time.perf_counter() - started
+
+    if box is None:
+        finished = {
+            mod: pool.submit(_finish_modality, mod, images[mod], crop, timings[mod])
+            for mod in MODALITIES
+        }
+    else:
+        logger.info(
+            f"Brain foreground box: {[(s.start, s.stop) for s in box]} "
+            f"of {tuple(images[MODALITIES[0]].shape[1:])}"
+        )
+        finished = {
+            mod: pool.submit(_resample_box, mod, images[mod], box, crop, timings[mod])
+            for mod in MODALITIES
+        }
+
+    results = {}
+    for mod, future in finished.items():
+        tensor = future.result()
+        timings[mod]["crop"] = timings[mod].get("crop", 0.0) + box_seconds
+        _record_timings(mod, timings[mod])
+        results[mod] = (tensor, timings[mod])
+    return results
+
+
+def _run_brain_preprocess(data: dict, crop: bool = True) -> torch.Tensor:
+    """
+    Decode, resample and normalize the modalities concurrently.
+    """
+    if BRAIN_FOREGROUND_CROP:
+        results = _run_foreground_preprocess(data, crop)
+    else:
+        pool = _get_pool()
+        futures = {mod: pool.submit(_preprocess_modality, mod, data[mod], crop) for mod in MODALITIES}
+        results = {mod: future.result() for mod, future in futures.items()}
+
+    logger.info(
+        "Brain modality timings: "
+        + ", ".join(
+            f"{mod}("
+            + " ".join(f"{step}={seconds:.2f}s" for step, seconds in timings.items())
+            + ")"
+            for mod, (_, timings) in results.items()
+        )
+    )
+
+    # Join the (1, D, H, W) channels: (4, 128, 128, 128)
+    return torch.cat([results[m][0] for m in MODALITIES], dim=0)
+
+
+def preprocess_brain_case(case_dir: Path, crop: bool = True) -> torch.Tensor:
     """
     Preprocess a single brain case directory.
 
@@ -85,6 +433,10 @@ def preprocess_brain_case(case_dir: Path) -> torch.Tensor:
 
     Returns:
       Tensor shape: (4, 128, 128, 128)
+      (4, D, H, W) with D, H, W >= 128 when crop=False
+
+    Results are cached on disk by modality content + preprocessing
+    fingerprint, so reprocessing a study skips loading and resampling.
     """
 
     # Locate modality files
@@ -97,11 +449,15 @@ def preprocess_brain_case(case_dir: Path) -> torch.Tensor:
 
     logger.info(f"Brain preprocessing started for {case_dir.name}")
 
-    transforms = build_brain_preprocess()
-    out = transforms(data)
-
-    # Stack channels: (4, 128, 128, 128)
-    tensor = torch.stack([out[m] for m in MODALITIES], dim=0)
+    cache = get_volume_cache()
+    if cache is None:
+        tensor = _run_brain_preprocess(data, crop)
+    else:
+        key = volume_cache_key(
+            {mod: Path(path) for mod, path in data.items()},
+            f"{PREPROCESS_FINGERPRINT}|crop={crop}|foreground={BRAIN_FOREGROUND_CROP}",
+        )
+        tensor = cache.get_or_compute(key, lambda: _run_brain_preprocess(data, crop))
 
     logger.info(f"Brain tensor shape: {tuple(tensor.shape)}")
 
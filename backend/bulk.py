@@ -0,0 +1,339 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import torch
+
+from backend.core.config import BATCH_WINDOW_ITEMS, BULK_BATCH_SIZE
+from backend.core.logging import get_logger
+from backend.ingestion.metadata import CaseInfo
+from backend.ingestion.spool import SpooledUpload
+from backend.gatekeeper.preprocess import preprocess_gatekeeper
+from backend.gatekeeper.infer import (
+    adaptive_steps,
+    forward_gatekeeper,
+    is_confident,
+    record_slices_used,
+    summarize_gatekeeper,
+)
+from backend.chest.preprocess import is_multiframe, preprocess_chest_image
+from backend.chest.infer import forward_chest
+from backend.bone.preprocess import preprocess_bone_image
+from backend.bone.infer import forward_bone
+from backend.pipeline import (
+    DEVICE,
+    bone_result,
+    chest_result,
+    ingest_upload,
+    run_brain_case,
+    run_chest_frames_case,
+)
+from backend.results.schema import result_to_dict
+from backend.router import route_case
+from backend.runtime.cache import get_result_cache, result_cache_key
+from backend.runtime.executor import run_stage
+
+logger = get_logger(__name__)
+
+_SPECIALISTS_2D = {
+    "chest": (preprocess_chest_image, forward_chest, chest_result),
+    "bone": (preprocess_bone_image, forward_bone, bone_result),
+}
+
+
+@dataclass
+class _Item:
+    index: int
+    filename: str
+    upload: Optional[SpooledUpload] = None
+    case_info: Optional[CaseInfo] = None
+    tensor: Optional[torch.Tensor] = None
+    route: Optional[str] = None
+    # Gatekeeper slice steps still to run, and probabilities so far
+    gate_steps: Optional[List[List[int]]] = None
+    gate_probs: Optional[List[torch.Tensor]] = None
+
+
+def _ok(item: _Item, result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "index": item.index,
+        "filename": item.filename,
+        "status": "ok",
+        "result": result,
+    }
+
+
+def _error(item: _Item, error: Exception) -> Dict[str, Any]:
+    return {
+        "index": item.index,
+        "filename": item.filename,
+        "status": "error",
+        "error": str(error) or type(error).__name__,
+    }
+
+
+def _release(item: _Item):
+    """
+    Drop the item's decoded pixels once no later stage needs them.
+    """
+    if item.case_info is not None:
+        item.case_info.context.release()
+
+
+def _chunks(
+    items: List[_Item],
+    max_rows: int,
+    rows_of: Callable[[_Item], int] = lambda item: len(item.tensor),
+) -> Iterable[List[_Item]]:
+    """
+    Group items so each chunk's tensors total at most max_rows rows
+    (a single oversized item still forms its own chunk).
+    """
+    chunk, rows = [], 0
+    for item in items:
+        n = rows_of(item)
+        if chunk and rows + n > max_rows:
+            yield chunk
+            chunk, rows = [], 0
+        chunk.append(item)
+        rows += n
+    if chunk:
+        yield chunk
+
+
+class _BulkRun:
+    def __init__(self, out: asyncio.Queue):
+        self.out = out
+        self.cache = get_result_cache()
+
+    async def emit_ok(self, item: _Item, result: Dict[str, Any], cache_key: Optional[str] = None):
+        if cache_key is not None:
+            await run_stage("cache_write", self.cache.put, cache_key, result)
+        await self.out.put(_ok(item, result))
+
+    async def emit_error(self, item: _Item, error: Exception):
+        logger.warning(f"Bulk item failed: {item.filename}: {error}")
+        _release(item)
+        await self.out.put(_error(item, error))
+
+    # -------------------------------------------------
+    # Stages
+    # -------------------------------------------------
+
+    async def prepare(self, item: _Item) -> bool:
+        """
+        Cache lookup, ingestion and gatekeeper preprocessing for one item.
+        Returns True if the item still needs inference.
+        """
+        try:
+            key = result_cache_key(item.upload.sha256)
+            cached = await run_stage("cache_read", self.cache.get, key)
+            if cached is not None:
+                await self.emit_ok(item, cached)
+                return False
+
+            item.case_info = await run_stage("ingestion", ingest_upload, item.upload)
+            item.tensor = await run_stage(
+                "gatekeeper_preprocess",
+                preprocess_gatekeeper,
+                item.case_info.file_path,
+                item.case_info.file_type,
+                item.case_info.context,
+            )
+            return True
+
+        except Exception as e:
+            await self.emit_error(item, e)
+            return False
+
+    async def gatekeeper(self, items: List[_Item]) -> List[_Item]:
+        """
+        Gatekeeper over the whole window in rounds: each round runs the
+        next slice step of every still-undecided item (all slices at once
+        unless adaptive sampling is on) in large batches.
+        """
+        for item in items:
+            item.gate_steps = adaptive_steps(len(item.tensor))
+            item.gate_probs = []
+
+        routed = []
+        pending = items
+        while pending:
+            still_pending = []
+            for chunk in _chunks(
+                pending,
+                BULK_BATCH_SIZE["gatekeeper"],
+                rows_of=lambda item: len(item.gate_steps[0]),
+            ):
+                steps = [item.gate_steps.pop(0) for item in chunk]
+                sizes = [len(step) for step in steps]
+                try:
+                    probs = await run_stage(
+                        "gatekeeper_infer",
+                        forward_gatekeeper,
+                        torch.cat([item.tensor[step] for item, step in zip(chunk, steps)], dim=0),
+                        DEVICE,
+                    )
+                except Exception as e:
+                    for item in chunk:
+                        item.tensor = None
+                        await self.emit_error(item, e)
+                    continue
+
+                for item, step_probs in zip(chunk, torch.split(probs, sizes, dim=0)):
+                    item.gate_probs.append(step_probs)
+                    item_probs = torch.cat(item.gate_probs, dim=0)
+                    if item.gate_steps and not is_confident(item_probs):
+                        still_pending.append(item)
+                        continue
+
+                    record_slices_used(len(item_probs), len(item.tensor))
+                    item.tensor = None
+                    item.gate_steps = item.gate_probs = None
+                    try:
+                        label, _ = summarize_gatekeeper(item_probs)
+                        item.route = route_case(label)
+                        routed.append(item)
+                    except Exception as e:
+                        await self.emit_error(item, e)
+
+            pending = still_pending
+
+        return routed
+
+    async def specialist_2d(self, route: str, items: List[_Item]):
+        preprocess, forward, build = _SPECIALISTS_2D[route]
+
+        async def load(item: _Item) -> bool:
+            try:
+                # Reuses the pixels the gatekeeper already decoded
+                tensor = await run_stage(
+                    f"{route}_preprocess", preprocess, item.case_info.context
+                )
+                _release(item)
+                item.tensor = tensor.unsqueeze(0)
+                return True
+            except Exception as e:
+                await self.emit_error(item, e)
+                return False
+
+        loaded = await asyncio.gather(*(load(item) for item in items))
+        items = [item for item, ok in zip(items, loaded) if ok]
+
+        for chunk in _chunks(items, BULK_BATCH_SIZE[route]):
+            sizes = [len(item.tensor) for item in chunk]
+            try:
+                probs = await run_stage(
+                    f"{route}_infer",
+                    forward,
+                    torch.cat([item.tensor for item in chunk], dim=0),
+                    DEVICE,
+                )
+            except Exception as e:
+                for item in chunk:
+                    await self.emit_error(item, e)
+                continue
+
+            for item, item_probs in zip(chunk, torch.split(probs, sizes, dim=0)):
+                item.tensor = None
+                result = result_to_dict(build(item.case_info, item_probs.mean(dim=0)))
+                await self.emit_ok(item, result, result_cache_key(item.upload.sha256))
+
+    async def brain(self, item: _Item):
+        _release(item)  # the brain pipeline loads the case directory itself
+        try:
+            result = result_to_dict(await run_brain_case(item.case_info, run_stage))
+        except Exception as e:
+            await self.emit_error(item, e)
+            return
+        await self.emit_ok(item, result, result_cache_key(item.upload.sha256))
+
+    async def chest_frames(self, item: _Item):
+        try:
+            result = result_to_dict(await run_chest_frames_case(item.case_info, run_stage))
+        except Exception as e:
+            await self.emit_error(item, e)
+            return
+        _release(item)
+        await self.emit_ok(item, result, result_cache_key(item.upload.sha256))
+
+    async def window(self, items: List[_Item]):
+        ready = await asyncio.gather(*(self.prepare(item) for item in items))
+        items = [item for item, ok in zip(items, ready) if ok]
+
+        routed = await self.gatekeeper(items)
+
+        groups: Dict[str, List[_Item]] = {}
+        for item in routed:
+            groups.setdefault(item.route, []).append(item)
+
+        # Multi-frame chest studies stream their frames per case
+        chest = groups.get("chest", [])
+        frames = [item for item in chest if is_multiframe(item.case_info.context)]
+        if frames:
+            groups["chest"] = [item for item in chest if item not in frames]
+
+        tasks = [self.brain(item) for item in groups.get("brain", [])]
+        tasks += [self.chest_frames(item) for item in frames]
+        tasks += [
+            self.specialist_2d(route, group)
+            for route, group in groups.items()
+            if route in _SPECIALISTS_2D
+        ]
+        await asyncio.gather(*tasks)
+
+
+async def run_bulk_pipeline(
+    entries: List[Tuple[str, Union[SpooledUpload, Exception]]],
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Bulk pipeline over many spooled uploads.
+
+    entries: (filename, SpooledUpload or the Exception that prevented
+    spooling) in submission order.
+
+    Items are processed in windows of BATCH_WINDOW_ITEMS: the gatekeeper
+    runs over the whole window in large batches, items are grouped by the
+    route it locks, and chest/bone groups run through their model in large
+    batches (brain cases keep the per-case 3D path). One record per item
+    is yielded as soon as it completes; failures are reported per item and
+    never abort the rest of the batch.
+    """
+    items: List[_Item] = []
+    out: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    for index, (filename, upload) in enumerate(entries):
+        item = _Item(index=index, filename=filename)
+        if isinstance(upload, Exception):
+            out.put_nowait(_error(item, upload))
+        else:
+            item.upload = upload
+            items.append(item)
+
+    run = _BulkRun(out)
+
+    async def produce():
+        try:
+            for start in range(0, len(items), BATCH_WINDOW_ITEMS):
+                await run.window(items[start:start + BATCH_WINDOW_ITEMS])
+        finally:
+            await out.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            record = await out.get()
+            if record is done:
+                break
+            yield record
+        await producer
+
+    finally:
+        if not producer.done():
+            producer.cancel()
+        # Items that never reached ingestion still own their spool file
+        for item in items:
+            item.upload.path.unlink(missing_ok=True)
+
+        logger.info(f"Bulk run finished ({len(entries)} items)")
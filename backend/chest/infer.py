@@ -3,18 +3,15 @@ import torch.nn.functional as F
 from torchvision import models
 
 from backend.core.logging import get_logger
+from backend.runtime.backends import with_backend
+from backend.runtime.registry import model_registry
 from backend.core.config import CHEST_MODEL_PATH
+from backend.runtime.batching import get_batcher
 
 logger = get_logger(__name__)
 
-_model = None
-
-
-def load_chest_model(device: torch.device):
-    global _model
-    if _model is not None:
-        return _model
 
+def build_chest_model(device: torch.device) -> torch.nn.Module:
     logger.info("Loading chest model")
 
     model = models.densenet121(weights=None)
@@ -26,24 +23,45 @@ def load_chest_model(device: torch.device):
     model.load_state_dict(state)
     model.to(device)
     model.eval()
+    return model
+
+
+model_registry.register("chest", with_backend("chest", build_chest_model))
 
-    _model = model
-    return _model
 
+def load_chest_model(device: torch.device) -> torch.nn.Module:
+    return model_registry.get("chest", device)
 
-def infer_chest(batch: torch.Tensor, device: torch.device):
+
+def forward_chest(batch: torch.Tensor, device: torch.device) -> torch.Tensor:
     """
     batch: (N, 3, 224, 224)
+    returns: per-image probabilities (N, 2)
     """
-    model = load_chest_model(device)
-
-    with torch.no_grad():
+    with model_registry.acquire("chest", device) as model, torch.no_grad():
         batch = batch.to(device)
         logits = model(batch)
         probs = F.softmax(logits, dim=1)
 
+    return probs
+
+
+async def infer_chest(batch: torch.Tensor, device: torch.device):
+    """
+    batch: (N, 3, 224, 224)
+    """
+    probs = await get_batcher("chest", forward_chest, device).run_async(batch)
+
     mean_probs = probs.mean(dim=0)
     confidence = mean_probs.max().item()
 
     logger.info(f"Chest confidence: {confidence:.3f}")
     return mean_probs
+
+
+async def infer_chest_frames(batch: torch.Tensor, device: torch.device) -> torch.Tensor:
+    """
+    batch: (k, 3, 224, 224) frames of one multi-frame study
+    returns: per-frame probabilities (k, 2)
+    """
+    return await get_batcher("chest", forward_chest, device).run_async(batch)
@@ -1,27 +1,22 @@
-from pathlib import Path
+from itertools import islice
+from typing import Iterator, List
+
 import numpy as np
 import torch
-from PIL import Image
-import pydicom
-from torchvision import transforms
 
+from backend.core.config import CHEST_FRAME_BATCH_SIZE
 from backend.core.logging import get_logger
+from backend.image.intensity import ValueFn, map_values
+from backend.image.loaders import CaseContext
+from backend.image.radiograph import (
+    RadiographSource,
+    dicom_rescale,
+    preprocess_radiographs,
+    to_model_input,
+)
 
 logger = get_logger(__name__)
 
-# -----------------------------
-# Locked constants
-# -----------------------------
-IMG_SIZE = 224
-IMAGENET_MEAN = [0.485, 0.456, 0.406]
-IMAGENET_STD = [0.229, 0.224, 0.225]
-
-_transform = transforms.Compose([
-    transforms.Resize((IMG_SIZE, IMG_SIZE)),
-    transforms.ToTensor(),
-    transforms.Normalize(IMAGENET_MEAN, IMAGENET_STD),
-])
-
 
 # -----------------------------
 # Utility functions
@@ -40,49 +35,61 @@ def apply_lung_window(pixel_array: np.ndarray,
     return windowed
 
 
-def load_dicom(path: Path) -> Image.Image:
-    ds = pydicom.dcmread(path)
-    pixels = ds.pixel_array.astype(np.float32)
-
-    if hasattr(ds, "RescaleSlope"):
-        pixels *= float(ds.RescaleSlope)
-    if hasattr(ds, "RescaleIntercept"):
-        pixels += float(ds.RescaleIntercept)
-
-    windowed = apply_lung_window(pixels)
-    return Image.fromarray(windowed).convert("RGB")
-
-
-def load_png(path: Path) -> Image.Image:
-    return Image.open(path).convert("RGB")
+def lung_window(pixels: np.ndarray, rescale: ValueFn) -> np.ndarray:
+    """
+    Rescale + lung window of stored DICOM pixels, as one lookup-table
+    gather for 8/16-bit data.
+    """
+    return map_values(pixels, lambda values: apply_lung_window(rescale(values)))
 
 
 # -----------------------------
 # Main entry
 # -----------------------------
-def preprocess_chest_image(image_path: Path) -> torch.Tensor:
+def preprocess_chest_images(images: List[RadiographSource]) -> torch.Tensor:
+    """
+    Preprocess a batch of chest images (DICOM or PNG).
+
+    Output:
+      Tensor shape: (N, 3, 224, 224)
+    """
+    batch = preprocess_radiographs(images, lung_window, "chest")
+    logger.info(f"Chest tensor shape: {tuple(batch.shape)}")
+    return batch
+
+
+def preprocess_chest_image(image: RadiographSource) -> torch.Tensor:
     """
     Preprocess a chest image for model inference.
 
     Input:
-      DICOM (.dcm) or PNG (.png)
+      DICOM (.dcm) or PNG (.png), as a path or the request's case context
 
     Output:
       Tensor shape: (3, 224, 224)
     """
+    return preprocess_chest_images([image])[0]
 
-    if image_path.suffix.lower() == ".dcm":
-        logger.info("Chest preprocessing: DICOM input")
-        img = load_dicom(image_path)
-
-    elif image_path.suffix.lower() == ".png":
-        logger.info("Chest preprocessing: PNG input")
-        img = load_png(image_path)
 
-    else:
-        raise ValueError(f"Unsupported chest format: {image_path}")
+def is_multiframe(context: CaseContext) -> bool:
+    return context.file_type == "dicom" and context.frame_count("chest") > 1
 
-    tensor = _transform(img)
-    logger.info(f"Chest tensor shape: {tuple(tensor.shape)}")
 
-    return tensor
+def iter_chest_frame_batches(
+    context: CaseContext,
+    batch_size: int = CHEST_FRAME_BATCH_SIZE,
+) -> Iterator[torch.Tensor]:
+    """
+    Preprocess a multi-frame chest DICOM into (k, 3, 224, 224) batches of
+    at most batch_size frames. Frames are decoded lazily and resized one
+    at a time, so memory does not grow with the frame count.
+    """
+    rescale = dicom_rescale(context.dicom("chest"))
+    count = context.frame_count("chest")
+    frames = context.iter_frames(range(count), "chest")
+
+    logger.info(f"Chest preprocessing: {count}-frame DICOM in batches of {batch_size}")
+    for _ in range(0, count, batch_size):
+        yield to_model_input(
+            lung_window(frame, rescale) for frame in islice(frames, batch_size)
+        )
@@ -7,22 +7,186 @@ from backend.core.paths import REPO_ROOT
 MODELS_DIR = REPO_ROOT / "models"
 
 GATEKEEPER_MODEL = MODELS_DIR / "gatekeeper.pth"
-BRAIN_MODEL = MODELS_DIR / "brain_unet.pth"
-CHEST_MODEL = MODELS_DIR / "chest_model.pth"
-BONE_MODEL = MODELS_DIR / "bone_model.pth"
+BRAIN_MODEL_PATH = MODELS_DIR / "brain_unet.pth"
+CHEST_MODEL_PATH = MODELS_DIR / "chest_model.pth"
+BONE_MODEL_PATH = MODELS_DIR / "bone_model.pth"
+
+# TorchScript / ONNX artifacts written by scripts/export_models.py
+EXPORT_DIR = MODELS_DIR / "exported"
+
+# Sample PNG / DICOM inputs for int8 calibration, one subfolder per model
+# (gatekeeper/, chest/, bone/); read by scripts/quantize_models.py
+CALIBRATION_DIR = MODELS_DIR / "calibration"
 
 # ------------------
 # Thresholds
 # ------------------
 GATEKEEPER_CONFIDENCE_THRESHOLD = 0.65
 
+# Adaptive slice sampling: start from the centre slice and add slices
+# outward only while the running mean confidence is below
+# GATEKEEPER_CONFIDENCE_THRESHOLD + GATEKEEPER_EARLY_EXIT_MARGIN
+GATEKEEPER_ADAPTIVE_SLICES = False
+GATEKEEPER_EARLY_EXIT_MARGIN = 0.25
+
 # ------------------
 # Runtime behavior
 # ------------------
 MAX_UPLOAD_MB = 500
 TEMP_FILE_SUFFIX = ".tmp"
 
+# ------------------
+# Start-up
+# ------------------
+# Load every model and run one dummy forward pass in the background at
+# start-up; /healthz/ready stays 503 until all of them are warm.
+WARMUP_ON_STARTUP = True
+
+# ------------------
+# Inference backends
+# ------------------
+# Per model: "torch" (eager) | "torchscript" | "onnx" (needs onnxruntime)
+#          | "int8" (CPU only, 2D classifiers; scripts/quantize_models.py)
+INFERENCE_BACKEND = {
+    "gatekeeper": "torch",
+    "chest": "torch",
+    "bone": "torch",
+    "brain": "torch",
+}
+
+# Quantized kernel backend for "int8" models ("x86" | "fbgemm" | "qnnpack")
+QUANTIZATION_ENGINE = "x86"
+
+# ------------------
+# Brain preprocessing
+# ------------------
+# Crop each case to the non-zero bounding box of its four modalities
+# (plus a margin, in source voxels) and resample only that box onto the
+# full-field grid. Off by default: on resampled inputs interpolation
+# round-off flips a few edge voxels (~0.05%) between zero and non-zero,
+# which the nonzero-only normalization sees; check the tolerance with
+# scripts/benchmark_brain_foreground_crop.py before enabling
+BRAIN_FOREGROUND_CROP = False
+BRAIN_FOREGROUND_MARGIN = 4
+
+# ------------------
+# Brain inference
+# ------------------
+# "center_crop": one forward pass on the central 128³ crop (training setup)
+# "sliding_window": overlapping 128³ tiles over the whole resampled volume
+BRAIN_INFERENCE_MODE = "center_crop"
+BRAIN_SW_OVERLAP = 0.25
+# Tiles per forward pass; bounds peak memory on CPU nodes
+BRAIN_SW_MAX_TILES_PER_BATCH = 2
+
+# Slices per chunk when turning logits into a mask (None = whole volume);
+# smaller chunks lower peak memory on full-resolution outputs
+BRAIN_POSTPROCESS_DEPTH_CHUNK = 32
+
+# ------------------
+# Model residency
+# ------------------
+# Upper bound on parameter memory of loaded models. Least recently used
+# idle models are evicted when exceeded; None keeps every model resident.
+MODEL_MEMORY_BUDGET_MB = None
+
+# ------------------
+# Execution
+# ------------------
+# Worker threads for blocking pipeline stages (ingestion, preprocessing,
+# inference, postprocessing). The event loop itself never runs them.
+EXECUTOR_MAX_WORKERS = 4
+
+# Threads decoding / resampling the four brain modalities of a case
+# concurrently (shared by all brain cases in the process)
+BRAIN_MODALITY_WORKERS = 4
+
+# ------------------
+# Job queue (POST /jobs)
+# ------------------
+# Long-running cases run on their own pool, separate from /analyze
+JOB_MAX_WORKERS = 2
+JOB_QUEUE_SIZE = 64
+# Finished job records are deleted after this long (0 keeps them forever)
+JOB_RETENTION_HOURS = 24
+
+# ------------------
+# Bulk analysis (POST /analyze/batch)
+# ------------------
+BATCH_MAX_UPLOAD_MB = 8192
+BATCH_MAX_ITEMS = 10000
+# Total decompressed size of all archive members in one batch; guards the
+# spool disk against zip / tar bombs
+BATCH_MAX_EXTRACTED_MB = 2 * BATCH_MAX_UPLOAD_MB
+# Items processed together end to end; bounds memory held per request
+BATCH_WINDOW_ITEMS = 128
+# Rows per forward pass when running a whole route group at once
+BULK_BATCH_SIZE = {
+    "gatekeeper": 64,
+    "chest": 32,
+    "bone": 32,
+}
+
+# ------------------
+# Inference batching
+# ------------------
+# Concurrent requests for the same model are merged into one forward pass
+# of up to max_batch_size rows, waiting at most max_wait_ms for company.
+BATCHING = {
+    "gatekeeper": {"max_batch_size": 32, "max_wait_ms": 10},
+    "chest": {"max_batch_size": 16, "max_wait_ms": 10},
+    "bone": {"max_batch_size": 16, "max_wait_ms": 10},
+}
+
+# ------------------
+# Multi-frame DICOM
+# ------------------
+# Frames decoded, preprocessed and run through the chest model together;
+# memory stays flat however many frames a study has
+CHEST_FRAME_BATCH_SIZE = 16
+
+# ------------------
+# Reduced-resolution decode
+# ------------------
+# Oversized 2D radiographs are decoded / block-averaged down by an integer
+# factor to at least this many pixels on the short side (448 = 2x the 224
+# model input) before resizing. Off (0, full resolution) until the small
+# model-input shift is checked on real data; see
+# scripts/check_reduced_decode_parity.py
+RADIOGRAPH_DECODE_SIZE = 0
+
+# ------------------
+# Result cache
+# ------------------
+# Keyed by upload SHA-256 + model versions + every output-affecting
+# setting (see runtime/cache.py); stored under runtime/cache
+RESULT_CACHE_MEMORY_ENTRIES = 1024
+RESULT_CACHE_DISK_MB = 256
+
+# ------------------
+# Brain volume cache
+# ------------------
+# Preprocessed (4, 128, 128, 128) tensors keyed by modality content hashes
+# + preprocessing fingerprint; 0 disables. float32 is lossless and served
+# memory-mapped. float16 halves the footprint but rounds every model input
+# (cached or not) and is copied to float32 on each hit.
+BRAIN_VOLUME_CACHE_MB = 4096
+BRAIN_VOLUME_CACHE_DTYPE = "float32"
+
+# ------------------
+# NIfTI decompression cache
+# ------------------
+# .nii.gz inputs are decompressed once to an uncompressed .nii under
+# runtime/cache so pixel reads can be memory-mapped; 0 disables
+NIFTI_UNCOMPRESSED_CACHE_MB = 0
+
 # ------------------
 # Versioning
 # ------------------
 BACKEND_VERSION = "0.1.0"
+
+# Bump when the checkpoint changes; cached results are keyed on these
+GATEKEEPER_MODEL_VERSION = "gatekeeper-1.0"
+BRAIN_MODEL_VERSION = "brain-1.0"
+CHEST_MODEL_VERSION = "chest-1.0"
+BONE_MODEL_VERSION = "bone-1.0"
@@ -1,7 +1,11 @@
+import hashlib
 import shutil
 import tempfile
 from pathlib import Path
 
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
 def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
 
@@ -21,3 +25,35 @@ def atomic_write(path: Path, data: bytes):
 
     temp_path.replace(path)
 
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def evict_lru(directory: Path, pattern: str, max_bytes: int) -> int:
+    """
+    Delete the least recently used files (by mtime) matching pattern until
+    the total size is at most max_bytes. Returns the remaining total.
+    """
+    entries = []
+    total = 0
+    for path in directory.glob(pattern):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+    return total
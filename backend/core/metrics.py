@@ -0,0 +1,143 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, Tuple
+
+# -------------------------------------------------
+# Minimal in-process metrics registry
+# Rendered in Prometheus text format by GET /metrics
+# -------------------------------------------------
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_REGISTRY: Dict[str, "_Metric"] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in key)
+    return "{" + inner + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, LabelKey, float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float]):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelKey, list] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[idx] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self):
+        with self._lock:
+            items = [(k, list(v), self._sums[k]) for k, v in self._counts.items()]
+
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", key + (("le", f"{bound:g}"),), cumulative
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket", key + (("le", "+Inf"),), cumulative
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, cumulative
+
+
+def _get_or_create(cls, name: str, *args):
+    with _REGISTRY_LOCK:
+        metric = _REGISTRY.get(name)
+        if metric is None:
+            metric = cls(name, *args)
+            _REGISTRY[name] = metric
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+
+def counter(name: str, help_text: str) -> Counter:
+    return _get_or_create(Counter, name, help_text)
+
+
+def gauge(name: str, help_text: str) -> Gauge:
+    return _get_or_create(Gauge, name, help_text)
+
+
+def histogram(name: str, help_text: str, buckets: Iterable[float]) -> Histogram:
+    return _get_or_create(Histogram, name, help_text, buckets)
+
+
+def render_prometheus() -> str:
+    """
+    Render every registered metric in Prometheus text exposition format.
+    """
+    with _REGISTRY_LOCK:
+        metrics = list(_REGISTRY.values())
+
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for sample_name, key, value in metric.samples():
+            lines.append(f"{sample_name}{_format_labels(key)} {value:g}")
+
+    return "\n".join(lines) + "\n"
@@ -7,8 +7,10 @@ RUNTIME_ROOT = REPO_ROOT / "runtime"
 LOG_DIR = RUNTIME_ROOT / "logs"
 CASE_DIR = RUNTIME_ROOT / "cases"
 TEMP_DIR = RUNTIME_ROOT / "tmp"
+CACHE_DIR = RUNTIME_ROOT / "cache"
+JOBS_DIR = RUNTIME_ROOT / "jobs"
 
 def ensure_runtime_dirs():
-    for p in [LOG_DIR, CASE_DIR, TEMP_DIR]:
+    for p in [LOG_DIR, CASE_DIR, TEMP_DIR, CACHE_DIR, JOBS_DIR]:
         p.mkdir(parents=True, exist_ok=True)
 
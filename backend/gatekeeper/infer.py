@@ -1,28 +1,49 @@
+from typing import List, Tuple
+
 import torch
 import torch.nn.functional as F
 
+from backend.core import metrics
 from backend.core.logging import get_logger
-from backend.core.config import GATEKEEPER_CONFIDENCE_THRESHOLD
-from backend.gatekeeper.model import load_gatekeeper_model
+from backend.core.config import (
+    GATEKEEPER_ADAPTIVE_SLICES,
+    GATEKEEPER_CONFIDENCE_THRESHOLD,
+    GATEKEEPER_EARLY_EXIT_MARGIN,
+)
+from backend.gatekeeper.model import MODEL_NAME
+from backend.runtime.registry import model_registry
+from backend.runtime.batching import get_batcher
 
 logger = get_logger(__name__)
 
 LABELS = ["brain", "chest", "bone"]
 
+_SLICES_USED = metrics.histogram(
+    "spectra_gatekeeper_slices_used",
+    "Slices run through the gatekeeper per case",
+    buckets=(1, 3, 5, 7, 9, 15),
+)
+
 
-def gatekeeper_infer(batch: torch.Tensor, device: torch.device) -> str:
+def forward_gatekeeper(batch: torch.Tensor, device: torch.device) -> torch.Tensor:
     """
     batch: (N, 3, 224, 224)
-    returns: brain | chest | bone | ambiguous
+    returns: per-slice probabilities (N, 3)
     """
-
-    model = load_gatekeeper_model(device)
-
-    with torch.no_grad():
+    with model_registry.acquire(MODEL_NAME, device) as model, torch.no_grad():
         batch = batch.to(device)
         logits = model(batch)
         probs = F.softmax(logits, dim=1)
 
+    return probs
+
+
+def summarize_gatekeeper(probs: torch.Tensor) -> Tuple[str, float]:
+    """
+    probs: per-slice probabilities (N, 3) for one case
+    returns: (brain | chest | bone | ambiguous, confidence)
+    """
+
     # Aggregate across slices
     mean_probs = probs.mean(dim=0)
     confidence, pred_idx = torch.max(mean_probs, dim=0)
@@ -34,6 +55,64 @@ def gatekeeper_infer(batch: torch.Tensor, device: torch.device) -> str:
 
     if confidence < GATEKEEPER_CONFIDENCE_THRESHOLD:
         logger.warning("Gatekeeper result ambiguous")
-        return "ambiguous"
+        return "ambiguous", confidence
+
+    return LABELS[pred_idx], confidence
+
+
+# -------------------------------------------------
+# Adaptive slice sampling
+# -------------------------------------------------
+
+def adaptive_steps(n: int) -> List[List[int]]:
+    """
+    Slice indices to add per step when sampling a case's N slices from
+    the centre outward: [[c], [c-1, c+1], [c-2, c+2], ...].
+    Without adaptive sampling, every slice runs in one step.
+    """
+    if not GATEKEEPER_ADAPTIVE_SLICES or n <= 1:
+        return [list(range(n))]
+
+    center = n // 2
+    steps = [[center]]
+    for offset in range(1, n):
+        step = [i for i in (center - offset, center + offset) if 0 <= i < n]
+        if not step:
+            break
+        steps.append(step)
+    return steps
+
+
+def is_confident(probs: torch.Tensor) -> bool:
+    """
+    Early-exit test on the running mean of the slices seen so far.
+    """
+    confidence = probs.mean(dim=0).max().item()
+    return confidence >= GATEKEEPER_CONFIDENCE_THRESHOLD + GATEKEEPER_EARLY_EXIT_MARGIN
+
+
+def record_slices_used(used: int, available: int):
+    _SLICES_USED.observe(used)
+    logger.info(f"Gatekeeper used {used}/{available} slices")
+
+
+async def infer_gatekeeper(batch: torch.Tensor, device: torch.device) -> Tuple[str, float]:
+    """
+    batch: (N, 3, 224, 224)
+    returns: (brain | chest | bone | ambiguous, confidence)
+
+    With GATEKEEPER_ADAPTIVE_SLICES, slices are run from the centre
+    outward and sampling stops as soon as the case is confidently
+    classified; uncertain cases still see all N slices.
+    """
+    batcher = get_batcher("gatekeeper", forward_gatekeeper, device)
+
+    seen = []
+    for step in adaptive_steps(len(batch)):
+        seen.append(await batcher.run_async(batch[step]))
+        probs = torch.cat(seen, dim=0)
+        if is_confident(probs):
+            break
 
-    return LABELS[pred_idx]
+    record_slices_used(len(probs), len(batch))
+    return summarize_gatekeeper(probs)
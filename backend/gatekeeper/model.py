@@ -1,19 +1,16 @@
 import torch
 from torchvision import models
 from backend.core.logging import get_logger
+from backend.runtime.backends import with_backend
+from backend.runtime.registry import model_registry
 from backend.core.config import GATEKEEPER_MODEL
 
 logger = get_logger(__name__)
 
-_model = None
+MODEL_NAME = "gatekeeper"
 
 
-def load_gatekeeper_model(device: torch.device):
-    global _model
-
-    if _model is not None:
-        return _model
-
+def build_gatekeeper_model(device: torch.device) -> torch.nn.Module:
     logger.info("Loading Gatekeeper model")
 
     model = models.mobilenet_v2(weights=None)
@@ -26,7 +23,11 @@ def load_gatekeeper_model(device: torch.device):
 
     model.to(device)
     model.eval()
+    return model
+
+
+model_registry.register(MODEL_NAME, with_backend(MODEL_NAME, build_gatekeeper_model))
+
 
-    _model = model
-    logger.info("Gatekeeper model loaded and ready")
-    return _model
+def load_gatekeeper_model(device: torch.device) -> torch.nn.Module:
+    return model_registry.get(MODEL_NAME, device)
@@ -1,59 +1,79 @@
 from pathlib import Path
+from typing import Optional
+
 import numpy as np
-from PIL import Image
 import torch
-from torchvision import transforms
 
+from backend.core.config import RADIOGRAPH_DECODE_SIZE
 from backend.core.logging import get_logger
+from backend.image.intensity import lut_supported, map_values
+from backend.image.loaders import CaseContext, ImageVolume
+from backend.image.radiograph import resize_normalize, to_model_input
 from backend.image.slicing import get_axial_slice
 
 logger = get_logger(__name__)
 
-# -----------------------------
-# Locked constants
-# -----------------------------
-IMG_SIZE = 224
-IMAGENET_MEAN = [0.485, 0.456, 0.406]
-IMAGENET_STD = [0.229, 0.224, 0.225]
 
-_transform = transforms.Compose([
-    transforms.Resize((IMG_SIZE, IMG_SIZE)),
-    transforms.ToTensor(),
-    transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
-])
+def _minmax_gray_levels(slice_2d: np.ndarray) -> np.ndarray:
+    """
+    Min-max to 0–255 uint8 (truncated), for an integer slice; one table
+    gather when the slice is larger than the table.
+    """
+    low = np.float32(slice_2d.min())
+    peak = np.float32(slice_2d.max()) - low
+    scale = peak if peak > 0 else np.float32(1.0)
 
+    def scale_values(values: np.ndarray) -> np.ndarray:
+        x = (values.astype(np.float32) - low) / scale
+        return np.floor(x * 255.0).astype(np.uint8)
 
-def _to_rgb(pil_img: Image.Image) -> Image.Image:
-    if pil_img.mode != "RGB":
-        pil_img = pil_img.convert("RGB")
-    return pil_img
+    return map_values(slice_2d, scale_values)
 
 
-def preprocess_slice(slice_2d: np.ndarray) -> torch.Tensor:
+def preprocess_slices(slices: np.ndarray) -> torch.Tensor:
     """
-    Preprocess a single axial slice into a gatekeeper tensor.
+    Preprocess a stack of grayscale slices (N, H, W) into gatekeeper
+    tensors (N, 3, 224, 224) in one batch.
+
+    Same steps as the original per-slice PIL path: per-slice min-max to
+    0–255 (truncated like the uint8 cast), bilinear antialiased resize
+    (rounded like PIL's uint8 output), ImageNet normalization. The gray
+    channel is resized once and broadcast to RGB instead of converted.
+    8/16-bit integer slices are scaled through a lookup table.
     """
+    if lut_supported(slices):
+        gray = np.stack([_minmax_gray_levels(s) for s in slices])
+        return resize_normalize(torch.from_numpy(gray).unsqueeze(1).float())
+
+    x = torch.from_numpy(np.asarray(slices, dtype=np.float32))
+
     # Normalize to 0–255 safely
-    slice_2d = slice_2d.astype(np.float32)
-    slice_2d -= slice_2d.min()
-    if slice_2d.max() > 0:
-        slice_2d /= slice_2d.max()
-    slice_2d *= 255.0
+    x = x - x.flatten(1).amin(dim=1).view(-1, 1, 1)
+    peak = x.flatten(1).amax(dim=1).view(-1, 1, 1)
+    x = x / torch.where(peak > 0, peak, torch.ones_like(peak))
+    x = torch.floor(x * 255.0)
 
-    slice_2d = slice_2d.astype(np.uint8)
+    return resize_normalize(x.unsqueeze(1))
 
-    pil = Image.fromarray(slice_2d)
-    pil = _to_rgb(pil)
 
-    tensor = _transform(pil)
-    return tensor
+def preprocess_slice(slice_2d: np.ndarray) -> torch.Tensor:
+    """
+    Preprocess a single axial slice into a gatekeeper tensor.
+    """
+    return preprocess_slices(slice_2d[np.newaxis])[0]
 
 
 def select_middle_slices(volume: np.ndarray, k: int = 3):
     """
     Deterministically select middle ±k axial slices.
     """
-    z = volume.shape[2]
+    return middle_slice_indices(volume.shape[2], k)
+
+
+def middle_slice_indices(z: int, k: int = 3):
+    """
+    Middle ±k slice indices for a volume of depth z.
+    """
     center = z // 2
     indices = list(range(center - k, center + k + 1))
 
@@ -67,14 +87,78 @@ def preprocess_volume(volume: np.ndarray) -> torch.Tensor:
     Full gatekeeper preprocessing for a volume.
     Returns tensor of shape (N, 3, 224, 224)
     """
-    tensors = []
     indices = select_middle_slices(volume)
+    batch = preprocess_slices(np.stack([get_axial_slice(volume, idx) for idx in indices]))
+    logger.info(f"Gatekeeper batch shape: {batch.shape}")
+    return batch
+
 
-    for idx in indices:
-        slice_ = get_axial_slice(volume, idx)
-        tensor = preprocess_slice(slice_)
-        tensors.append(tensor)
+def preprocess_nifti_slab(volume: ImageVolume) -> torch.Tensor:
+    """
+    Gatekeeper preprocessing for a 3D NIfTI that reads only the slab of
+    middle slices from disk, so cost does not grow with volume depth.
+    Returns tensor of shape (N, 3, 224, 224)
+    """
+    indices = middle_slice_indices(volume.shape[2])
+    start = indices[0]
+    slab = volume.read_region((slice(None), slice(None), slice(start, indices[-1] + 1)))
 
-    batch = torch.stack(tensors, dim=0)
+    batch = preprocess_slices(
+        np.stack([get_axial_slice(slab, idx - start) for idx in indices])
+    )
     logger.info(f"Gatekeeper batch shape: {batch.shape}")
     return batch
+
+
+def preprocess_dicom_frames(context: CaseContext) -> torch.Tensor:
+    """
+    Gatekeeper preprocessing for a multi-frame DICOM that decodes only the
+    middle frames (frames play the role of axial slices).
+    Returns tensor of shape (N, 3, 224, 224)
+    """
+    indices = middle_slice_indices(context.frame_count("gatekeeper"))
+    batch = preprocess_slices(np.stack(list(context.iter_frames(indices, "gatekeeper"))))
+    logger.info(f"Gatekeeper batch shape: {batch.shape}")
+    return batch
+
+
+def preprocess_gatekeeper(
+    case_file: Path,
+    file_type: str,
+    context: Optional[CaseContext] = None,
+) -> torch.Tensor:
+    """
+    Gatekeeper preprocessing for an ingested case file.
+    Headers and pixels are taken from `context` when given, so later
+    stages of the request can reuse them.
+    Returns tensor of shape (N, 3, 224, 224)
+    """
+    context = context or CaseContext(case_file, file_type)
+
+    if file_type == "png":
+        # Same reduced-scale decode the chest / bone stages reuse
+        pixels = (
+            context.reduced_pixels("gatekeeper", RADIOGRAPH_DECODE_SIZE)
+            if RADIOGRAPH_DECODE_SIZE else context.pixels("gatekeeper")
+        )
+        batch = to_model_input([pixels])
+
+    elif file_type == "dicom" and context.frame_count("gatekeeper") > 1:
+        batch = preprocess_dicom_frames(context)
+
+    else:
+        volume = ImageVolume(case_file, file_type, context=context, stage="gatekeeper")
+
+        if file_type == "nifti" and len(volume.shape) == 3:
+            batch = preprocess_nifti_slab(volume)
+
+        else:
+            pixels = volume.load_pixels()
+
+            if pixels.ndim == 2:
+                batch = preprocess_slice(pixels).unsqueeze(0)
+            else:
+                batch = preprocess_volume(pixels)
+
+    logger.info(f"Gatekeeper input prepared: {case_file.name}")
+    return batch
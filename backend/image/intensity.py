@@ -0,0 +1,158 @@
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# -------------------------------------------------
+# Lookup-table intensity kernels
+#
+# Window / clip / scale steps map every pixel through the same
+# elementwise formula, so for 8- and 16-bit integer images the formula is
+# evaluated once per possible stored value and applied as a single uint8
+# table gather. Percentiles come from a value histogram instead of a
+# partition of the whole image. Results are identical to running the
+# formula (and np.percentile) on the full image.
+# -------------------------------------------------
+
+LUT_DTYPES = (np.uint8, np.int8, np.uint16, np.int16)
+
+# Pixels per gather / bincount call; bounds the intp index temporaries
+CHUNK_PIXELS = 1 << 20
+
+# Elementwise formula over an array of stored values
+ValueFn = Callable[[np.ndarray], np.ndarray]
+
+
+def lut_supported(pixels: np.ndarray) -> bool:
+    return pixels.dtype in LUT_DTYPES
+
+
+def _use_lut(pixels: np.ndarray) -> bool:
+    # A table is only cheaper when the image has more pixels than entries
+    return lut_supported(pixels) and pixels.size > (1 << (8 * pixels.dtype.itemsize))
+
+
+def _codes(pixels: np.ndarray) -> np.ndarray:
+    """
+    Flat unsigned view of the pixels: the table index of each pixel.
+    """
+    unsigned = np.dtype(f"u{pixels.dtype.itemsize}")
+    return np.ascontiguousarray(pixels).reshape(-1).view(unsigned)
+
+
+def _domain(dtype: np.dtype) -> np.ndarray:
+    """
+    Every value of an integer dtype, ordered by table index.
+    """
+    unsigned = np.dtype(f"u{dtype.itemsize}")
+    return np.arange(1 << (8 * dtype.itemsize), dtype=unsigned).view(dtype)
+
+
+def value_counts(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distinct stored values of an 8/16-bit image (ascending) and their counts.
+    """
+    codes = _codes(pixels)
+    counts = np.zeros(1 << (8 * pixels.dtype.itemsize), dtype=np.int64)
+    for start in range(0, codes.size, CHUNK_PIXELS):
+        counts += np.bincount(codes[start:start + CHUNK_PIXELS], minlength=counts.size)
+
+    values = _domain(pixels.dtype)
+    present = counts > 0
+    values, counts = values[present], counts[present]
+
+    order = np.argsort(values, kind="stable")  # signed dtypes wrap in index order
+    return values[order], counts[order]
+
+
+def _lerp(a, b, t):
+    # np.percentile's interpolation, kept operation for operation
+    diff_b_a = b - a
+    result = np.add(a, diff_b_a * t)
+    np.subtract(b, diff_b_a * (1 - t), out=result, where=t >= 0.5, casting="unsafe")
+    return result
+
+
+def percentiles(
+    pixels: np.ndarray,
+    q: Sequence[float],
+    transform: Optional[ValueFn] = None,
+) -> np.ndarray:
+    """
+    np.percentile(transform(pixels), q) with linear interpolation.
+
+    For 8/16-bit images this reads the value histogram: `transform`
+    (e.g. the DICOM rescale) is applied to the distinct values only.
+    Other dtypes fall back to np.percentile on the full image.
+    """
+    if not _use_lut(pixels):
+        values = transform(pixels) if transform is not None else pixels
+        return np.percentile(values, q)
+
+    values, counts = value_counts(pixels)
+    if transform is not None:
+        values = transform(values)
+        order = np.argsort(values, kind="stable")
+        values, counts = values[order], counts[order]
+
+    n = int(counts.sum())
+    virtual = (n - 1) * np.true_divide(q, 100)
+    previous = np.clip(np.floor(virtual).astype(np.intp), 0, n - 1)
+    following = np.clip(previous + 1, 0, n - 1)
+    gamma = virtual - previous
+
+    # k-th smallest pixel: first value whose cumulative count exceeds k
+    cumulative = np.cumsum(counts)
+    a = values[np.searchsorted(cumulative, previous, side="right")]
+    b = values[np.searchsorted(cumulative, following, side="right")]
+    return _lerp(a, b, gamma)
+
+
+def map_values(pixels: np.ndarray, fn: ValueFn) -> np.ndarray:
+    """
+    fn(pixels) for an elementwise fn returning uint8.
+
+    For 8/16-bit images fn is evaluated once per possible value and
+    applied as one table gather (in chunks, so index temporaries stay
+    small). Other dtypes, and images smaller than the table, run fn
+    directly.
+    """
+    if not _use_lut(pixels):
+        return fn(pixels)
+
+    # Entries for values absent from the image may overflow; never read
+    with np.errstate(all="ignore"):
+        lut = fn(_domain(pixels.dtype))
+    if lut.dtype != np.uint8:
+        raise TypeError(f"Intensity kernel must return uint8, got {lut.dtype}")
+
+    codes = _codes(pixels)
+    out = np.empty(codes.size, dtype=np.uint8)
+    for start in range(0, codes.size, CHUNK_PIXELS):
+        stop = start + CHUNK_PIXELS
+        np.take(lut, codes[start:stop], out=out[start:stop])
+    return out.reshape(pixels.shape)
+
+
+def percentile_normalize(
+    pixels: np.ndarray,
+    q: Sequence[float] = (1, 99),
+    transform: Optional[ValueFn] = None,
+    min_range: float = 1e-5,
+) -> Optional[np.ndarray]:
+    """
+    Clip transform(pixels) to its q percentiles and scale to 0–255 uint8
+    (the gatekeeper dataset extraction normalization). None when the
+    percentile range is below min_range.
+    """
+    low, high = percentiles(pixels, q, transform)
+    if high - low < min_range:
+        return None
+
+    def scale(values: np.ndarray) -> np.ndarray:
+        if transform is not None:
+            values = transform(values)
+        values = np.clip(values, low, high)
+        values = 255 * (values - low) / (high - low)
+        return values.astype(np.uint8)
+
+    return map_values(pixels, scale)
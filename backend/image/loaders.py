@@ -1,30 +1,372 @@
+import gzip
+import io
+import shutil
+import tempfile
+import threading
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
 import pydicom
 import nibabel as nib
 import numpy as np
+from PIL import Image
+from pydicom.encaps import get_frame
+from pydicom.pixels import iter_pixels
+from pydicom.uid import JPEGBaseline8Bit
 
+from backend.core import metrics
+from backend.core.config import NIFTI_UNCOMPRESSED_CACHE_MB
+from backend.core.fs import ensure_dir, evict_lru, file_sha256
 from backend.core.logging import get_logger
+from backend.core.paths import CACHE_DIR
 
 logger = get_logger(__name__)
 
+NIFTI_CACHE_DIR = CACHE_DIR / "nifti"
+
+# Elements above this size (i.e. pixel data) are read from the file only
+# when accessed, so parsing a DICOM header does not load its pixels
+DICOM_DEFER_SIZE = "1 MB"
+
+_CONTEXT_HITS = metrics.counter(
+    "spectra_case_context_hits_total",
+    "Case headers / pixels served from the per-request case context",
+)
+_CONTEXT_DECODES = metrics.counter(
+    "spectra_case_context_decodes_total",
+    "Case headers / pixels parsed or decoded from disk",
+)
+
+_nifti_cache_lock = threading.Lock()
+
+
+def uncompressed_nifti(path: Path) -> Path:
+    """
+    Decompress a .nii.gz once into the NIfTI cache (keyed by content hash)
+    and return the uncompressed copy, which nibabel can memory-map.
+    """
+    ensure_dir(NIFTI_CACHE_DIR)
+    target = NIFTI_CACHE_DIR / f"{file_sha256(path)}.nii"
+
+    if target.exists():
+        target.touch()  # LRU clock
+        return target
+
+    with tempfile.NamedTemporaryFile(delete=False, dir=NIFTI_CACHE_DIR, suffix=".part") as tmp:
+        with gzip.open(path, "rb") as src:
+            shutil.copyfileobj(src, tmp, length=1024 * 1024)
+        temp_path = Path(tmp.name)
+    temp_path.replace(target)
+    logger.info(f"Decompressed {path.name} into NIfTI cache")
+
+    with _nifti_cache_lock:
+        evict_lru(NIFTI_CACHE_DIR, "*.nii", NIFTI_UNCOMPRESSED_CACHE_MB * 1024 * 1024)
+    return target
+
+
+# (rows, cols) of the full-resolution image in units of reduced pixels,
+# i.e. full size / factor. Reduced images keep a partial last block, so
+# their shape is rounded up; resizing from the extent keeps the sampling
+# grid of the full-resolution image.
+Extent = Tuple[float, float]
+
+# A possibly reduced image and its extent (None when not reduced)
+Reduced = Tuple[np.ndarray, Optional[Extent]]
+
+
+def reduce_factor(size: Tuple[int, ...], min_side: Optional[int]) -> int:
+    """
+    Largest integer downscale factor that keeps the short side of `size`
+    at or above min_side (1 when min_side is unset).
+    """
+    if not min_side:
+        return 1
+    return max(1, min(size) // min_side)
+
+
+def reduce_image(img: Image.Image, min_side: Optional[int]) -> Reduced:
+    """
+    Decode `img` at reduced scale: JPEG data is decoded at 1/2, 1/4 or 1/8
+    scale in the DCT domain (PIL draft, a no-op for other formats), then
+    block-averaged by the remaining integer factor (PIL reduce).
+    """
+    factor = reduce_factor(img.size, min_side)
+    if factor == 1:
+        return np.asarray(img), None
+
+    width, height = img.size
+    img.draft(img.mode, (width // factor, height // factor))
+    scale = round(width / img.width)  # draft scale, 1 unless JPEG
+
+    factor = reduce_factor(img.size, min_side)
+    if factor > 1:
+        img = img.reduce(factor)
+    scale *= factor
+
+    return np.asarray(img), (height / scale, width / scale)
+
+
+def reduce_pixels(pixels: np.ndarray, min_side: Optional[int]) -> Reduced:
+    """
+    Block-average uint8 (H, W) or (H, W, 3) gray levels by the largest
+    integer factor keeping min_side pixels on the short side.
+    """
+    if reduce_factor(pixels.shape[:2], min_side) == 1:
+        return pixels, None
+    return reduce_image(Image.fromarray(pixels), min_side)
+
+
+def read_png(path: Path) -> np.ndarray:
+    """
+    PNG as uint8 (H, W) for grayscale, else (H, W, 3) after PIL's RGB
+    conversion. Grayscale stays single-channel; it is broadcast later.
+    """
+    with Image.open(path) as img:
+        if img.mode != "L":
+            img = img.convert("RGB")
+        return np.asarray(img)
+
+
+class CaseContext:
+    """
+    Decode-once view of one case file, shared by every stage of a request.
+
+    Headers are parsed once and pixels decoded at most once; the pixel
+    buffer is read-only, so stages copy before modifying it. Each access
+    is counted per stage as a hit (already in memory) or a decode.
+    Call release() once no later stage needs the pixels.
+
+    2D radiograph stages may ask for pixels at reduced scale instead; that
+    copy is decoded once as well and is derived from the full pixels when
+    those are already in memory.
+    """
+
+    def __init__(self, path: Path, file_type: str):
+        self.path = path
+        self.file_type = file_type
+        self._dataset: Optional[pydicom.Dataset] = None
+        self._nifti: Optional[nib.Nifti1Image] = None
+        self._png_header: Optional[dict] = None
+        self._pixels: Optional[np.ndarray] = None
+        self._reduced: Optional[Tuple[int, Reduced]] = None  # keyed by min_side
+        self._lock = threading.Lock()
+
+    def _record(self, kind: str, stage: str, hit: bool, count: int = 1):
+        if hit:
+            _CONTEXT_HITS.inc(count, kind=kind, stage=stage)
+        else:
+            _CONTEXT_DECODES.inc(count, kind=kind, stage=stage)
+            logger.info(f"Case context: decoded {kind} for {stage}")
+
+    # Loaders below run with the lock held
+
+    def _load_dicom(self) -> pydicom.Dataset:
+        if self._dataset is None:
+            self._dataset = pydicom.dcmread(self.path, defer_size=DICOM_DEFER_SIZE)
+        return self._dataset
+
+    def _load_nifti(self) -> nib.Nifti1Image:
+        if self._nifti is None:
+            source = self.path
+            if NIFTI_UNCOMPRESSED_CACHE_MB and source.name.lower().endswith(".nii.gz"):
+                source = uncompressed_nifti(source)
+            self._nifti = nib.load(str(source), mmap=True)
+        return self._nifti
+
+    def _decode(self) -> np.ndarray:
+        if self.file_type == "dicom":
+            pixels = self._load_dicom().pixel_array
+        elif self.file_type == "nifti":
+            # Native dtype; a memmap for uncompressed, unscaled files
+            pixels = np.asanyarray(self._load_nifti().dataobj)
+        else:
+            pixels = read_png(self.path)
+        pixels.setflags(write=False)
+        return pixels
+
+    def _decode_reduced(self, min_side: int) -> Optional[Reduced]:
+        # None when the format has no reduced-scale decode
+        if self.file_type == "png":
+            with Image.open(self.path) as img:
+                if img.mode != "L":
+                    img = img.convert("RGB")
+                return reduce_image(img, min_side)
+
+        if self.file_type == "dicom":
+            ds = self._load_dicom()
+            if (
+                ds.file_meta.get("TransferSyntaxUID") == JPEGBaseline8Bit
+                and ds.get("SamplesPerPixel", 1) == 1
+                and int(ds.get("NumberOfFrames", 1) or 1) == 1
+            ):
+                frame = get_frame(ds.PixelData, 0, number_of_frames=1)
+                with Image.open(io.BytesIO(frame)) as img:
+                    return reduce_image(img, min_side)
+
+        return None
+
+    def _load_reduced(self, min_side: int) -> Reduced:
+        if self._reduced is not None and self._reduced[0] == min_side:
+            return self._reduced[1]
+
+        reduced = None
+        if self._pixels is None:
+            reduced = self._decode_reduced(min_side)
+            if reduced is None:
+                self._pixels = self._decode()
+
+        if reduced is None:
+            # DICOM stored values are reduced after the intensity step
+            if self.file_type == "png":
+                reduced = reduce_pixels(self._pixels, min_side)
+            else:
+                reduced = (self._pixels, None)
+
+        reduced[0].setflags(write=False)
+        self._reduced = (min_side, reduced)
+        return reduced
+
+    def dicom(self, stage: str) -> pydicom.Dataset:
+        """
+        The parsed DICOM dataset (read once, pixel data not decoded).
+        """
+        with self._lock:
+            hit = self._dataset is not None
+            dataset = self._load_dicom()
+        self._record("dicom_header", stage, hit)
+        return dataset
+
+    def nifti(self, stage: str) -> nib.Nifti1Image:
+        """
+        The NIfTI image: header parsed, pixel data left on disk behind
+        nibabel's (memory-mapped) array proxy.
+        """
+        with self._lock:
+            hit = self._nifti is not None
+            image = self._load_nifti()
+        self._record("nifti_header", stage, hit)
+        return image
+
+    def png_header(self, stage: str) -> dict:
+        """
+        PNG size and mode, without decoding pixels.
+        """
+        with self._lock:
+            hit = self._png_header is not None
+            if not hit:
+                with Image.open(self.path) as img:
+                    self._png_header = {"size": img.size, "mode": img.mode}
+        self._record("png_header", stage, hit)
+        return self._png_header
+
+    def pixels(self, stage: str) -> np.ndarray:
+        """
+        Decoded pixels (read-only): the DICOM pixel array, the PNG as
+        read_png() returns it, or the NIfTI array in its on-disk dtype.
+        """
+        with self._lock:
+            hit = self._pixels is not None
+            if not hit:
+                self._pixels = self._decode()
+            pixels = self._pixels
+        self._record(f"{self.file_type}_pixels", stage, hit)
+        return pixels
+
+    def reduced_pixels(self, stage: str, min_side: int) -> Reduced:
+        """
+        Pixels of a 2D image decoded at reduced scale (short side still
+        >= min_side) with their extent: PNGs and JPEG baseline DICOMs are
+        decoded reduced. Other DICOMs come back at full size (extent None),
+        to be reduced with reduce_pixels() after the intensity step.
+        """
+        with self._lock:
+            hit = self._pixels is not None or (
+                self._reduced is not None and self._reduced[0] == min_side
+            )
+            reduced = self._load_reduced(min_side)
+        self._record(f"{self.file_type}_pixels", stage, hit)
+        return reduced
+
+    def frame_count(self, stage: str) -> int:
+        """
+        Number of frames in a DICOM (1 for single-frame objects).
+        """
+        return int(getattr(self.dicom(stage), "NumberOfFrames", 1) or 1)
+
+    def iter_frames(self, indices: Iterable[int], stage: str) -> Iterator[np.ndarray]:
+        """
+        DICOM frames (read-only) decoded one at a time straight from the
+        file, so memory does not grow with the frame count. Served from
+        the decoded pixels instead when those are already in memory.
+        """
+        indices = list(indices)
+        with self._lock:
+            pixels = self._pixels
+
+        if pixels is not None:
+            self._record("dicom_frames", stage, hit=True, count=len(indices))
+            single = self.frame_count(stage) == 1
+            for index in indices:
+                yield pixels if single else pixels[index]
+            return
+
+        self._record("dicom_frames", stage, hit=False, count=len(indices))
+        for frame in iter_pixels(self.path, indices=indices):
+            frame.setflags(write=False)
+            yield frame
+
+    def release_pixels(self):
+        """
+        Drop decoded pixels but keep parsed headers / datasets.
+        """
+        with self._lock:
+            self._pixels = None
+            self._reduced = None
+
+    def release(self):
+        """
+        Drop decoded pixels and parsed datasets; later accesses decode again.
+        """
+        with self._lock:
+            self._dataset = None
+            self._pixels = None
+            self._reduced = None
+
 
 class ImageVolume:
     """
     Lazy medical image loader.
     Pixels are loaded only when requested.
+
+    NIfTI pixels keep their on-disk dtype: uncompressed files are
+    memory-mapped, and read_region() reads only the requested region
+    through nibabel's array proxy. With NIFTI_UNCOMPRESSED_CACHE_MB set,
+    .nii.gz inputs are served from an uncompressed cached copy.
+
+    Headers and pixels come from `context` when given, so a volume opened
+    by a later stage of the same request does not parse or decode again.
     """
 
-    def __init__(self, path: Path, file_type: str):
+    def __init__(
+        self,
+        path: Path,
+        file_type: str,
+        context: Optional[CaseContext] = None,
+        stage: str = "volume",
+    ):
         self.path = path
         self.file_type = file_type
+        self.stage = stage
+        self._context = context or CaseContext(path, file_type)
         self._pixels = None
         self._meta = None
+        self._nifti: Optional[nib.Nifti1Image] = None
 
         self._load_header()
 
     def _load_header(self):
         if self.file_type == "dicom":
-            ds = pydicom.dcmread(self.path, stop_before_pixels=True)
+            ds = self._context.dicom(self.stage)
             self._meta = {
                 "rows": ds.Rows,
                 "cols": ds.Columns,
@@ -32,11 +374,13 @@ class ImageVolume:
             }
 
         elif self.file_type == "nifti":
-            img = nib.load(str(self.path))
+            # Header only; pixel data stays on disk behind the array proxy
+            self._nifti = self._context.nifti(self.stage)
             self._meta = {
-                "shape": img.shape,
-                "spacing": img.header.get_zooms(),
-                "affine": img.affine,
+                "shape": self._nifti.shape,
+                "spacing": self._nifti.header.get_zooms(),
+                "affine": self._nifti.affine,
+                "dtype": str(self._nifti.get_data_dtype()),
             }
 
         else:
@@ -48,18 +392,28 @@ class ImageVolume:
     def metadata(self):
         return self._meta
 
+    @property
+    def shape(self):
+        if self.file_type == "nifti":
+            return self._nifti.shape
+        return self.load_pixels().shape
+
+    def read_region(self, region) -> np.ndarray:
+        """
+        Read only `region` (a tuple of slices / indices) of the pixel array.
+        For NIfTI this touches just the bytes of that region.
+        """
+        if self.file_type == "nifti" and self._pixels is None:
+            return np.asanyarray(self._nifti.dataobj[region])
+        return self.load_pixels()[region]
+
     def load_pixels(self) -> np.ndarray:
+        """
+        Pixels in their stored dtype, shared read-only through the case context.
+        """
         if self._pixels is not None:
             return self._pixels
 
-        if self.file_type == "dicom":
-            ds = pydicom.dcmread(self.path)
-            self._pixels = ds.pixel_array
-
-        elif self.file_type == "nifti":
-            img = nib.load(str(self.path))
-            self._pixels = img.get_fdata()
-
+        self._pixels = self._context.pixels(self.stage)
         logger.info("Pixel data loaded into memory")
         return self._pixels
-
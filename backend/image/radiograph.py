@@ -0,0 +1,170 @@
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Union
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from backend.core.config import RADIOGRAPH_DECODE_SIZE
+from backend.core.logging import get_logger
+from backend.image.intensity import ValueFn
+from backend.image.loaders import CaseContext, Extent, Reduced, reduce_pixels
+
+logger = get_logger(__name__)
+
+# -----------------------------
+# Locked constants
+# -----------------------------
+IMG_SIZE = 224
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD = [0.229, 0.224, 0.225]
+
+_MEAN = torch.tensor(IMAGENET_MEAN).view(1, 3, 1, 1)
+_STD = torch.tensor(IMAGENET_STD).view(1, 3, 1, 1)
+
+# Route-specific intensity step: (stored DICOM pixels, rescale) -> uint8
+# gray levels. `rescale` maps stored values to float32 modality values
+# and is elementwise, so steps can run as lookup tables (see intensity.py)
+IntensityFn = Callable[[np.ndarray, ValueFn], np.ndarray]
+
+# A file path, or the case context of the current request
+RadiographSource = Union[Path, CaseContext]
+
+_FILE_TYPES = {".dcm": "dicom", ".png": "png"}
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+def dicom_rescale(ds) -> ValueFn:
+    """
+    Stored values -> float32 with RescaleSlope / RescaleIntercept applied.
+    """
+    def rescale(values: np.ndarray) -> np.ndarray:
+        rescaled = values.astype(np.float32)
+        if hasattr(ds, "RescaleSlope"):
+            rescaled *= float(ds.RescaleSlope)
+        if hasattr(ds, "RescaleIntercept"):
+            rescaled += float(ds.RescaleIntercept)
+        return rescaled
+
+    return rescale
+
+
+def _load_radiograph(
+    source: RadiographSource,
+    intensity: IntensityFn,
+    route: str,
+    decode_size: int,
+    elementwise: bool,
+) -> Reduced:
+    if isinstance(source, CaseContext):
+        context = source
+    else:
+        file_type = _FILE_TYPES.get(source.suffix.lower())
+        if file_type is None:
+            raise ValueError(f"Unsupported {route} format: {source}")
+        context = CaseContext(source, file_type)
+
+    if context.file_type == "dicom":
+        logger.info(f"{route.capitalize()} preprocessing: DICOM input")
+        if not decode_size:
+            return intensity(context.pixels(route), dicom_rescale(context.dicom(route))), None
+
+        if elementwise:
+            pixels, extent = context.reduced_pixels(route, decode_size)
+        else:
+            # Image statistics (e.g. percentiles) see every stored value
+            pixels, extent = context.pixels(route), None
+        gray = intensity(pixels, dicom_rescale(context.dicom(route)))
+        return (gray, extent) if extent is not None else reduce_pixels(gray, decode_size)
+
+    if context.file_type == "png":
+        logger.info(f"{route.capitalize()} preprocessing: PNG input")
+        if not decode_size:
+            return context.pixels(route), None
+        return context.reduced_pixels(route, decode_size)
+
+    raise ValueError(f"Unsupported {route} format: {context.path}")
+
+
+# -----------------------------
+# Resize + normalize
+# -----------------------------
+def resize_normalize(images: torch.Tensor, extent: Optional[Extent] = None) -> torch.Tensor:
+    """
+    (N, C, H, W) gray levels 0–255 with C = 1 or 3 -> (N, 3, 224, 224)
+    model input.
+
+    Same steps as torchvision Resize -> ToTensor -> Normalize on a uint8
+    PIL image: bilinear antialiased resize (rounded like PIL's uint8
+    output), scale to 0–1, ImageNet normalization. A gray channel is
+    expanded to RGB as a view; normalization writes the only copy.
+
+    For images decoded at reduced scale, `extent` is the full-resolution
+    size in reduced pixels; resizing from it samples the same points as
+    resizing the full-resolution image.
+    """
+    if extent is None:
+        resize = {"size": (IMG_SIZE, IMG_SIZE)}
+    else:
+        scale = (IMG_SIZE / extent[0], IMG_SIZE / extent[1])
+        resize = {"scale_factor": scale, "recompute_scale_factor": False}
+
+    x = F.interpolate(
+        images,
+        mode="bilinear",
+        antialias=True,
+        align_corners=False,
+        **resize,
+    )[..., :IMG_SIZE, :IMG_SIZE].round_().clamp_(0, 255)
+
+    return (x.expand(-1, 3, -1, -1) / 255.0 - _MEAN) / _STD
+
+
+def to_model_input(images: Iterable[Union[np.ndarray, Reduced]]) -> torch.Tensor:
+    """
+    Gray-level images, each (H, W) or (H, W, 3) and of any size, into one
+    (N, 3, 224, 224) batch. Items may also be (image, extent) pairs from a
+    reduced-scale decode. Each image is resized as soon as it is yielded,
+    so only one full-resolution image is alive at a time.
+    """
+    batch = []
+    for image in images:
+        image, extent = image if isinstance(image, tuple) else (image, None)
+        # uint8 gray levels (PNG, intensity steps) are converted once
+        x = torch.from_numpy(np.asarray(image, dtype=np.float32))
+        x = x[None, None] if x.ndim == 2 else x.permute(2, 0, 1)[None]
+        batch.append(resize_normalize(x, extent))
+    return torch.cat(batch) if len(batch) > 1 else batch[0]
+
+
+# -----------------------------
+# Main entry
+# -----------------------------
+def preprocess_radiographs(
+    images: Union[RadiographSource, List[RadiographSource]],
+    intensity: IntensityFn,
+    route: str,
+    decode_size: int = RADIOGRAPH_DECODE_SIZE,
+    elementwise: bool = True,
+) -> torch.Tensor:
+    """
+    Preprocess one or more 2D radiographs (DICOM or PNG) for a specialist.
+
+    DICOM pixels go through the route's intensity step; PNGs are used as
+    stored. Images larger than decode_size on the short side are decoded
+    or block-averaged to reduced scale first (0 keeps full resolution).
+    Set elementwise=False for intensity steps that depend on image
+    statistics: DICOM stored values are then decoded in full and reduced
+    only after the intensity step.
+    Inputs given as case contexts reuse pixels already decoded by earlier
+    stages. Returns (N, 3, 224, 224), one row per input.
+    """
+    if not isinstance(images, list):
+        images = [images]
+
+    return to_model_input(
+        _load_radiograph(source, intensity, route, decode_size, elementwise) for source in images
+    )
+
@@ -0,0 +1,82 @@
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator, Tuple, Union
+
+from backend.core.logging import get_logger
+from backend.ingestion.spool import MAX_UPLOAD_BYTES, SpooledUpload, UploadTooLargeError, spool_upload
+
+logger = get_logger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _iter_members(path: Path) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yield (member name, readable stream) for every regular file.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                with zf.open(info) as member:
+                    yield info.filename, member
+        return
+
+    with tarfile.open(path, mode="r:*") as tf:
+        for info in tf:
+            if not info.isfile():
+                continue
+            member = tf.extractfile(info)
+            if member is not None:
+                with member:
+                    yield info.name, member
+
+
+def spool_archive(
+    path: Path,
+    max_members: int,
+    max_bytes: int,
+) -> Iterator[Tuple[str, Union[SpooledUpload, Exception]]]:
+    """
+    Stream every file in an archive through spool_upload.
+
+    Members are never extracted under their own path (only the base name
+    is kept), and each one gets the same hashing, sniffing and size checks
+    as a direct upload. Per-member failures are yielded, not raised; going
+    over max_bytes of extracted data in total raises UploadTooLargeError.
+    """
+    count = 0
+    extracted = 0
+    for name, stream in _iter_members(path):
+        base = Path(name).name
+        if not base or base.startswith("."):
+            continue
+
+        count += 1
+        if count > max_members:
+            raise ValueError(f"Archive has more than {max_members} files")
+
+        limit = min(MAX_UPLOAD_BYTES, max_bytes - extracted)
+        try:
+            upload = spool_upload(stream, base, max_bytes=limit)
+        except UploadTooLargeError as e:
+            if limit < MAX_UPLOAD_BYTES:
+                raise UploadTooLargeError(
+                    f"Archive contents exceed the remaining limit of {max_bytes} bytes"
+                ) from e
+            yield base, e
+            continue
+        except Exception as e:
+            yield base, e
+            continue
+
+        extracted += upload.size
+        yield base, upload
+
+    logger.info(f"Archive spooled: {path.name} ({count} files)")
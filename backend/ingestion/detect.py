@@ -3,8 +3,8 @@ from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-def detect_file_type(path: Path) -> str:
-    if not path.exists():
+def detect_file_type(path: Path, must_exist: bool = True) -> str:
+    if must_exist and not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
     name = path.name.lower()
@@ -29,3 +29,54 @@ def detect_file_type(path: Path) -> str:
         return "png"
 
     raise ValueError(f"Unsupported file type: {path.name}")
+
+
+# -------------------------------------------------
+# Magic-byte sniffing (used while spooling uploads)
+# -------------------------------------------------
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+GZIP_MAGIC = b"\x1f\x8b"
+DICOM_MAGIC_OFFSET = 128
+DICOM_MAGIC = b"DICM"
+NIFTI1_MAGIC_OFFSET = 344
+NIFTI1_MAGICS = (b"n+1\x00", b"ni1\x00")
+
+
+def full_suffix(filename: str) -> str:
+    """
+    File suffix including the compound .nii.gz extension.
+    """
+    name = filename.lower()
+    if name.endswith(".nii.gz"):
+        return ".nii.gz"
+    return Path(name).suffix
+
+
+def sniff_file_type(head: bytes, filename: str) -> str:
+    """
+    Detect file type from the extension and confirm it against the
+    leading bytes of the content.
+    """
+    file_type = detect_file_type(Path(filename), must_exist=False)
+
+    if file_type == "png":
+        ok = head.startswith(PNG_MAGIC)
+
+    elif file_type == "dicom":
+        # Preamble + DICM; tolerate legacy files without a preamble
+        ok = (
+            head[DICOM_MAGIC_OFFSET:DICOM_MAGIC_OFFSET + 4] == DICOM_MAGIC
+            or head[:2] in (b"\x02\x00", b"\x08\x00")
+        )
+
+    elif filename.lower().endswith(".nii.gz"):
+        ok = head.startswith(GZIP_MAGIC)
+
+    else:
+        ok = head[NIFTI1_MAGIC_OFFSET:NIFTI1_MAGIC_OFFSET + 4] in NIFTI1_MAGICS
+
+    if not ok:
+        raise ValueError(f"File content does not match {file_type}: {filename}")
+
+    logger.info(f"Magic bytes confirmed: {file_type}")
+    return file_type
@@ -1,9 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-import pydicom
-import nibabel as nib
+from typing import Optional
 
 from backend.core.logging import get_logger
+from backend.image.loaders import CaseContext
 
 logger = get_logger(__name__)
 
@@ -13,11 +13,15 @@ class CaseInfo:
     file_path: Path
     file_type: str
     metadata: dict
+    # Decode-once headers / pixels shared by the request's later stages
+    context: Optional[CaseContext] = field(default=None, repr=False, compare=False)
 
 
-def extract_metadata(path: Path, file_type: str) -> dict:
+def extract_metadata(path: Path, file_type: str, context: Optional[CaseContext] = None) -> dict:
+    context = context or CaseContext(path, file_type)
+
     if file_type == "dicom":
-        ds = pydicom.dcmread(path, stop_before_pixels=True)
+        ds = context.dicom("ingestion")
 
         meta = {
             "modality": getattr(ds, "Modality", None),
@@ -27,11 +31,11 @@ def extract_metadata(path: Path, file_type: str) -> dict:
             "columns": getattr(ds, "Columns", None),
         }
 
-        logger.info("DICOM metadata extracted (no pixels)")
+        logger.info("DICOM metadata extracted (pixels not decoded)")
         return meta
 
     if file_type == "nifti":
-        img = nib.load(str(path))  # header only
+        img = context.nifti("ingestion")  # header only
         hdr = img.header
 
         meta = {
@@ -43,4 +47,10 @@ def extract_metadata(path: Path, file_type: str) -> dict:
         logger.info("NIfTI metadata extracted (no pixels)")
         return meta
 
+    if file_type == "png":
+        meta = dict(context.png_header("ingestion"))  # header only
+
+        logger.info("PNG metadata extracted (no pixels)")
+        return meta
+
     raise ValueError(f"Unknown file type: {file_type}")
@@ -0,0 +1,93 @@
+import hashlib
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from backend.core.config import MAX_UPLOAD_MB
+from backend.core.logging import get_logger
+from backend.core.paths import TEMP_DIR
+from backend.ingestion.detect import full_suffix, sniff_file_type
+from backend.ingestion.validate import MIN_FILE_SIZE_BYTES
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+
+# Enough to cover every magic-byte offset we check (NIfTI-1 magic at 344)
+SNIFF_BYTES = 352
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    path: Path
+    filename: str
+    file_type: str
+    sha256: str
+    size: int
+
+
+def spool_upload(
+    src: BinaryIO,
+    filename: str,
+    dest_dir: Path = TEMP_DIR,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    sniff: bool = True,
+) -> SpooledUpload:
+    """
+    Stream an upload to a per-request file in one pass.
+
+    While copying, the SHA-256 is computed, the leading bytes are kept for
+    magic-byte sniffing, and the size limit is enforced. Oversized uploads
+    are rejected as soon as the limit is crossed and the partial file is
+    removed. With sniff=False (archives) the content type is not checked.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / f"{uuid.uuid4().hex}{full_suffix(filename)}"
+
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+
+    try:
+        with open(dest, "wb") as f:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds limit of {max_bytes} bytes"
+                    )
+
+                if len(head) < SNIFF_BYTES:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+
+                digest.update(chunk)
+                f.write(chunk)
+
+        if size < MIN_FILE_SIZE_BYTES:
+            raise ValueError("File too small to be a valid medical scan")
+
+        file_type = sniff_file_type(head, filename) if sniff else "archive"
+
+    except Exception:
+        dest.unlink(missing_ok=True)
+        raise
+
+    upload = SpooledUpload(
+        path=dest,
+        filename=filename,
+        file_type=file_type,
+        sha256=digest.hexdigest(),
+        size=size,
+    )
+    logger.info(f"Upload spooled: {filename} -> {dest.name} ({size} bytes, {file_type})")
+    return upload
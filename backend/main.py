@@ -1,17 +1,71 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from backend.api.routes import router
 from backend.core.seeds import set_global_seeds
 from backend.core.paths import ensure_runtime_dirs
+from backend.core.config import BATCH_MAX_UPLOAD_MB, WARMUP_ON_STARTUP
+from backend.ingestion.spool import MAX_UPLOAD_BYTES
+from backend.runtime.executor import shutdown_executor
+from backend.runtime.jobs import get_job_manager
+from backend.runtime.warmup import start_warmup
+from backend.pipeline import DEVICE
+
+# Allowance for multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+BODY_LIMITS = {
+    "/analyze/batch": BATCH_MAX_UPLOAD_MB * 1024 * 1024,
+}
+
+
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Refuse bodies that declare a size above the upload limit before any
+    of the body is read. Chunked uploads are still capped while spooling.
+    """
+    length = request.headers.get("content-length")
+    limit = BODY_LIMITS.get(request.url.path, MAX_UPLOAD_BYTES)
+    if length is not None and length.isdigit():
+        if int(length) > limit + MULTIPART_OVERHEAD_BYTES:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": "Upload exceeds size limit"},
+            )
+    return await call_next(request)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if app.state.warmup:
+        start_warmup(DEVICE)
+
+    jobs = get_job_manager()
+    await jobs.start()
+    try:
+        yield
+    finally:
+        await jobs.stop()
+        shutdown_executor()
+
 
-def create_app() -> FastAPI:
+def create_app(warmup: bool = WARMUP_ON_STARTUP) -> FastAPI:
+    """
+    warmup: load all models and run a dummy forward pass in the
+    background at start-up; /healthz/ready reports ready once done.
+    """
     set_global_seeds()
     ensure_runtime_dirs()
 
     app = FastAPI(
         title="S.P.E.C.T.R.A Backend",
         version="1.0",
+        lifespan=lifespan,
     )
 
+    app.state.warmup = warmup
+    app.middleware("http")(reject_oversized_uploads)
     app.include_router(router)
     return app
 
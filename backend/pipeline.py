@@ -0,0 +1,233 @@
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import torch
+
+from backend.ingestion.spool import SpooledUpload
+from backend.ingestion.metadata import CaseInfo, extract_metadata
+from backend.image.loaders import CaseContext
+from backend.runtime.workspace import create_case_workspace
+from backend.gatekeeper.preprocess import preprocess_gatekeeper
+from backend.gatekeeper.infer import infer_gatekeeper
+from backend.router import RoutingError, route_case
+from backend.runtime.executor import run_stage
+
+from backend.brain.preprocess import preprocess_brain_case
+from backend.chest.preprocess import (
+    is_multiframe,
+    iter_chest_frame_batches,
+    preprocess_chest_image,
+)
+from backend.bone.preprocess import preprocess_bone_image
+
+from backend.brain.infer import infer_brain, infer_brain_sliding_window
+from backend.chest.infer import infer_chest, infer_chest_frames
+from backend.bone.infer import infer_bone
+
+from backend.postprocess.aggregate import (
+    postprocess_brain_logits,
+    postprocess_chest_probs,
+    postprocess_bone_probs,
+)
+
+from backend.results.schema import (
+    ResultSchema,
+    build_brain_result,
+    build_chest_result,
+    build_bone_result,
+    result_to_dict,
+)
+
+from backend.core.logging import get_logger
+from backend.core.config import (
+    BRAIN_INFERENCE_MODE,
+    BRAIN_MODEL_VERSION,
+    CHEST_MODEL_VERSION,
+    BONE_MODEL_VERSION,
+)
+
+logger = get_logger(__name__)
+
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+# (stage name, blocking fn or coroutine fn, *args) -> awaitable result
+StageRunner = Callable[..., Awaitable[Any]]
+
+
+def ingest_upload(upload: SpooledUpload) -> CaseInfo:
+    case_id = uuid.uuid4().hex
+    case_file = create_case_workspace(case_id, upload)
+
+    # Parsed headers / decoded pixels, shared by every later stage
+    context = CaseContext(case_file, upload.file_type)
+    meta = extract_metadata(case_file, upload.file_type, context)
+    meta["sha256"] = upload.sha256
+    meta["size_bytes"] = upload.size
+
+    return CaseInfo(
+        case_id=case_id,
+        file_path=case_file,
+        file_type=upload.file_type,
+        metadata=meta,
+        context=context,
+    )
+
+
+# -------------------------------------------------
+# Specialist steps (shared with the bulk pipeline)
+# -------------------------------------------------
+
+async def run_brain_case(case_info: CaseInfo, run_stage: StageRunner) -> ResultSchema:
+    case_dir = case_info.file_path.parent
+
+    if BRAIN_INFERENCE_MODE == "sliding_window":
+        volume = await run_stage("brain_preprocess", preprocess_brain_case, case_dir, crop=False)
+        logits = await run_stage(
+            "brain_infer", infer_brain_sliding_window, volume.unsqueeze(0), DEVICE
+        )
+    else:
+        volume = await run_stage("brain_preprocess", preprocess_brain_case, case_dir)
+        logits = await run_stage("brain_infer", infer_brain, volume.unsqueeze(0), DEVICE)
+    mask, conf = await run_stage("brain_postprocess", postprocess_brain_logits, logits)
+
+    return build_brain_result(
+        case_id=case_info.case_id,
+        confidence=conf,
+        model_version=BRAIN_MODEL_VERSION,
+        tumor_present=conf > 0.5,
+    )
+
+
+def chest_result(
+    case_info: CaseInfo,
+    mean_probs: torch.Tensor,
+    frame_probs: Optional[torch.Tensor] = None,
+) -> ResultSchema:
+    _, conf = postprocess_chest_probs(mean_probs)
+
+    extra = None
+    if frame_probs is not None:
+        extra = {
+            "frames": len(frame_probs),
+            "frame_probabilities": frame_probs.tolist(),
+        }
+
+    return build_chest_result(
+        case_id=case_info.case_id,
+        confidence=conf,
+        model_version=CHEST_MODEL_VERSION,
+        abnormal=conf > 0.5,
+        extra=extra,
+    )
+
+
+async def run_chest_frames_case(case_info: CaseInfo, run_stage: StageRunner) -> ResultSchema:
+    """
+    Chest path for a multi-frame DICOM: frames are decoded and preprocessed
+    in fixed-size batches on the worker pool, one stage per batch, and each
+    batch is awaited on the model's micro-batcher while the next one is
+    prepared. Memory stays flat regardless of frame count and no worker is
+    held for the whole study. The study result is the mean over frames;
+    per-frame probabilities go in `details`.
+    """
+    context = case_info.context
+    context.release_pixels()  # frames are streamed from the file
+
+    frames = iter_chest_frame_batches(context)
+    probs = []
+    batch = await run_stage("chest_preprocess", next, frames, None)
+    while batch is not None:
+        upcoming = asyncio.ensure_future(run_stage("chest_preprocess", next, frames, None))
+        try:
+            probs.append(await run_stage("chest_infer", infer_chest_frames, batch, DEVICE))
+        except BaseException:
+            upcoming.cancel()
+            raise
+        batch = await upcoming
+    context.release()
+
+    frame_probs = torch.cat(probs)
+    logger.info(
+        f"Chest frames: {len(frame_probs)}, "
+        f"mean confidence: {frame_probs.mean(dim=0).max().item():.3f}"
+    )
+    return chest_result(case_info, frame_probs.mean(dim=0), frame_probs)
+
+
+def bone_result(case_info: CaseInfo, probs: torch.Tensor) -> ResultSchema:
+    _, conf = postprocess_bone_probs(probs)
+
+    return build_bone_result(
+        case_id=case_info.case_id,
+        confidence=conf,
+        model_version=BONE_MODEL_VERSION,
+        fracture=conf > 0.5,
+    )
+
+
+async def run_case_pipeline(
+    upload: SpooledUpload,
+    run_stage: StageRunner = run_stage,
+) -> Dict[str, Any]:
+    """
+    Full case pipeline for a spooled upload: ingestion, gatekeeper,
+    routing and the specialist model. Returns the result as a dict.
+
+    Every blocking step goes through run_stage, which by default is the
+    shared bounded worker pool; callers such as the job queue pass their
+    own runner to use a different pool or to record progress. Inference
+    stages are coroutines that await the model's micro-batcher on the
+    event loop, so they never hold a worker.
+    """
+
+    # -------------------------------------------------
+    # Ingestion
+    # -------------------------------------------------
+    case_info = await run_stage("ingestion", ingest_upload, upload)
+    case_file = case_info.file_path
+
+    # -------------------------------------------------
+    # Gatekeeper
+    # -------------------------------------------------
+    gate_tensor = await run_stage(
+        "gatekeeper_preprocess",
+        preprocess_gatekeeper,
+        case_file,
+        case_info.file_type,
+        case_info.context,
+    )
+    gate_pred, gate_conf = await run_stage(
+        "gatekeeper_infer", infer_gatekeeper, gate_tensor, DEVICE
+    )
+
+    route = route_case(gate_pred)
+    logger.info(f"Route locked: {route}")
+
+    # -------------------------------------------------
+    # Specialist pipelines
+    # -------------------------------------------------
+    if route == "brain":
+        # The brain pipeline loads the case directory itself
+        case_info.context.release()
+        result = await run_brain_case(case_info, run_stage)
+
+    elif route == "chest" and is_multiframe(case_info.context):
+        result = await run_chest_frames_case(case_info, run_stage)
+
+    elif route == "chest":
+        tensor = await run_stage("chest_preprocess", preprocess_chest_image, case_info.context)
+        case_info.context.release()
+        probs = await run_stage("chest_infer", infer_chest, tensor.unsqueeze(0), DEVICE)
+        result = chest_result(case_info, probs)
+
+    elif route == "bone":
+        tensor = await run_stage("bone_preprocess", preprocess_bone_image, case_info.context)
+        case_info.context.release()
+        probs = await run_stage("bone_infer", infer_bone, tensor, DEVICE)
+        result = bone_result(case_info, probs)
+
+    else:
+        raise RoutingError(f"Invalid route: {route}")
+
+    return result_to_dict(result)
@@ -1,7 +1,10 @@
+from typing import Optional
+
 import torch
 import numpy as np
 from scipy.ndimage import label
 
+from backend.core.config import BRAIN_POSTPROCESS_DEPTH_CHUNK
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -9,36 +12,95 @@ logger = get_logger(__name__)
 # -----------------------------
 # 9.1 Brain aggregation
 # -----------------------------
+def _argmax_uint8(logits: torch.Tensor, depth_chunk: Optional[int]) -> np.ndarray:
+    """
+    (1, C, D, H, W) logits -> (D, H, W) uint8 class map, computed slab by
+    slab so the int64 argmax never spans the whole volume.
+    """
+    depth = logits.shape[2]
+    step = depth_chunk or depth
+
+    pred = np.empty(logits.shape[2:], dtype=np.uint8)
+    for z in range(0, depth, step):
+        pred[z:z + step] = torch.argmax(logits[0, :, z:z + step], dim=0).to(torch.uint8).cpu().numpy()
+    return pred
+
+
+def _component_prob_sums(
+    logits: torch.Tensor,
+    cls: int,
+    labeled: np.ndarray,
+    kept: np.ndarray,
+    num: int,
+    depth_chunk: Optional[int],
+) -> np.ndarray:
+    """
+    Per-component sum of the class probability, with the softmax evaluated
+    only on voxels of kept components.
+    """
+    depth = labeled.shape[0]
+    step = depth_chunk or depth
+
+    sums = np.zeros(num + 1, dtype=np.float64)
+    for z in range(0, depth, step):
+        slab = labeled[z:z + step]
+        voxels = kept[slab]
+        if not voxels.any():
+            continue
+
+        # (C, K) logits at the selected voxels only
+        selected = logits[0, :, z:z + step][:, torch.from_numpy(voxels).to(logits.device)]
+        probs = torch.softmax(selected, dim=0)[cls].cpu().numpy()
+        sums += np.bincount(slab[voxels], weights=probs, minlength=num + 1)
+    return sums
+
+
 def postprocess_brain_logits(
     logits: torch.Tensor,
-    min_voxels: int = 500
+    min_voxels: int = 500,
+    depth_chunk: Optional[int] = BRAIN_POSTPROCESS_DEPTH_CHUNK,
 ):
     """
     logits: (1, 3, D, H, W)
-    returns: cleaned_mask, confidence
+    returns: cleaned_mask (uint8), confidence
+
+    Per class, connected components are labeled once; component sizes
+    come from one bincount, and components smaller than min_voxels are
+    dropped with a single lookup-table index.
+
+    The class map is taken straight from the logits (argmax is unchanged
+    by softmax) and kept as uint8; probabilities are only computed for
+    voxels of kept components, where the confidence needs them. With
+    depth_chunk set, both steps run over depth slabs.
     """
 
-    probs = torch.softmax(logits, dim=1)
-    pred = torch.argmax(probs, dim=1)[0]  # (D, H, W)
+    pred = _argmax_uint8(logits, depth_chunk)  # (D, H, W)
 
-    cleaned = torch.zeros_like(pred)
+    cleaned = np.zeros(pred.shape, dtype=np.uint8)
     confidence = 0.0
 
     for cls in [1, 2]:  # tumor classes only
-        mask = (pred == cls).cpu().numpy()
-        labeled, num = label(mask)
-
-        for i in range(1, num + 1):
-            region = (labeled == i)
-            if region.sum() >= min_voxels:
-                cleaned[region] = cls
-                confidence = max(
-                    confidence,
-                    probs[0, cls][region].mean().item()
-                )
+        labeled, num = label(pred == cls)
+        if num == 0:
+            continue
+
+        sizes = np.bincount(labeled.ravel(), minlength=num + 1)
+
+        keep = sizes >= min_voxels
+        keep[0] = False  # background label
+        if not keep.any():
+            continue
+
+        # Class masks are disjoint, so kept components can be added in
+        lut = np.where(keep, cls, 0).astype(np.uint8)
+        cleaned += lut[labeled]
+
+        prob_sums = _component_prob_sums(logits, cls, labeled, keep, num, depth_chunk)
+        means = prob_sums[keep] / sizes[keep]
+        confidence = max(confidence, float(np.float32(means.max())))
 
     logger.info(f"Brain postprocess confidence: {confidence:.3f}")
-    return cleaned, confidence
+    return torch.from_numpy(cleaned), confidence
 
 
 # -----------------------------
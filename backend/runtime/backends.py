@@ -0,0 +1,235 @@
+import copy
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Tuple
+
+import numpy as np
+import torch
+
+from backend.core.config import EXPORT_DIR, INFERENCE_BACKEND, QUANTIZATION_ENGINE
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("torch", "torchscript", "onnx", "int8")
+
+# Post-training static quantization is only offered for the 2D classifiers
+QUANTIZABLE_MODELS = ("gatekeeper", "chest", "bone")
+
+# Per-sample input shape of each network (batch dimension excluded)
+MODEL_INPUT_SHAPES: Dict[str, Tuple[int, ...]] = {
+    "gatekeeper": (3, 224, 224),
+    "chest": (3, 224, 224),
+    "bone": (3, 224, 224),
+    "brain": (4, 128, 128, 128),
+}
+
+_ARTIFACT_SUFFIX = {
+    "torchscript": ".ts",
+    "onnx": ".onnx",
+    "int8": ".int8.ts",
+}
+
+
+def artifact_path(name: str, backend: str) -> Path:
+    return EXPORT_DIR / f"{name}{_ARTIFACT_SUFFIX[backend]}"
+
+
+# -------------------------------------------------
+# Runtime wrappers
+# -------------------------------------------------
+
+class OnnxModel(torch.nn.Module):
+    """
+    ONNX Runtime session behind the same tensor-in / tensor-out call
+    signature as the eager network.
+    """
+
+    def __init__(self, path: Path, device: torch.device):
+        super().__init__()
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError(
+                "INFERENCE_BACKEND requests 'onnx' but onnxruntime is not installed"
+            ) from e
+
+        providers = ["CPUExecutionProvider"]
+        if device.type == "cuda":
+            providers.insert(0, "CUDAExecutionProvider")
+
+        self.device = device
+        self.session = ort.InferenceSession(str(path), providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+        # Parameters live inside the session; report the file size instead
+        self.resident_bytes = path.stat().st_size
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        array = x.detach().cpu().numpy().astype(np.float32, copy=False)
+        (out,) = self.session.run(None, {self.input_name: array})
+        return torch.from_numpy(out).to(self.device)
+
+
+def load_torchscript(path: Path, device: torch.device) -> torch.nn.Module:
+    model = torch.jit.load(str(path), map_location=device)
+    model.eval()
+    return model
+
+
+def load_int8(path: Path, device: torch.device) -> torch.nn.Module:
+    if device.type != "cpu":
+        raise RuntimeError(f"int8 models run on CPU only, not {device}")
+
+    torch.backends.quantized.engine = QUANTIZATION_ENGINE
+    model = load_torchscript(path, device)
+    # Packed int8 weights are not parameters; report the file size instead
+    model.resident_bytes = path.stat().st_size
+    return model
+
+
+def load_backend_model(name: str, backend: str, device: torch.device) -> torch.nn.Module:
+    path = artifact_path(name, backend)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No {backend} artifact for {name} at {path}; run scripts/export_models.py"
+        )
+
+    if backend == "torchscript":
+        model = load_torchscript(path, device)
+    elif backend == "int8":
+        model = load_int8(path, device)
+    else:
+        model = OnnxModel(path, device)
+
+    logger.info(f"Loaded {name} with {backend} backend from {path.name}")
+    return model
+
+
+def with_backend(
+    name: str,
+    eager_builder: Callable[[torch.device], torch.nn.Module],
+) -> Callable[[torch.device], torch.nn.Module]:
+    """
+    Wrap a model builder so the runtime backend is chosen per model by
+    INFERENCE_BACKEND[name] ("torch" | "torchscript" | "onnx" | "int8").
+    """
+    def build(device: torch.device) -> torch.nn.Module:
+        backend = INFERENCE_BACKEND.get(name, "torch")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend for {name}: {backend}")
+        if backend == "int8" and name not in QUANTIZABLE_MODELS:
+            raise ValueError(f"int8 backend is not supported for {name}")
+        if backend == "torch":
+            return eager_builder(device)
+        return load_backend_model(name, backend, device)
+
+    return build
+
+
+# -------------------------------------------------
+# Export + parity
+# -------------------------------------------------
+
+def export_model(name: str, model: torch.nn.Module, backend: str) -> Path:
+    """
+    Export an eager model to TorchScript or ONNX with a dynamic batch axis.
+    """
+    path = artifact_path(name, backend)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    example = torch.zeros((1,) + MODEL_INPUT_SHAPES[name])
+
+    with torch.no_grad():
+        if backend == "torchscript":
+            traced = torch.jit.trace(model, example)
+            traced.save(str(path))
+
+        elif backend == "onnx":
+            torch.onnx.export(
+                model,
+                (example,),
+                str(path),
+                input_names=["input"],
+                output_names=["logits"],
+                dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+                dynamo=False,
+            )
+
+        else:
+            raise ValueError(f"Cannot export to backend: {backend}")
+
+    logger.info(f"Exported {name} -> {path}")
+    return path
+
+
+def quantize_model(
+    name: str,
+    model: torch.nn.Module,
+    calibration: Iterable[torch.Tensor],
+) -> Path:
+    """
+    Post-training static INT8 quantization (FX graph mode).
+
+    The eager FP32 model is observed on the calibration batches, converted
+    to int8 and saved as TorchScript for the "int8" backend.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    if name not in QUANTIZABLE_MODELS:
+        raise ValueError(f"Cannot quantize {name}")
+
+    path = artifact_path(name, "int8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    example = torch.zeros((1,) + MODEL_INPUT_SHAPES[name])
+
+    torch.backends.quantized.engine = QUANTIZATION_ENGINE
+    # prepare_fx fuses modules in place; keep the caller's FP32 model intact
+    model = copy.deepcopy(model).cpu().eval()
+
+    with torch.no_grad():
+        prepared = prepare_fx(
+            model,
+            get_default_qconfig_mapping(QUANTIZATION_ENGINE),
+            (example,),
+        )
+        batches = 0
+        for batch in calibration:
+            prepared(batch.cpu())
+            batches += 1
+        if batches == 0:
+            raise ValueError(f"No calibration data for {name}")
+
+        quantized = convert_fx(prepared)
+        traced = torch.jit.trace(quantized, example)
+        traced.save(str(path))
+
+    logger.info(f"Quantized {name} -> {path} ({batches} calibration batches)")
+    return path
+
+
+def check_parity(
+    name: str,
+    eager: torch.nn.Module,
+    candidate: torch.nn.Module,
+    batch_size: int = 2,
+    atol: float = 1e-3,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """
+    Compare a backend's outputs with eager PyTorch on random input.
+    Returns max/mean absolute difference and whether it is within atol.
+    """
+    generator = torch.Generator().manual_seed(seed)
+    x = torch.randn((batch_size,) + MODEL_INPUT_SHAPES[name], generator=generator)
+
+    with torch.no_grad():
+        expected = eager(x)
+        actual = candidate(x)
+
+    diff = (expected - actual.to(expected.device)).abs()
+    report = {
+        "max_abs_diff": diff.max().item(),
+        "mean_abs_diff": diff.mean().item(),
+        "atol": atol,
+    }
+    report["ok"] = report["max_abs_diff"] <= atol
+    return report
@@ -0,0 +1,195 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+import torch
+
+from backend.core import metrics
+from backend.core.config import BATCHING
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_QUEUE_DEPTH = metrics.gauge(
+    "spectra_batcher_queue_depth",
+    "Requests waiting in the micro-batching queue",
+)
+_BATCH_SIZE = metrics.histogram(
+    "spectra_batcher_batch_size",
+    "Rows per batched forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+_BATCH_WAIT = metrics.histogram(
+    "spectra_batcher_wait_seconds",
+    "Time the oldest request in a batch spent queued",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+
+@dataclass
+class _Request:
+    batch: torch.Tensor
+    future: Future
+    enqueued: float
+
+
+class MicroBatcher:
+    """
+    Per-model dynamic batching queue.
+
+    Concurrent callers submit (N, ...) tensors. A single worker thread
+    gathers them until max_batch_size rows are collected or max_wait_ms
+    has elapsed since the first request, runs one forward pass, and hands
+    each caller its own slice of the output.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        forward_fn: Callable[[torch.Tensor], torch.Tensor],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ):
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._forward = forward_fn
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._carry: Optional[_Request] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, batch: torch.Tensor) -> Future:
+        """
+        Enqueue a batch and return a future resolving to its output rows.
+        """
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put(_Request(batch, future, time.monotonic()))
+        _QUEUE_DEPTH.set(self._queue.qsize(), model=self.name)
+        return future
+
+    def run(self, batch: torch.Tensor) -> torch.Tensor:
+        """
+        Blocking submit.
+        """
+        return self.submit(batch).result()
+
+    async def run_async(self, batch: torch.Tensor) -> torch.Tensor:
+        """
+        Awaitable submit: waits on the event loop, not on a pool worker,
+        so concurrent requests can fill a batch beyond the pool size.
+        """
+        return await asyncio.wrap_future(self.submit(batch))
+
+    # -------------------------------------------------
+    # Worker
+    # -------------------------------------------------
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._loop,
+                name=f"batcher-{self.name}",
+                daemon=True,
+            )
+            self._thread.start()
+            logger.info(
+                f"Batcher started: {self.name} "
+                f"(max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:.1f})"
+            )
+
+    def _collect(self) -> List[_Request]:
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+
+        requests = [first]
+        rows = len(first.batch)
+        deadline = time.monotonic() + self.max_wait
+
+        while rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                req = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            # Never split a caller's batch; hold it for the next round
+            if rows + len(req.batch) > self.max_batch_size:
+                self._carry = req
+                break
+
+            requests.append(req)
+            rows += len(req.batch)
+
+        return requests
+
+    def _loop(self):
+        while True:
+            requests = self._collect()
+            _QUEUE_DEPTH.set(self._queue.qsize(), model=self.name)
+
+            requests = [r for r in requests if r.future.set_running_or_notify_cancel()]
+            if not requests:
+                continue
+
+            sizes = [len(r.batch) for r in requests]
+            _BATCH_SIZE.observe(sum(sizes), model=self.name)
+            _BATCH_WAIT.observe(
+                time.monotonic() - requests[0].enqueued, model=self.name
+            )
+
+            try:
+                batch = torch.cat([r.batch for r in requests], dim=0)
+                output = self._forward(batch)
+            except Exception as e:
+                logger.exception(f"Batched forward failed: {self.name}")
+                for r in requests:
+                    r.future.set_exception(e)
+                continue
+
+            for r, chunk in zip(requests, torch.split(output, sizes, dim=0)):
+                r.future.set_result(chunk)
+
+
+# -------------------------------------------------
+# Per-model batchers
+# -------------------------------------------------
+
+_batchers: Dict[Tuple[str, str], MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(
+    name: str,
+    forward_fn: Callable[[torch.Tensor, torch.device], torch.Tensor],
+    device: torch.device,
+) -> MicroBatcher:
+    """
+    Return the process-wide batcher for a model on a device.
+    Settings come from BATCHING[name] in backend.core.config.
+    """
+    key = (name, str(device))
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            cfg = BATCHING[name]
+            batcher = MicroBatcher(
+                name=name,
+                forward_fn=partial(forward_fn, device=device),
+                max_batch_size=cfg["max_batch_size"],
+                max_wait_ms=cfg["max_wait_ms"],
+            )
+            _batchers[key] = batcher
+        return batcher
@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.core import metrics
+from backend.core.config import (
+    GATEKEEPER_MODEL_VERSION,
+    BRAIN_MODEL_VERSION,
+    CHEST_MODEL_VERSION,
+    BONE_MODEL_VERSION,
+    INFERENCE_BACKEND,
+    QUANTIZATION_ENGINE,
+    GATEKEEPER_CONFIDENCE_THRESHOLD,
+    GATEKEEPER_ADAPTIVE_SLICES,
+    GATEKEEPER_EARLY_EXIT_MARGIN,
+    BRAIN_INFERENCE_MODE,
+    BRAIN_SW_OVERLAP,
+    BRAIN_FOREGROUND_CROP,
+    BRAIN_FOREGROUND_MARGIN,
+    BRAIN_VOLUME_CACHE_DTYPE,
+    RADIOGRAPH_DECODE_SIZE,
+    RESULT_CACHE_MEMORY_ENTRIES,
+    RESULT_CACHE_DISK_MB,
+)
+from backend.core.fs import atomic_write, ensure_dir
+from backend.core.logging import get_logger
+from backend.core.paths import CACHE_DIR
+from backend.runtime.executor import run_stage
+
+logger = get_logger(__name__)
+
+_HITS = metrics.counter(
+    "spectra_result_cache_hits_total",
+    "Result cache hits by tier (memory | disk | inflight)",
+)
+_MISSES = metrics.counter(
+    "spectra_result_cache_misses_total",
+    "Result cache misses that ran the full pipeline",
+)
+_ENTRIES = metrics.gauge(
+    "spectra_result_cache_memory_entries",
+    "Results held in the in-memory tier",
+)
+_DISK_BYTES = metrics.gauge(
+    "spectra_result_cache_disk_bytes",
+    "Bytes held in the on-disk tier",
+)
+
+
+# Part of the result key: every setting besides the model versions that
+# can change a case's result, so a config change never serves results
+# computed under the old one
+RESULT_FINGERPRINT = (
+    f"backends={sorted(INFERENCE_BACKEND.items())}|int8={QUANTIZATION_ENGINE}|"
+    f"gate={GATEKEEPER_CONFIDENCE_THRESHOLD},{GATEKEEPER_ADAPTIVE_SLICES},{GATEKEEPER_EARLY_EXIT_MARGIN}|"
+    f"brain={BRAIN_INFERENCE_MODE},{BRAIN_SW_OVERLAP}|"
+    f"foreground={BRAIN_FOREGROUND_CROP},{BRAIN_FOREGROUND_MARGIN}|"
+    f"volume_dtype={BRAIN_VOLUME_CACHE_DTYPE}|decode_size={RADIOGRAPH_DECODE_SIZE}"
+)
+
+
+class _LeaderCancelled(Exception):
+    """
+    The request computing a result was cancelled (e.g. its client went
+    away); a deduplicated follower takes over the computation.
+    """
+
+
+def _for_request(value: Dict[str, Any]) -> Dict[str, Any]:
+    # Every request gets its own case id; the rest of a result is shared
+    return {**value, "case_id": uuid.uuid4().hex}
+
+
+def result_cache_key(content_sha256: str) -> str:
+    """
+    Results depend on the input bytes, on every model that can touch
+    them and on the settings in RESULT_FINGERPRINT, so a version bump or
+    a config change invalidates old entries.
+    """
+    parts = [
+        content_sha256,
+        GATEKEEPER_MODEL_VERSION,
+        BRAIN_MODEL_VERSION,
+        CHEST_MODEL_VERSION,
+        BONE_MODEL_VERSION,
+        RESULT_FINGERPRINT,
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier content-addressed result cache.
+
+    Memory tier: LRU bounded by entry count.
+    Disk tier: one JSON file per key, evicted least-recently-used first
+    once the directory exceeds max_disk_bytes (tracked as a running
+    total; the directory is only listed to pick eviction victims).
+
+    get_or_compute() also deduplicates concurrent misses: the first caller
+    runs the computation and later callers for the same key await it. If
+    that first caller is cancelled, a waiting caller takes over.
+    Results served from the cache carry a fresh case_id.
+    """
+
+    def __init__(self, cache_dir: Path, max_memory_entries: int, max_disk_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self._disk_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # listed once, then kept running
+
+    # -------------------------------------------------
+    # Memory tier
+    # -------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+            return value
+
+    def _memory_put(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+            _ENTRIES.set(len(self._memory))
+
+    # -------------------------------------------------
+    # Disk tier
+    # -------------------------------------------------
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._disk_path(key)
+        try:
+            value = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning(f"Dropping unreadable cache entry: {path.name}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # mtime doubles as the disk tier's LRU clock
+        os.utime(path)
+        return value
+
+    def _disk_entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _disk_put(self, key: str, value: Dict[str, Any]):
+        path = self._disk_path(key)
+        data = json.dumps(value).encode()
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+
+            atomic_write(path, data)
+            self._disk_bytes += len(data) - previous
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+            _DISK_BYTES.set(self._disk_bytes)
+
+    def _evict_disk(self):
+        # Runs with the disk lock held, only once over budget
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._disk_bytes = total
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._memory_get(key)
+        if value is None:
+            value = self._disk_get(key)
+            if value is not None:
+                self._memory_put(key, value)
+        return _for_request(value) if value is not None else None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        while True:
+            value = self._memory_get(key)
+            if value is not None:
+                _HITS.inc(tier="memory")
+                return _for_request(value)
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+
+            _HITS.inc(tier="inflight")
+            try:
+                return _for_request(await asyncio.shield(pending))
+            except _LeaderCancelled:
+                continue  # look again; the first follower back becomes leader
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await run_stage("cache_read", self._disk_get, key)
+            if value is not None:
+                _HITS.inc(tier="disk")
+                self._memory_put(key, value)
+                value = _for_request(value)
+            else:
+                _MISSES.inc()
+                value = await compute()
+                await run_stage("cache_write", self.put, key, value)
+
+            future.set_result(value)
+            return value
+
+        except asyncio.CancelledError:
+            # Only this caller went away; followers must not fail with it
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a leader without followers does not warn
+            future.exception()
+            raise
+
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            cache_dir = CACHE_DIR / "results"
+            ensure_dir(cache_dir)
+            _result_cache = ResultCache(
+                cache_dir=cache_dir,
+                max_memory_entries=RESULT_CACHE_MEMORY_ENTRIES,
+                max_disk_bytes=RESULT_CACHE_DISK_MB * 1024 * 1024,
+            )
+        return _result_cache
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from backend.core import metrics
+from backend.core.config import EXECUTOR_MAX_WORKERS
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_ACTIVE = metrics.gauge(
+    "spectra_executor_active",
+    "Pipeline stages currently running, by pool",
+)
+_QUEUED = metrics.gauge(
+    "spectra_executor_queued",
+    "Pipeline stages waiting for a free worker, by pool",
+)
+_CAPACITY = metrics.gauge(
+    "spectra_executor_capacity",
+    "Configured number of workers, by pool",
+)
+_QUEUE_WAIT = metrics.histogram(
+    "spectra_executor_queue_wait_seconds",
+    "Time a stage waited for a free worker",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 10),
+)
+_STAGE_SECONDS = metrics.histogram(
+    "spectra_executor_stage_seconds",
+    "Wall time of a pipeline stage on the worker pool",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Bounded pool for blocking pipeline stages (file IO, decoding,
+    MONAI transforms, forward passes, scipy postprocessing).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXECUTOR_MAX_WORKERS,
+                thread_name_prefix="stage",
+            )
+            set_pool_capacity("stages", EXECUTOR_MAX_WORKERS)
+            logger.info(f"Stage executor started ({EXECUTOR_MAX_WORKERS} workers)")
+        return _executor
+
+
+def set_pool_capacity(pool: str, workers: int):
+    _CAPACITY.set(workers, pool=pool)
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+            logger.info("Stage executor stopped")
+
+
+async def run_in_pool(
+    executor: Executor,
+    pool: str,
+    stage: str,
+    fn: Callable[..., Any],
+    *args,
+    **kwargs,
+) -> Any:
+    """
+    Run a blocking pipeline stage on the given pool and await its result,
+    recording queue wait, run time and saturation under the pool's name.
+
+    Coroutine functions (stages that only await other work, e.g. a
+    micro-batcher) run on the event loop instead and never hold a worker.
+    """
+    if asyncio.iscoroutinefunction(fn):
+        started = time.monotonic()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _STAGE_SECONDS.observe(time.monotonic() - started, pool=pool, stage=stage)
+
+    loop = asyncio.get_running_loop()
+    submitted = time.monotonic()
+    _QUEUED.inc(pool=pool)
+    dequeued = threading.Lock()
+
+    def leave_queue():
+        # Exactly once: by the worker that picks the stage up, or by the
+        # awaiting task if it is cancelled before that happens
+        if dequeued.acquire(blocking=False):
+            _QUEUED.dec(pool=pool)
+
+    def call():
+        started = time.monotonic()
+        leave_queue()
+        _ACTIVE.inc(pool=pool)
+        _QUEUE_WAIT.observe(started - submitted, pool=pool, stage=stage)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _ACTIVE.dec(pool=pool)
+            _STAGE_SECONDS.observe(time.monotonic() - started, pool=pool, stage=stage)
+
+    try:
+        return await loop.run_in_executor(executor, call)
+    finally:
+        leave_queue()
+
+
+async def run_stage(stage: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking pipeline stage on the bounded pool and await its result,
+    keeping the event loop free for uploads and other requests.
+    """
+    return await run_in_pool(get_executor(), "stages", stage, fn, *args, **kwargs)
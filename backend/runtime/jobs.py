@@ -0,0 +1,330 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional
+
+from backend.core import metrics
+from backend.core.config import JOB_MAX_WORKERS, JOB_QUEUE_SIZE, JOB_RETENTION_HOURS
+from backend.core.fs import atomic_write, ensure_dir
+from backend.core.logging import get_logger
+from backend.core.paths import JOBS_DIR
+from backend.ingestion.spool import SpooledUpload
+from backend.pipeline import run_case_pipeline
+from backend.runtime.cache import get_result_cache, result_cache_key
+from backend.runtime.executor import run_in_pool, set_pool_capacity
+
+logger = get_logger(__name__)
+
+# Finished records are pruned at start-up and at most this often after
+PRUNE_INTERVAL_S = 600
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_JOBS_QUEUED = metrics.gauge(
+    "spectra_jobs_queued",
+    "Jobs waiting for a job worker",
+)
+_JOBS_FINISHED = metrics.counter(
+    "spectra_jobs_finished_total",
+    "Finished jobs by final status",
+)
+
+
+class JobQueueFullError(RuntimeError):
+    pass
+
+
+@dataclass
+class Job:
+    job_id: str
+    status: str
+    filename: str
+    created_at: float
+    updated_at: float
+    upload: Dict[str, Any]
+    stages: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_public(self) -> Dict[str, Any]:
+        """
+        API view of the job (internal spool location omitted).
+        """
+        data = asdict(self)
+        data.pop("upload")
+        return data
+
+
+# -------------------------------------------------
+# Local store (one JSON file per job)
+# -------------------------------------------------
+
+class JobStore:
+    def __init__(self, root: Path):
+        self.root = root
+        ensure_dir(root)
+
+    def _path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.json"
+
+    def save(self, snapshot: Dict[str, Any]):
+        atomic_write(self._path(snapshot["job_id"]), json.dumps(snapshot).encode())
+
+    def load(self, job_id: str) -> Optional[Job]:
+        try:
+            return Job(**json.loads(self._path(job_id).read_text()))
+        except FileNotFoundError:
+            return None
+
+    def prune(self, max_age_s: float, keep: Collection[str] = ()) -> int:
+        """
+        Delete job records last written more than max_age_s ago, except
+        the job ids in `keep` (jobs still queued or running).
+        """
+        cutoff = time.time() - max_age_s
+        removed = 0
+        for path in self.root.glob("*.json"):
+            if path.stem in keep:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        if removed:
+            logger.info(f"Pruned {removed} finished job records")
+        return removed
+
+    def load_all(self) -> List[Job]:
+        jobs = []
+        for path in self.root.glob("*.json"):
+            try:
+                jobs.append(Job(**json.loads(path.read_text())))
+            except (OSError, ValueError, TypeError):
+                logger.warning(f"Skipping unreadable job record: {path.name}")
+        return jobs
+
+
+# -------------------------------------------------
+# Job manager
+# -------------------------------------------------
+
+class JobManager:
+    """
+    Bounded in-process job queue for long-running cases.
+
+    Jobs are accepted immediately and executed by JOB_MAX_WORKERS worker
+    tasks, whose blocking stages run on a dedicated thread pool so brain
+    cases never starve interactive /analyze requests. Every state change
+    is persisted, and on start-up queued jobs are re-enqueued while jobs
+    interrupted mid-run are marked failed. Finished job records are
+    deleted once older than retention_s. Store writes go through their own
+    single thread, in order, so status updates never queue behind stages.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        max_workers: int,
+        max_queue: int,
+        retention_s: float = 0,
+    ):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retention_s = retention_s
+        self._last_prune = 0.0
+
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="job",
+        )
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+        set_pool_capacity("jobs", self.max_workers)
+
+        for job in sorted(self.store.load_all(), key=lambda j: j.created_at):
+            if job.status not in (QUEUED, RUNNING):
+                continue  # finished jobs are served from the store
+            self._jobs[job.job_id] = job
+
+            if job.status == RUNNING:
+                Path(job.upload["path"]).unlink(missing_ok=True)
+                job.error = "Interrupted by worker restart"
+                await self._finish(job, FAILED)
+
+            elif job.status == QUEUED:
+                if Path(job.upload["path"]).exists() and not self._queue.full():
+                    self._queue.put_nowait(job.job_id)
+                else:
+                    job.error = "Input lost before the job could run"
+                    await self._finish(job, FAILED)
+
+        await self._prune()
+
+        _JOBS_QUEUED.set(self._queue.qsize())
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.max_workers)
+        ]
+        logger.info(
+            f"Job manager started ({self.max_workers} workers, "
+            f"{self._queue.qsize()} recovered jobs queued)"
+        )
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        logger.info("Job manager stopped")
+
+    async def submit(self, upload: SpooledUpload) -> Job:
+        if self._queue is None or self._queue.full():
+            raise JobQueueFullError("Job queue is full")
+
+        now = time.time()
+        upload_record = asdict(upload)
+        upload_record["path"] = str(upload.path)
+
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            status=QUEUED,
+            filename=upload.filename,
+            created_at=now,
+            updated_at=now,
+            upload=upload_record,
+        )
+        self._jobs[job.job_id] = job
+        await self._save(job)
+
+        self._queue.put_nowait(job.job_id)
+        _JOBS_QUEUED.set(self._queue.qsize())
+        logger.info(f"Job queued: {job.job_id} ({job.filename})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            # Finished jobs from a previous process are served from the store
+            job = self.store.load(job_id)
+        return job
+
+    # -------------------------------------------------
+    # Internals
+    # -------------------------------------------------
+
+    async def _save(self, job: Job):
+        job.updated_at = time.time()
+        snapshot = asdict(job)
+        await asyncio.get_running_loop().run_in_executor(
+            self._writer, self.store.save, snapshot
+        )
+
+    async def _finish(self, job: Job, status: str):
+        job.status = status
+        _JOBS_FINISHED.inc(status=status)
+        await self._save(job)
+        self._jobs.pop(job.job_id, None)
+
+        if time.monotonic() - self._last_prune >= PRUNE_INTERVAL_S:
+            await self._prune()
+
+    async def _prune(self):
+        if not self.retention_s:
+            return
+        self._last_prune = time.monotonic()
+        await asyncio.get_running_loop().run_in_executor(
+            self._writer, self.store.prune, self.retention_s, set(self._jobs)  # active jobs
+        )
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            _JOBS_QUEUED.set(self._queue.qsize())
+            job = self._jobs[job_id]
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Job failed: {job.job_id}")
+                job.error = str(e)
+                await self._finish(job, FAILED)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = RUNNING
+        await self._save(job)
+
+        async def run_stage(stage: str, fn, *args, **kwargs):
+            entry = {"stage": stage, "status": RUNNING, "seconds": None}
+            job.stages.append(entry)
+            await self._save(job)
+
+            started = time.monotonic()
+            try:
+                value = await run_in_pool(
+                    self._executor, "jobs", stage, fn, *args, **kwargs
+                )
+            except Exception:
+                entry["status"] = FAILED
+                raise
+            finally:
+                entry["seconds"] = round(time.monotonic() - started, 3)
+
+            entry["status"] = SUCCEEDED
+            await self._save(job)
+            return value
+
+        upload = SpooledUpload(**{**job.upload, "path": Path(job.upload["path"])})
+        try:
+            job.result = await get_result_cache().get_or_compute(
+                result_cache_key(upload.sha256),
+                lambda: run_case_pipeline(upload, run_stage=run_stage),
+            )
+        finally:
+            upload.path.unlink(missing_ok=True)
+
+        await self._finish(job, SUCCEEDED)
+        logger.info(f"Job finished: {job.job_id}")
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager(
+                store=JobStore(JOBS_DIR),
+                max_workers=JOB_MAX_WORKERS,
+                max_queue=JOB_QUEUE_SIZE,
+                retention_s=JOB_RETENTION_HOURS * 3600,
+            )
+        return _job_manager
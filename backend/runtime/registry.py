@@ -0,0 +1,188 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import torch
+
+from backend.core import metrics
+from backend.core.config import MODEL_MEMORY_BUDGET_MB
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_RESIDENT_BYTES = metrics.gauge(
+    "spectra_models_resident_bytes",
+    "Parameter and buffer bytes of resident models",
+)
+_LOADS = metrics.counter(
+    "spectra_model_loads_total",
+    "Model checkpoint loads",
+)
+_EVICTIONS = metrics.counter(
+    "spectra_model_evictions_total",
+    "Idle models evicted to stay within the memory budget",
+)
+
+Key = Tuple[str, str]
+Builder = Callable[[torch.device], torch.nn.Module]
+
+
+def model_nbytes(model: torch.nn.Module) -> int:
+    # Non-eager backends (e.g. ONNX Runtime) report their own footprint
+    resident = getattr(model, "resident_bytes", None)
+    if resident is not None:
+        return resident
+
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+@dataclass
+class _Entry:
+    model: torch.nn.Module
+    nbytes: int
+    refs: int = 0
+    last_used: float = 0.0
+
+
+class ModelRegistry:
+    """
+    Process-wide owner of every loaded network.
+
+    - Each (model, device) pair is loaded at most once, under its own lock,
+      so concurrent first requests never load the same checkpoint twice.
+    - acquire() reference-counts a model while a forward pass uses it.
+    - When resident models exceed the memory budget, the least recently
+      used idle models are evicted; models in use are never evicted.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self.budget_bytes = budget_bytes
+
+        self._builders: Dict[str, Builder] = {}
+        self._entries: Dict[Key, _Entry] = {}
+        self._load_locks: Dict[Key, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Builder):
+        with self._lock:
+            self._builders[name] = builder
+
+    # -------------------------------------------------
+    # Loading
+    # -------------------------------------------------
+
+    def _load(self, name: str, device: torch.device) -> _Entry:
+        key = (name, str(device))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+            builder = self._builders[name]
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry
+
+            started = time.monotonic()
+            model = builder(device)
+            entry = _Entry(model=model, nbytes=model_nbytes(model))
+            _LOADS.inc(model=name)
+            logger.info(
+                f"Model loaded: {name} on {device} "
+                f"({entry.nbytes / 1e6:.1f} MB, {time.monotonic() - started:.2f}s)"
+            )
+
+            with self._lock:
+                self._entries[key] = entry
+            return entry
+
+    def get(self, name: str, device: torch.device) -> torch.nn.Module:
+        """
+        Load (if needed) and return a model without holding a reference.
+        """
+        entry = self._load(name, device)
+        with self._lock:
+            entry.last_used = time.monotonic()
+        self._enforce_budget()
+        return entry.model
+
+    @contextmanager
+    def acquire(self, name: str, device: torch.device) -> Iterator[torch.nn.Module]:
+        """
+        Hold a model for the duration of a forward pass.
+        """
+        while True:
+            entry = self._load(name, device)
+            with self._lock:
+                # Evicted between load and pin: load again
+                if self._entries.get((name, str(device))) is entry:
+                    entry.refs += 1
+                    entry.last_used = time.monotonic()
+                    break
+
+        self._enforce_budget()
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                entry.last_used = time.monotonic()
+            self._enforce_budget()
+
+    # -------------------------------------------------
+    # Eviction
+    # -------------------------------------------------
+
+    def _enforce_budget(self):
+        with self._lock:
+            total = sum(e.nbytes for e in self._entries.values())
+
+            if self.budget_bytes is not None and total > self.budget_bytes:
+                idle = sorted(
+                    (e.last_used, key) for key, e in self._entries.items() if e.refs == 0
+                )
+                for _, key in idle:
+                    if total <= self.budget_bytes:
+                        break
+                    entry = self._entries.pop(key)
+                    total -= entry.nbytes
+                    _EVICTIONS.inc(model=key[0])
+                    logger.info(f"Model evicted: {key[0]} on {key[1]}")
+
+            _RESIDENT_BYTES.set(total)
+
+    def unload(self, name: str, device: torch.device) -> bool:
+        with self._lock:
+            entry = self._entries.get((name, str(device)))
+            if entry is None or entry.refs > 0:
+                return False
+            del self._entries[(name, str(device))]
+        self._enforce_budget()
+        return True
+
+    def status(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                f"{name}@{device}": {
+                    "bytes": e.nbytes,
+                    "in_use": e.refs,
+                    "idle_seconds": round(time.monotonic() - e.last_used, 1),
+                }
+                for (name, device), e in self._entries.items()
+            }
+
+
+model_registry = ModelRegistry(
+    budget_bytes=(
+        MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+        if MODEL_MEMORY_BUDGET_MB is not None
+        else None
+    ),
+)
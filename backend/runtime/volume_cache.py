@@ -0,0 +1,131 @@
+import hashlib
+import io
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import torch
+
+from backend.core import metrics
+from backend.core.config import BRAIN_VOLUME_CACHE_DTYPE, BRAIN_VOLUME_CACHE_MB
+from backend.core.fs import atomic_write, ensure_dir, evict_lru, file_sha256
+from backend.core.logging import get_logger
+from backend.core.paths import CACHE_DIR
+
+logger = get_logger(__name__)
+
+_HITS = metrics.counter(
+    "spectra_volume_cache_hits_total",
+    "Preprocessed volumes served from the disk cache",
+)
+_MISSES = metrics.counter(
+    "spectra_volume_cache_misses_total",
+    "Preprocessed volumes computed from the source files",
+)
+_DISK_BYTES = metrics.gauge(
+    "spectra_volume_cache_disk_bytes",
+    "Bytes held in the preprocessed volume cache",
+)
+
+
+def volume_cache_key(files: Dict[str, Path], fingerprint: str) -> str:
+    """
+    Content hash of every input file (by role) plus a fingerprint of the
+    preprocessing settings that produced the tensor and the storage dtype.
+    """
+    parts = [fingerprint, f"dtype={BRAIN_VOLUME_CACHE_DTYPE}"]
+    parts += [f"{role}={file_sha256(path)}" for role, path in sorted(files.items())]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+class VolumeCache:
+    """
+    Disk cache of preprocessed volume tensors.
+
+    Each entry is one .npy file stored in `dtype` and opened memory-mapped
+    on a hit (float32 is used in place; other dtypes are converted). Entries are evicted least-recently-used first (mtime) once
+    the directory exceeds max_bytes.
+
+    Computed tensors are rounded through the storage dtype before they are
+    returned, so a case yields the same tensor whether or not it was cached.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, dtype: str):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def _to_tensor(self, array: np.ndarray) -> torch.Tensor:
+        if array.dtype == np.float32:
+            # Copy-on-write mapping: pages are read lazily, nothing is copied
+            return torch.from_numpy(array)
+        return torch.from_numpy(array.astype(np.float32))
+
+    def get(self, key: str) -> Optional[torch.Tensor]:
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode="c")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning(f"Dropping unreadable volume cache entry: {path.name}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # mtime doubles as the LRU clock
+        os.utime(path)
+        return self._to_tensor(array)
+
+    def put(self, key: str, tensor: torch.Tensor) -> torch.Tensor:
+        array = tensor.detach().cpu().numpy().astype(self.dtype)
+
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        atomic_write(self._path(key), buffer.getvalue())
+        self._evict()
+
+        return self._to_tensor(array)
+
+    def get_or_compute(self, key: str, compute: Callable[[], torch.Tensor]) -> torch.Tensor:
+        tensor = self.get(key)
+        if tensor is not None:
+            _HITS.inc()
+            logger.info(f"Volume cache hit: {key[:12]}")
+            return tensor
+
+        _MISSES.inc()
+        return self.put(key, compute())
+
+    def _evict(self):
+        with self._lock:
+            _DISK_BYTES.set(evict_lru(self.cache_dir, "*.npy", self.max_bytes))
+
+
+_volume_cache: Optional[VolumeCache] = None
+_volume_cache_lock = threading.Lock()
+
+
+def get_volume_cache() -> Optional[VolumeCache]:
+    """
+    Process-wide brain volume cache, or None when disabled.
+    """
+    global _volume_cache
+    if not BRAIN_VOLUME_CACHE_MB:
+        return None
+
+    with _volume_cache_lock:
+        if _volume_cache is None:
+            cache_dir = CACHE_DIR / "brain_volumes"
+            ensure_dir(cache_dir)
+            _volume_cache = VolumeCache(
+                cache_dir=cache_dir,
+                max_bytes=BRAIN_VOLUME_CACHE_MB * 1024 * 1024,
+                dtype=BRAIN_VOLUME_CACHE_DTYPE,
+            )
+        return _volume_cache
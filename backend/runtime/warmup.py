@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+import torch
+
+from backend.core.logging import get_logger
+from backend.runtime.backends import MODEL_INPUT_SHAPES
+from backend.gatekeeper.infer import forward_gatekeeper
+from backend.brain.infer import infer_brain
+from backend.chest.infer import forward_chest
+from backend.bone.infer import forward_bone
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+# Real per-request batch sizes; the gatekeeper sees the middle ±3 slices
+WARMUP_INPUTS: Dict[str, Tuple[Callable, Tuple[int, ...]]] = {
+    "gatekeeper": (forward_gatekeeper, (7,) + MODEL_INPUT_SHAPES["gatekeeper"]),
+    "chest": (forward_chest, (1,) + MODEL_INPUT_SHAPES["chest"]),
+    "bone": (forward_bone, (1,) + MODEL_INPUT_SHAPES["bone"]),
+    "brain": (infer_brain, (1,) + MODEL_INPUT_SHAPES["brain"]),
+}
+
+
+class Readiness:
+    """
+    Per-model warm-up state shared with the health endpoints.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = {}
+        self.enabled = False
+
+    def set(self, name: str, status: str, **extra):
+        with self._lock:
+            self._state[name] = {"status": status, **extra}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: dict(s) for name, s in self._state.items()}
+
+    @property
+    def ready(self) -> bool:
+        # Lazy mode: models load on first use, so there is nothing to wait for
+        if not self.enabled:
+            return True
+        state = self.snapshot()
+        return bool(state) and all(s["status"] == READY for s in state.values())
+
+
+readiness = Readiness()
+
+
+def warm_up_models(device: torch.device):
+    """
+    Load every model and run one dummy forward pass at its real input
+    shape, so checkpoint loading and first-call allocator warm-up never
+    land on a user request.
+    """
+    for name, (forward, shape) in WARMUP_INPUTS.items():
+        readiness.set(name, WARMING)
+        started = time.monotonic()
+        try:
+            forward(torch.zeros(shape), device)
+        except Exception as e:
+            logger.exception(f"Warm-up failed: {name}")
+            readiness.set(name, FAILED, error=str(e))
+            continue
+
+        seconds = round(time.monotonic() - started, 3)
+        readiness.set(name, READY, seconds=seconds)
+        logger.info(f"Model warm: {name} ({seconds}s)")
+
+
+def start_warmup(device: torch.device) -> threading.Thread:
+    """
+    Warm all models on a background thread so start-up is not blocked.
+    """
+    readiness.enabled = True
+    for name in WARMUP_INPUTS:
+        readiness.set(name, PENDING)
+
+    thread = threading.Thread(
+        target=warm_up_models,
+        args=(device,),
+        name="model-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
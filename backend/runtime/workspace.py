@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from backend.core.fs import ensure_dir
+from backend.core.logging import get_logger
+from backend.core.paths import CASE_DIR
+from backend.ingestion.spool import SpooledUpload
+
+logger = get_logger(__name__)
+
+
+def create_case_workspace(case_id: str, upload: SpooledUpload) -> Path:
+    """
+    Move a spooled upload into its own case directory.
+
+    The file is renamed, not copied, and keeps its original name so
+    route-specific loaders can rely on the extension (and, for brain
+    cases, the *_<modality> suffix).
+
+    Returns the path of the case file inside the workspace.
+    """
+    case_dir = CASE_DIR / case_id
+    ensure_dir(case_dir)
+
+    case_file = case_dir / Path(upload.filename).name
+    upload.path.replace(case_file)
+
+    logger.info(f"Case workspace created: {case_dir}")
+    return case_file
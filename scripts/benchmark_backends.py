@@ -0,0 +1,117 @@
+"""
+Latency / throughput of each inference backend per model and batch size.
+
+Backends without an exported artifact (see scripts/export_models.py) or
+without their runtime installed are reported as skipped.
+
+Run from the repository root:
+    python scripts/benchmark_backends.py
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.runtime.backends import MODEL_INPUT_SHAPES, load_backend_model  # noqa: E402
+from backend.gatekeeper.model import build_gatekeeper_model  # noqa: E402
+from backend.chest.infer import build_chest_model  # noqa: E402
+from backend.bone.infer import build_bone_model  # noqa: E402
+from backend.brain.infer import build_brain_model  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+BACKENDS = ["torch", "torchscript", "onnx"]
+
+# A (4, 128, 128, 128) brain volume is ~32 MB of input and several GB of
+# activations per sample, so the UNet only runs at small batch sizes
+BATCH_SIZES = {
+    "gatekeeper": [1, 2, 4, 8, 16, 32],
+    "chest": [1, 2, 4, 8, 16, 32],
+    "bone": [1, 2, 4, 8, 16, 32],
+    "brain": [1, 2],
+}
+
+WARMUP_RUNS = 2
+TIMED_RUNS = 10
+
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+EAGER_BUILDERS = {
+    "gatekeeper": build_gatekeeper_model,
+    "chest": build_chest_model,
+    "bone": build_bone_model,
+    "brain": build_brain_model,
+}
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def load(name: str, backend: str) -> torch.nn.Module:
+    if backend == "torch":
+        return EAGER_BUILDERS[name](DEVICE)
+    return load_backend_model(name, backend, DEVICE)
+
+
+def time_forward(model: torch.nn.Module, batch: torch.Tensor) -> float:
+    with torch.no_grad():
+        if DEVICE.type == "cuda":
+            torch.cuda.synchronize()
+        started = time.perf_counter()
+        model(batch)
+        if DEVICE.type == "cuda":
+            torch.cuda.synchronize()
+    return time.perf_counter() - started
+
+
+def benchmark(model: torch.nn.Module, name: str, batch_size: int) -> dict:
+    batch = torch.randn((batch_size,) + MODEL_INPUT_SHAPES[name], device=DEVICE)
+
+    for _ in range(WARMUP_RUNS):
+        time_forward(model, batch)
+    timings = [time_forward(model, batch) for _ in range(TIMED_RUNS)]
+
+    median = statistics.median(timings)
+    return {
+        "median_ms": median * 1000,
+        "p90_ms": sorted(timings)[int(0.9 * (len(timings) - 1))] * 1000,
+        "samples_per_s": batch_size / median,
+    }
+
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    print(f"Device: {DEVICE}")
+    print(f"{'model':<11} {'backend':<12} {'batch':>5} {'median ms':>10} {'p90 ms':>8} {'samples/s':>10}")
+
+    for name, batch_sizes in BATCH_SIZES.items():
+        for backend in BACKENDS:
+            try:
+                model = load(name, backend)
+            except Exception as e:
+                print(f"{name:<11} {backend:<12} skipped: {e}")
+                continue
+
+            for batch_size in batch_sizes:
+                r = benchmark(model, name, batch_size)
+                print(
+                    f"{name:<11} {backend:<12} {batch_size:>5} "
+                    f"{r['median_ms']:>10.1f} {r['p90_ms']:>8.1f} {r['samples_per_s']:>10.1f}"
+                )
+
+            del model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Brain preprocessing time with and without the foreground crop
+(BRAIN_FOREGROUND_CROP), on synthetic skull-stripped volumes of several
+shapes, spacings and brain positions. This is the parity check to run
+before enabling the flag: it exits non-zero if the cropped path strays
+from the full-field one beyond the tolerances below.
+
+Volumes already on the 1 mm grid are not resampled and must match
+exactly. When resampling, interpolation round-off differs slightly with
+the size of the resampled region; at the very edge of the brain this
+decides whether a voxel is exactly zero, which NormalizeIntensityd
+(nonzero=True) then treats as background or foreground. Those cases are
+checked against a tolerance on the fraction of such voxels instead.
+
+Run from the repository root:
+    python scripts/benchmark_brain_foreground_crop.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nibabel as nib
+import numpy as np
+import torch
+from scipy.ndimage import gaussian_filter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import backend.brain.preprocess as brain_preprocess  # noqa: E402
+from backend.brain.preprocess import MODALITIES  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+# (shape, spacing mm, brain center voxel, brain radius voxels)
+CASES = [
+    ((240, 240, 155), (1.0, 1.0, 1.0), (120, 120, 77), 60),
+    ((240, 240, 155), (1.0, 1.0, 1.0), (60, 170, 40), 50),
+    ((200, 220, 120), (1.2, 1.1, 1.5), (100, 110, 60), 60),
+    ((160, 160, 90), (0.9, 0.9, 2.0), (30, 100, 45), 40),
+]
+CENTER_CROP = [True, False]
+
+# Resampled cases: voxels whose zero / non-zero status may flip, and the
+# mean absolute difference this causes through the normalization stats
+MAX_FLIPPED_FRACTION = 1e-3
+MAX_MEAN_DIFF = 1e-2
+
+SEED = 0
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def synthetic_case(directory: Path, shape, spacing, center, radius, rng) -> dict:
+    """
+    Smooth positive intensities inside a sphere, exact zeros outside.
+    """
+    grid = np.meshgrid(*[np.arange(s) for s in shape], indexing="ij")
+    brain = sum((g - c) ** 2 for g, c in zip(grid, center)) < radius ** 2
+
+    data = {}
+    for modality in MODALITIES:
+        volume = gaussian_filter(rng.random(shape), sigma=2) * 1000 * brain
+        path = directory / f"case_{modality}.nii"
+        nib.save(nib.Nifti1Image(volume.astype(np.float32), np.diag(list(spacing) + [1])), str(path))
+        data[modality] = str(path)
+    return data
+
+
+def run(data: dict, crop: bool, foreground: bool):
+    brain_preprocess.BRAIN_FOREGROUND_CROP = foreground
+    started = time.perf_counter()
+    tensor = brain_preprocess._run_brain_preprocess(data, crop)
+    return torch.as_tensor(tensor), time.perf_counter() - started
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    rng = np.random.default_rng(SEED)
+    failures = 0
+
+    print(
+        f"{'shape':<12} {'spacing':<14} {'crop':<5} {'full s':>7} {'box s':>7} "
+        f"{'speedup':>8} {'max diff':>9} {'mean diff':>10} {'flipped':>8}  ok"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (shape, spacing, center, radius) in enumerate(CASES):
+            directory = Path(tmp) / str(index)
+            directory.mkdir()
+            data = synthetic_case(directory, shape, spacing, center, radius, rng)
+            on_grid = spacing == (1.0, 1.0, 1.0)
+
+            for crop in CENTER_CROP:
+                expected, full_s = run(data, crop, foreground=False)
+                actual, box_s = run(data, crop, foreground=True)
+
+                if expected.shape != actual.shape:
+                    failures += 1
+                    print(f"shape mismatch: {tuple(expected.shape)} vs {tuple(actual.shape)}")
+                    continue
+
+                diff = (expected - actual).abs()
+                flipped = ((expected != 0) ^ (actual != 0)).float().mean().item()
+                if on_grid:
+                    ok = torch.equal(expected, actual)
+                else:
+                    ok = flipped <= MAX_FLIPPED_FRACTION and diff.mean().item() <= MAX_MEAN_DIFF
+                failures += not ok
+
+                print(
+                    f"{'x'.join(map(str, shape)):<12} {'x'.join(map(str, spacing)):<14} {str(crop):<5} "
+                    f"{full_s:>7.2f} {box_s:>7.2f} {full_s / box_s:>7.1f}x "
+                    f"{diff.max().item():>9.4f} {diff.mean().item():>10.6f} {flipped:>8.5f}  "
+                    f"{'yes' if ok else 'NO'}"
+                )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Benchmark of brain postprocessing against the original implementation.
+
+1. Speed: connected-component filtering vs the original per-component
+   loop, on synthetic logits with many small components. Checks that the
+   cleaned mask is identical and the confidence matches.
+2. Peak memory: extra peak RSS of one postprocess call on top of the
+   logits themselves, per variant and volume size. Each measurement runs
+   in a fresh process so high-water marks do not leak between runs.
+
+Run from the repository root:
+    python scripts/benchmark_brain_postprocess.py
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from scipy.ndimage import gaussian_filter, label
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.postprocess.aggregate import postprocess_brain_logits  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+SHAPE = (128, 128, 128)
+MIN_VOXELS = 500
+
+# Fraction of voxels flipped to a random tumor class (noisy specks)
+NOISE_LEVELS = [0.0, 0.0005, 0.002, 0.01]
+
+SEED = 0
+
+# Peak memory: volume shapes (center crop, full-resolution BraTS) and
+# variants (original loop, lean path on the whole volume / depth slabs)
+MEMORY_SHAPES = [(128, 128, 128), (240, 240, 160)]
+MEMORY_VARIANTS = {
+    "original": None,
+    "lean, whole volume": {"depth_chunk": None},
+    "lean, 32 slices": {"depth_chunk": 32},
+    "lean, 8 slices": {"depth_chunk": 8},
+}
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def reference_postprocess(logits: torch.Tensor, min_voxels: int = 500):
+    """
+    The original per-component loop, kept for comparison.
+    """
+    probs = torch.softmax(logits, dim=1)
+    pred = torch.argmax(probs, dim=1)[0]
+
+    cleaned = torch.zeros_like(pred)
+    confidence = 0.0
+
+    for cls in [1, 2]:
+        mask = (pred == cls).cpu().numpy()
+        labeled, num = label(mask)
+
+        for i in range(1, num + 1):
+            region = (labeled == i)
+            if region.sum() >= min_voxels:
+                cleaned[region] = cls
+                confidence = max(
+                    confidence,
+                    probs[0, cls][region].mean().item()
+                )
+
+    return cleaned, confidence
+
+
+def synthetic_logits(noise: float, rng: np.random.Generator) -> torch.Tensor:
+    """
+    Smooth blobs (large components) plus random single-voxel specks.
+    """
+    logits = np.stack([
+        gaussian_filter(rng.standard_normal(SHAPE), sigma=6) * 40
+        for _ in range(3)
+    ]).astype(np.float32)
+    logits[0] += 1.0  # mostly background
+
+    specks = rng.random(SHAPE) < noise
+    cls = rng.integers(1, 3, size=SHAPE)
+    for c in (1, 2):
+        logits[c][specks & (cls == c)] += 100.0
+
+    return torch.from_numpy(logits).unsqueeze(0)
+
+
+def smooth_logits(shape) -> torch.Tensor:
+    """
+    Low-frequency logits built without large temporaries, so the
+    measured peak is dominated by the postprocess call itself.
+    """
+    torch.manual_seed(SEED)
+    coarse = torch.randn(1, 3, 8, 8, 8) * 40
+    coarse[:, 0] += 10.0
+    return F.interpolate(coarse, size=shape, mode="trilinear", align_corners=False)
+
+
+def current_rss() -> int:
+    # Linux: second field of statm is resident pages
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_peak(variant: str, shape) -> float:
+    """
+    Runs in a child process: extra peak RSS (MB) of one postprocess call,
+    sampled every millisecond (ru_maxrss would be dominated by imports).
+    """
+    logits = smooth_logits(shape)
+    baseline = current_rss()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, current_rss())
+            time.sleep(0.001)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    kwargs = MEMORY_VARIANTS[variant]
+    if kwargs is None:
+        reference_postprocess(logits, MIN_VOXELS)
+    else:
+        postprocess_brain_logits(logits, MIN_VOXELS, **kwargs)
+
+    done.set()
+    sampler.join()
+    return (peak - baseline) / 1e6
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - started
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    rng = np.random.default_rng(SEED)
+    failures = 0
+
+    print(f"{'noise':>7} {'components':>10} {'loop s':>8} {'vector s':>9} {'speedup':>8}  match")
+    for noise in NOISE_LEVELS:
+        logits = synthetic_logits(noise, rng)
+        pred = logits.argmax(dim=1)[0].numpy()
+        components = sum(label(pred == c)[1] for c in (1, 2))
+
+        (ref_mask, ref_conf), ref_s = timed(reference_postprocess, logits, MIN_VOXELS)
+        (new_mask, new_conf), new_s = timed(postprocess_brain_logits, logits, MIN_VOXELS)
+
+        match = (
+            torch.equal(ref_mask.to(torch.uint8), new_mask)
+            and abs(ref_conf - new_conf) < 1e-6
+        )
+        failures += not match
+        print(
+            f"{noise:>7.3f} {components:>10} {ref_s:>8.2f} {new_s:>9.3f} "
+            f"{ref_s / new_s:>7.1f}x  {'yes' if match else 'NO'}"
+        )
+
+    print()
+    print(f"{'variant':<20} " + " ".join(f"{'x'.join(map(str, s)):>14}" for s in MEMORY_SHAPES))
+    ctx = multiprocessing.get_context("spawn")
+    for variant in MEMORY_VARIANTS:
+        peaks = []
+        for shape in MEMORY_SHAPES:
+            with ctx.Pool(1) as pool:
+                peaks.append(pool.apply(measure_peak, (variant, shape)))
+        print(f"{variant:<20} " + " ".join(f"{p:>11.0f} MB" for p in peaks))
+    print("(extra peak RSS per case on top of the logits)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Gatekeeper preprocessing time for 3D NIfTI inputs of increasing depth:
+slab read of the middle slices vs loading the whole volume (the previous
+get_fdata() path). Also checks both produce the same tensor.
+
+Run from the repository root:
+    python scripts/benchmark_gatekeeper_slab.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nibabel as nib
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.gatekeeper.preprocess import preprocess_gatekeeper, preprocess_volume  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+IN_PLANE = (256, 256)
+DEPTHS = [32, 64, 128, 256, 512]
+SUFFIXES = [".nii", ".nii.gz"]
+RUNS = 3
+
+SEED = 0
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def full_volume_path(path: Path) -> torch.Tensor:
+    volume = nib.load(str(path)).get_fdata()
+    return preprocess_volume(volume)
+
+
+def best_of(fn, *args):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        value = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return value, min(timings)
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    rng = np.random.default_rng(SEED)
+    failures = 0
+
+    print(f"{'file':<8} {'depth':>6} {'full ms':>9} {'slab ms':>9} {'speedup':>8}  match")
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in SUFFIXES:
+            for depth in DEPTHS:
+                path = Path(tmp) / f"volume_{depth}{suffix}"
+                data = rng.integers(0, 4000, size=IN_PLANE + (depth,), dtype=np.int16)
+                nib.save(nib.Nifti1Image(data, np.eye(4)), str(path))
+
+                expected, full_s = best_of(full_volume_path, path)
+                actual, slab_s = best_of(preprocess_gatekeeper, path, "nifti")
+
+                match = torch.equal(expected, actual)
+                failures += not match
+                print(
+                    f"{suffix:<8} {depth:>6} {full_s * 1000:>9.1f} {slab_s * 1000:>9.1f} "
+                    f"{full_s / slab_s:>7.1f}x  {'yes' if match else 'NO'}"
+                )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Multi-frame chest DICOM: streamed frame batches (CaseContext.iter_frames ->
+lung window -> resize, CHEST_FRAME_BATCH_SIZE frames at a time) against
+decoding the whole pixel array up front and preprocessing every frame in
+one batch.
+
+Reports latency, extra peak RSS of one study (measured in a fresh process,
+sampled every millisecond) and whether the two paths produce identical
+model input. The chest forward pass is replaced by a per-frame mean
+(model weights are not part of the repository); the streamed path hands
+each batch to it as soon as the batch is built.
+
+Run from the repository root:
+    python scripts/benchmark_multiframe_chest.py
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pydicom
+import torch
+from pydicom.dataset import FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, SecondaryCaptureImageStorage, generate_uid
+from scipy.ndimage import gaussian_filter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.chest.preprocess import apply_lung_window, iter_chest_frame_batches  # noqa: E402
+from backend.core.config import CHEST_FRAME_BATCH_SIZE  # noqa: E402
+from backend.image.loaders import CaseContext  # noqa: E402
+from backend.image.radiograph import to_model_input  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+SHAPE = (1024, 1024)
+FRAME_COUNTS = [8, 32, 128]
+
+SEED = 0
+
+
+# =========================
+# REFERENCE (DECODE EVERYTHING)
+# =========================
+
+def eager_input(path: Path) -> torch.Tensor:
+    ds = pydicom.dcmread(path)
+    pixels = ds.pixel_array.astype(np.float32)
+    pixels *= float(ds.RescaleSlope)
+    pixels += float(ds.RescaleIntercept)
+    return to_model_input([apply_lung_window(frame) for frame in pixels])
+
+
+def streamed_input(path: Path) -> torch.Tensor:
+    context = CaseContext(path, "dicom")
+    return torch.cat(list(iter_chest_frame_batches(context)))
+
+
+def head(batch: torch.Tensor) -> torch.Tensor:
+    # Stand-in for the forward pass: one small row per frame
+    return batch.flatten(1).mean(dim=1)
+
+
+def eager(path: Path) -> torch.Tensor:
+    return head(eager_input(path))
+
+
+def streamed(path: Path) -> torch.Tensor:
+    context = CaseContext(path, "dicom")
+    return torch.cat([head(batch) for batch in iter_chest_frame_batches(context)])
+
+
+VARIANTS = [eager, streamed]
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def synthetic_frames(count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Slowly varying 12-bit structure plus per-frame noise.
+    """
+    coarse = gaussian_filter(rng.standard_normal((SHAPE[0] // 16, SHAPE[1] // 16)), sigma=3)
+    base = np.kron(coarse, np.ones((16, 16)))
+    base = (base - base.min()) / (base.max() - base.min()) * 3000
+
+    frames = np.empty((count, *SHAPE), dtype=np.uint16)
+    for i in range(count):
+        frame = base + rng.normal(0, 40, SHAPE) + 200 * np.sin(i / 5)
+        frames[i] = np.clip(frame, 0, 4095)
+    return frames
+
+
+def write_dicom(path: Path, frames: np.ndarray):
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = SecondaryCaptureImageStorage
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = pydicom.Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = meta.MediaStorageSOPClassUID
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.Modality = "DX"
+    ds.NumberOfFrames = len(frames)
+    ds.Rows, ds.Columns = frames.shape[1:]
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.BitsAllocated = 16
+    ds.BitsStored = 12
+    ds.HighBit = 11
+    ds.PixelRepresentation = 0
+    ds.RescaleSlope = 1
+    ds.RescaleIntercept = -1024
+    ds.PixelData = frames.tobytes()
+    ds.save_as(path, enforce_file_format=True)
+
+
+def current_rss() -> int:
+    # Linux: second field of statm is resident pages
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(which: int, path: Path):
+    """
+    Runs in a child process: (seconds, extra peak RSS in MB) of one study.
+    """
+    fn = VARIANTS[which]
+    torch.set_num_threads(1)
+    logging.disable(logging.INFO)
+    fn(path)  # warm imports and allocator pools
+
+    baseline = current_rss()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, current_rss())
+            time.sleep(0.001)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    fn(path)
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    return elapsed, (peak - baseline) / 1e6
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    torch.set_num_threads(1)
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(SEED)
+    ctx = multiprocessing.get_context("spawn")
+    failures = 0
+
+    print(f"{SHAPE[0]}x{SHAPE[1]} frames, streamed in batches of {CHEST_FRAME_BATCH_SIZE}")
+    print(
+        f"{'frames':>6} {'eager ms':>9} {'stream ms':>10} "
+        f"{'eager MB':>9} {'stream MB':>10}  identical"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in FRAME_COUNTS:
+            path = Path(tmp) / f"study_{count}.dcm"
+            write_dicom(path, synthetic_frames(count, rng))
+
+            identical = torch.equal(eager_input(path), streamed_input(path))
+            failures += not identical
+
+            results = []
+            for which in (0, 1):
+                with ctx.Pool(1) as pool:
+                    results.append(pool.apply(measure, (which, path)))
+
+            (eager_s, eager_mb), (stream_s, stream_mb) = results
+            print(
+                f"{count:>6} {eager_s * 1000:>9.0f} {stream_s * 1000:>10.0f} "
+                f"{eager_mb:>9.0f} {stream_mb:>10.0f}  {'yes' if identical else 'NO'}"
+            )
+
+    print("(MB = extra peak resident memory of one study, imports excluded)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
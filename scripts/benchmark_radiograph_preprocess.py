@@ -0,0 +1,240 @@
+"""
+Chest / bone radiograph preprocessing: the shared tensor engine against
+the original per-route PIL path (float32 -> uint8 -> PIL RGB -> Resize ->
+ToTensor -> Normalize), on synthetic 3000x2500 radiographs.
+
+Reports per-image latency (best of RUNS), extra peak RSS of one call
+(measured in a fresh process, sampled every millisecond) and the max
+difference between the two outputs.
+
+Run from the repository root:
+    python scripts/benchmark_radiograph_preprocess.py
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pydicom
+import torch
+from PIL import Image
+from pydicom.dataset import FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, SecondaryCaptureImageStorage, generate_uid
+from scipy.ndimage import gaussian_filter
+from torchvision import transforms
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.bone.preprocess import preprocess_bone_image, preprocess_bone_images  # noqa: E402
+from backend.chest.preprocess import preprocess_chest_image, preprocess_chest_images  # noqa: E402
+from backend.image.radiograph import IMAGENET_MEAN, IMAGENET_STD, IMG_SIZE  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+SHAPE = (3000, 2500)
+RUNS = 3
+BATCH = 4
+
+# Resize rounding (and bone's float32 clip) may differ by one gray
+# level: 1 / 255 / min(std)
+ATOL = 1.0 / 255.0 / min(IMAGENET_STD) + 1e-5
+
+SEED = 0
+
+
+# =========================
+# REFERENCE (ORIGINAL PATH)
+# =========================
+
+_transform = transforms.Compose([
+    transforms.Resize((IMG_SIZE, IMG_SIZE)),
+    transforms.ToTensor(),
+    transforms.Normalize(IMAGENET_MEAN, IMAGENET_STD),
+])
+
+
+def _reference_pixels(path: Path) -> np.ndarray:
+    ds = pydicom.dcmread(path)
+    pixels = ds.pixel_array.astype(np.float32)
+    if hasattr(ds, "RescaleSlope"):
+        pixels *= float(ds.RescaleSlope)
+    if hasattr(ds, "RescaleIntercept"):
+        pixels += float(ds.RescaleIntercept)
+    return pixels
+
+
+def reference_chest(path: Path) -> torch.Tensor:
+    if path.suffix == ".png":
+        return _transform(Image.open(path).convert("RGB"))
+
+    pixels = _reference_pixels(path)
+    low, high = -600 - 1500 // 2, -600 + 1500 // 2
+    windowed = np.clip(pixels, low, high)
+    windowed = (windowed - low) / (high - low)
+    windowed = (windowed * 255.0).astype(np.uint8)
+    return _transform(Image.fromarray(windowed).convert("RGB"))
+
+
+def reference_bone(path: Path) -> torch.Tensor:
+    if path.suffix == ".png":
+        return _transform(Image.open(path).convert("RGB"))
+
+    pixels = _reference_pixels(path)
+    p1, p99 = np.percentile(pixels, (1, 99))
+    pixels = np.clip(pixels, p1, p99)
+    pixels = (pixels - p1) / (p99 - p1 + 1e-6)
+    pixels = (pixels * 255.0).astype(np.uint8)
+    return _transform(Image.fromarray(pixels).convert("RGB"))
+
+
+VARIANTS = {
+    "chest": (reference_chest, preprocess_chest_image, preprocess_chest_images),
+    "bone": (reference_bone, preprocess_bone_image, preprocess_bone_images),
+}
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def synthetic_radiograph(rng: np.random.Generator) -> np.ndarray:
+    """
+    Smooth 12-bit anatomy-like structure plus noise, built at low
+    resolution and upsampled so generation stays cheap.
+    """
+    coarse = gaussian_filter(rng.standard_normal((SHAPE[0] // 10, SHAPE[1] // 10)), sigma=4)
+    image = np.kron(coarse, np.ones((10, 10)))
+    image = (image - image.min()) / (image.max() - image.min()) * 3000
+    image += rng.normal(0, 40, SHAPE)
+    return np.clip(image, 0, 4095).astype(np.uint16)
+
+
+def write_dicom(path: Path, pixels: np.ndarray):
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = SecondaryCaptureImageStorage
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = pydicom.Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = meta.MediaStorageSOPClassUID
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.Modality = "DX"
+    ds.Rows, ds.Columns = pixels.shape
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.BitsAllocated = 16
+    ds.BitsStored = 12
+    ds.HighBit = 11
+    ds.PixelRepresentation = 0
+    ds.RescaleSlope = 1
+    ds.RescaleIntercept = -1024
+    ds.PixelData = pixels.tobytes()
+    ds.save_as(path, enforce_file_format=True)
+
+
+def write_inputs(directory: Path, rng: np.random.Generator) -> dict:
+    pixels = synthetic_radiograph(rng)
+
+    dicom = directory / "radiograph.dcm"
+    write_dicom(dicom, pixels)
+
+    png = directory / "radiograph.png"
+    Image.fromarray((pixels >> 4).astype(np.uint8)).save(png)
+
+    return {"dicom": dicom, "png": png}
+
+
+def best_of(fn, *args):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        value = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return value, min(timings)
+
+
+def current_rss() -> int:
+    # Linux: second field of statm is resident pages
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_peak(route: str, which: int, path: Path) -> float:
+    """
+    Runs in a child process: extra peak RSS (MB) of one preprocessing call.
+    """
+    fn = VARIANTS[route][which]
+    fn(path)  # warm imports and allocator pools
+
+    baseline = current_rss()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, current_rss())
+            time.sleep(0.001)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    fn(path)
+    done.set()
+    sampler.join()
+    return (peak - baseline) / 1e6
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(SEED)
+    ctx = multiprocessing.get_context("spawn")
+    failures = 0
+
+    print(
+        f"{'route':<6} {'input':<6} {'PIL ms':>8} {'tensor ms':>10} {'speedup':>8} "
+        f"{'PIL MB':>8} {'tensor MB':>10} {'max diff':>9}  ok"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = write_inputs(Path(tmp), rng)
+
+        for route, (reference, engine, batched) in VARIANTS.items():
+            for kind, path in inputs.items():
+                expected, ref_s = best_of(reference, path)
+                actual, new_s = best_of(engine, path)
+
+                peaks = []
+                for which in (0, 1):
+                    with ctx.Pool(1) as pool:
+                        peaks.append(pool.apply(measure_peak, (route, which, path)))
+
+                diff = (expected - actual).abs().max().item()
+                ok = actual.shape == expected.shape and diff <= ATOL
+                failures += not ok
+                print(
+                    f"{route:<6} {kind:<6} {ref_s * 1000:>8.1f} {new_s * 1000:>10.1f} "
+                    f"{ref_s / new_s:>7.1f}x {peaks[0]:>8.0f} {peaks[1]:>10.0f} "
+                    f"{diff:>9.4f}  {'yes' if ok else 'NO'}"
+                )
+
+            batch, batch_s = best_of(batched, [inputs["dicom"]] * BATCH)
+            failures += tuple(batch.shape) != (BATCH, 3, IMG_SIZE, IMG_SIZE)
+            print(f"{route:<6} batch of {BATCH} DICOMs: {batch_s / BATCH * 1000:.1f} ms per image")
+
+    print(f"(peak MB = extra resident memory of one call; tolerance {ATOL:.4f} = one gray level)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Parity + timing of the batched tensor gatekeeper preprocessing against
+the original per-slice PIL path (min-max -> uint8 -> PIL RGB -> Resize ->
+ToTensor -> Normalize), on synthetic slices of several sizes and dtypes.
+
+Run from the repository root:
+    python scripts/check_gatekeeper_preprocess_parity.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+from scipy.ndimage import gaussian_filter
+from torchvision import transforms
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.gatekeeper.preprocess import preprocess_slices  # noqa: E402
+from backend.image.radiograph import IMAGENET_MEAN, IMAGENET_STD, IMG_SIZE  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+CASES = [
+    ((240, 240), np.int16),
+    ((256, 256), np.uint16),
+    ((512, 512), np.float32),
+    ((155, 240), np.float64),
+    ((128, 128), np.uint8),
+]
+SLICES = 7
+
+# Resize rounding may differ by one gray level: 1 / 255 / min(std)
+ATOL = 1.0 / 255.0 / min(IMAGENET_STD) + 1e-5
+
+SEED = 0
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+_transform = transforms.Compose([
+    transforms.Resize((IMG_SIZE, IMG_SIZE)),
+    transforms.ToTensor(),
+    transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+])
+
+
+def reference_slice(slice_2d: np.ndarray) -> torch.Tensor:
+    """
+    The original PIL implementation of preprocess_slice.
+    """
+    slice_2d = slice_2d.astype(np.float32)
+    slice_2d -= slice_2d.min()
+    if slice_2d.max() > 0:
+        slice_2d /= slice_2d.max()
+    slice_2d *= 255.0
+    slice_2d = slice_2d.astype(np.uint8)
+
+    pil = Image.fromarray(slice_2d).convert("RGB")
+    return _transform(pil)
+
+
+def synthetic_slices(shape, dtype, rng: np.random.Generator) -> np.ndarray:
+    slices = np.stack([
+        gaussian_filter(rng.standard_normal(shape), sigma=3) for _ in range(SLICES)
+    ])
+    slices = (slices - slices.min()) / (slices.max() - slices.min()) * 1000
+    slices[0] = 0  # constant slice (no division)
+    return slices.astype(dtype)
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    rng = np.random.default_rng(SEED)
+    failures = 0
+
+    print(f"{'shape':<10} {'dtype':<8} {'max diff':>9} {'mean diff':>10} {'PIL ms':>8} {'tensor ms':>10}  ok")
+    for shape, dtype in CASES:
+        slices = synthetic_slices(shape, dtype, rng)
+
+        started = time.perf_counter()
+        expected = torch.stack([reference_slice(s) for s in slices])
+        pil_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = preprocess_slices(slices)
+        tensor_s = time.perf_counter() - started
+
+        diff = (expected - actual).abs()
+        ok = actual.shape == expected.shape and diff.max().item() <= ATOL
+        failures += not ok
+        print(
+            f"{'x'.join(map(str, shape)):<10} {np.dtype(dtype).name:<8} "
+            f"{diff.max().item():>9.4f} {diff.mean().item():>10.5f} "
+            f"{pil_s * 1000:>8.1f} {tensor_s * 1000:>10.1f}  {'yes' if ok else 'NO'}"
+        )
+
+    print(f"(tolerance {ATOL:.4f} = one gray level after normalization)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Parity + timing of the lookup-table intensity kernels
+(backend/image/intensity.py) against the original full-image float
+implementations they replace:
+
+- chest lung window (rescale -> clip -> scale -> uint8)
+- bone percentile clip (rescale -> np.percentile -> clip -> scale -> uint8)
+- gatekeeper per-slice min-max scaling
+- percentile_normalize from the extract_gatekeeper_* scripts
+
+on synthetic large radiographs of several integer dtypes. Every kernel
+must match its reference exactly.
+
+Run from the repository root:
+    python scripts/check_intensity_kernels.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from scipy.ndimage import gaussian_filter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.bone.preprocess import percentile_clip  # noqa: E402
+from backend.chest.preprocess import lung_window  # noqa: E402
+from backend.gatekeeper.preprocess import _minmax_gray_levels  # noqa: E402
+from backend.image.intensity import percentile_normalize  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+SHAPE = (3000, 2500)
+
+# (name, dtype, stored value range, rescale slope, rescale intercept)
+IMAGES = [
+    ("12-bit DX", np.uint16, (0, 4095), 1.0, -1024.0),
+    ("16-bit DX", np.uint16, (0, 65535), 0.5, 0.0),
+    ("signed CT", np.int16, (-1024, 3071), 1.0, 0.0),
+    ("8-bit PNG", np.uint8, (0, 255), 1.0, 0.0),
+]
+RUNS = 3
+
+SEED = 0
+
+
+# =========================
+# REFERENCE (ORIGINAL CODE)
+# =========================
+
+def rescaled(pixels, slope, intercept):
+    pixels = pixels.astype(np.float32)
+    pixels *= float(slope)
+    pixels += float(intercept)
+    return pixels
+
+
+def reference_lung_window(pixels, slope, intercept):
+    pixels = rescaled(pixels, slope, intercept)
+    low, high = -600 - 1500 // 2, -600 + 1500 // 2
+    windowed = np.clip(pixels, low, high)
+    windowed = (windowed - low) / (high - low)
+    return (windowed * 255.0).astype(np.uint8)
+
+
+def reference_percentile_clip(pixels, slope, intercept):
+    pixels = rescaled(pixels, slope, intercept)
+    p1, p99 = np.percentile(pixels, (1, 99))
+    pixels = np.clip(pixels, p1, p99)
+    pixels = (pixels - p1) / (p99 - p1 + 1e-6)
+    return (pixels * 255.0).astype(np.uint8)
+
+
+def reference_minmax(pixels):
+    x = torch.from_numpy(pixels.astype(np.float32))
+    x = x - x.min()
+    peak = x.max()
+    x = x / (peak if peak > 0 else 1.0)
+    return torch.floor(x * 255.0).to(torch.uint8).numpy()
+
+
+def reference_percentile_normalize(img):
+    img = img.astype(np.float32)
+    p1, p99 = np.percentile(img, (1, 99))
+    if p99 - p1 < 1e-5:
+        return None
+    img = np.clip(img, p1, p99)
+    img = 255 * (img - p1) / (p99 - p1)
+    return img.astype(np.uint8)
+
+
+def as_float32(values):
+    return values.astype(np.float32)
+
+
+def rescale_fn(slope, intercept):
+    return lambda values: rescaled(values, slope, intercept)
+
+
+KERNELS = {
+    "lung window": (
+        reference_lung_window,
+        lambda pixels, slope, intercept: lung_window(pixels, rescale_fn(slope, intercept)),
+    ),
+    "percentile clip": (
+        reference_percentile_clip,
+        lambda pixels, slope, intercept: percentile_clip(pixels, rescale_fn(slope, intercept)),
+    ),
+    "min-max": (
+        lambda pixels, *_: reference_minmax(pixels),
+        lambda pixels, *_: _minmax_gray_levels(pixels),
+    ),
+    "percentile norm": (
+        lambda pixels, *_: reference_percentile_normalize(pixels),
+        lambda pixels, *_: percentile_normalize(pixels, transform=as_float32),
+    ),
+}
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def synthetic_image(dtype, value_range, rng: np.random.Generator) -> np.ndarray:
+    """
+    Smooth structure spanning the value range plus noise, built at low
+    resolution and upsampled so generation stays cheap.
+    """
+    coarse = gaussian_filter(rng.standard_normal((SHAPE[0] // 10, SHAPE[1] // 10)), sigma=4)
+    image = np.kron(coarse, np.ones((10, 10)))
+    low, high = value_range
+    image = (image - image.min()) / (image.max() - image.min()) * (high - low) + low
+    image += rng.normal(0, (high - low) / 100, SHAPE)
+    return np.clip(np.rint(image), low, high).astype(dtype)
+
+
+def best_of(fn, *args):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        value = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return value, min(timings)
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(SEED)
+    failures = 0
+
+    print(f"{'image':<11} {'kernel':<16} {'float ms':>9} {'LUT ms':>8} {'speedup':>8}  identical")
+    for name, dtype, value_range, slope, intercept in IMAGES:
+        pixels = synthetic_image(dtype, value_range, rng)
+
+        for kernel, (reference, lut) in KERNELS.items():
+            expected, ref_s = best_of(reference, pixels, slope, intercept)
+            actual, lut_s = best_of(lut, pixels, slope, intercept)
+
+            identical = np.array_equal(expected, actual)
+            failures += not identical
+            print(
+                f"{name:<11} {kernel:<16} {ref_s * 1000:>9.1f} {lut_s * 1000:>8.1f} "
+                f"{ref_s / lut_s:>7.1f}x  {'yes' if identical else 'NO'}"
+            )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Parity report for reduced-resolution radiograph decode: chest / bone model
+input built from full-resolution pixels (decode_size=0, the previous path)
+against the reduced-scale path (DECODE_SIZE, the value to try for
+RADIOGRAPH_DECODE_SIZE, which is off by default), on synthetic 4096x4096
+inputs:
+
+- 12-bit uncompressed DICOM (full decode, block-averaged after the
+  intensity step)
+- 8-bit JPEG baseline DICOM (decoded at reduced scale via PIL draft for
+  chest; bone decodes it in full, as for uncompressed DICOM)
+- 8-bit grayscale PNG (PIL reduce on decode)
+
+Differences are reported in gray levels (0-255, before ImageNet
+normalization): max, mean and the share of model-input pixels within one
+gray level. Model outputs are not compared (weights are not part of the
+repository).
+
+Bone's 1/99 percentiles always come from full-resolution stored values
+(preprocess_radiographs(elementwise=False)); reduced pixels have narrower
+noise tails and would shift them.
+
+Run from the repository root:
+    python scripts/check_reduced_decode_parity.py
+"""
+
+import io
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pydicom
+import torch
+from PIL import Image
+from pydicom.dataset import FileMetaDataset
+from pydicom.encaps import encapsulate
+from pydicom.uid import (
+    ExplicitVRLittleEndian,
+    JPEGBaseline8Bit,
+    SecondaryCaptureImageStorage,
+    generate_uid,
+)
+from scipy.ndimage import gaussian_filter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.bone.preprocess import percentile_clip  # noqa: E402
+from backend.chest.preprocess import lung_window  # noqa: E402
+from backend.image.loaders import CaseContext  # noqa: E402
+from backend.image.radiograph import IMAGENET_MEAN, IMAGENET_STD, preprocess_radiographs  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+SHAPE = (4096, 4096)
+RUNS = 3
+JPEG_QUALITY = 95
+DECODE_SIZE = 448
+
+# Pass criteria, in gray levels
+MAX_MEAN_DIFF = 0.5
+MAX_DIFF = 4.0
+
+# route -> (intensity step, elementwise)
+ROUTES = {
+    "chest": (lung_window, True),
+    "bone": (percentile_clip, False),
+}
+
+SEED = 0
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def synthetic_radiograph(rng: np.random.Generator) -> np.ndarray:
+    """
+    Smooth 12-bit anatomy-like structure, a few sharp edges and noise.
+    """
+    coarse = gaussian_filter(rng.standard_normal((SHAPE[0] // 16, SHAPE[1] // 16)), sigma=4)
+    image = np.kron(coarse, np.ones((16, 16)))
+    image = (image - image.min()) / (image.max() - image.min()) * 2400 + 300
+    for row in range(SHAPE[0] // 8, SHAPE[0], SHAPE[0] // 4):
+        image[row:row + SHAPE[0] // 64] += 600  # bone-like bands
+    image += rng.normal(0, 40, SHAPE)
+    return np.clip(image, 0, 4095).astype(np.uint16)
+
+
+def _dataset(rows: int, columns: int, transfer_syntax) -> pydicom.Dataset:
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = SecondaryCaptureImageStorage
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = transfer_syntax
+
+    ds = pydicom.Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = meta.MediaStorageSOPClassUID
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.Modality = "DX"
+    ds.Rows, ds.Columns = rows, columns
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.PixelRepresentation = 0
+    return ds
+
+
+def write_dicom(path: Path, pixels: np.ndarray):
+    ds = _dataset(*pixels.shape, ExplicitVRLittleEndian)
+    ds.BitsAllocated = 16
+    ds.BitsStored = 12
+    ds.HighBit = 11
+    ds.RescaleSlope = 1
+    ds.RescaleIntercept = -1024
+    ds.PixelData = pixels.tobytes()
+    ds.save_as(path, enforce_file_format=True)
+
+
+def write_jpeg_dicom(path: Path, pixels: np.ndarray):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=JPEG_QUALITY)
+
+    ds = _dataset(*pixels.shape, JPEGBaseline8Bit)
+    ds.BitsAllocated = 8
+    ds.BitsStored = 8
+    ds.HighBit = 7
+    # Maps 8-bit stored values onto roughly the 12-bit HU range above
+    ds.RescaleSlope = 16
+    ds.RescaleIntercept = -1024
+    ds.PixelData = encapsulate([buffer.getvalue()])
+    ds["PixelData"].VR = "OB"
+    ds.save_as(path, enforce_file_format=True)
+
+
+def write_inputs(directory: Path, rng: np.random.Generator) -> dict:
+    pixels = synthetic_radiograph(rng)
+    gray = (pixels >> 4).astype(np.uint8)
+
+    inputs = {
+        "dicom": directory / "radiograph.dcm",
+        "jpeg dicom": directory / "radiograph_jpeg.dcm",
+        "png": directory / "radiograph.png",
+    }
+    write_dicom(inputs["dicom"], pixels)
+    write_jpeg_dicom(inputs["jpeg dicom"], gray)
+    Image.fromarray(gray).save(inputs["png"])
+    return inputs
+
+
+def gray_levels(batch: torch.Tensor) -> torch.Tensor:
+    mean = torch.tensor(IMAGENET_MEAN).view(1, 3, 1, 1)
+    std = torch.tensor(IMAGENET_STD).view(1, 3, 1, 1)
+    return (batch * std + mean) * 255.0
+
+
+def run(path: Path, intensity, elementwise: bool, route: str, decode_size: int):
+    """
+    Best-of-RUNS latency of one preprocessing call, fresh context each run.
+    """
+    file_type = "png" if path.suffix == ".png" else "dicom"
+    timings = []
+    for _ in range(RUNS):
+        context = CaseContext(path, file_type)
+        started = time.perf_counter()
+        batch = preprocess_radiographs(context, intensity, route, decode_size, elementwise)
+        timings.append(time.perf_counter() - started)
+    return batch, min(timings)
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    torch.set_num_threads(1)
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(SEED)
+    failures = 0
+
+    print(f"{SHAPE[0]}x{SHAPE[1]} inputs, decode size {DECODE_SIZE}")
+    print(
+        f"{'route':<6} {'input':<11} {'full ms':>8} {'reduced ms':>11} {'speedup':>8} "
+        f"{'max diff':>9} {'mean diff':>10} {'<=1 level':>10}  ok"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = write_inputs(Path(tmp), rng)
+
+        for route, (intensity, elementwise) in ROUTES.items():
+            for kind, path in inputs.items():
+                expected, full_s = run(path, intensity, elementwise, route, 0)
+                actual, reduced_s = run(path, intensity, elementwise, route, DECODE_SIZE)
+
+                diff = (gray_levels(expected) - gray_levels(actual)).abs()
+                max_diff, mean_diff = diff.max().item(), diff.mean().item()
+                within = (diff <= 1.0 + 1e-3).float().mean().item()
+
+                ok = mean_diff <= MAX_MEAN_DIFF and max_diff <= MAX_DIFF
+                failures += not ok
+                print(
+                    f"{route:<6} {kind:<11} {full_s * 1000:>8.1f} {reduced_s * 1000:>11.1f} "
+                    f"{full_s / reduced_s:>7.1f}x {max_diff:>9.2f} {mean_diff:>10.3f} "
+                    f"{within:>9.1%}  {'yes' if ok else 'NO'}"
+                )
+
+    print(f"(diffs in gray levels; pass: mean <= {MAX_MEAN_DIFF}, max <= {MAX_DIFF})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
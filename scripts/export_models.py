@@ -0,0 +1,93 @@
+"""
+Export the eager PyTorch checkpoints to TorchScript and ONNX and check
+that each exported artifact reproduces the eager outputs.
+
+Artifacts are written to EXPORT_DIR (backend/core/config.py); switch a
+model over with INFERENCE_BACKEND[name] = "torchscript" | "onnx".
+
+Run from the repository root:
+    python scripts/export_models.py
+"""
+
+import sys
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.runtime.backends import check_parity, export_model, load_backend_model  # noqa: E402
+from backend.gatekeeper.model import build_gatekeeper_model  # noqa: E402
+from backend.chest.infer import build_chest_model  # noqa: E402
+from backend.bone.infer import build_bone_model  # noqa: E402
+from backend.brain.infer import build_brain_model  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+MODELS = ["gatekeeper", "chest", "bone", "brain"]
+BACKENDS = ["torchscript", "onnx"]
+
+# Parity is checked on random input at this batch size, so the dynamic
+# batch axis is exercised as well (models are exported with batch 1)
+PARITY_BATCH_SIZE = 2
+
+# Max absolute difference allowed on raw logits
+PARITY_ATOL = {
+    "gatekeeper": 1e-4,
+    "chest": 1e-4,
+    "bone": 1e-4,
+    "brain": 1e-3,
+}
+
+DEVICE = torch.device("cpu")
+
+EAGER_BUILDERS = {
+    "gatekeeper": build_gatekeeper_model,
+    "chest": build_chest_model,
+    "bone": build_bone_model,
+    "brain": build_brain_model,
+}
+
+
+# =========================
+# MAIN
+# =========================
+
+def main() -> int:
+    failures = 0
+
+    for name in MODELS:
+        eager = EAGER_BUILDERS[name](DEVICE)
+
+        for backend in BACKENDS:
+            try:
+                export_model(name, eager, backend)
+                candidate = load_backend_model(name, backend, DEVICE)
+                report = check_parity(
+                    name,
+                    eager,
+                    candidate,
+                    batch_size=PARITY_BATCH_SIZE,
+                    atol=PARITY_ATOL[name],
+                )
+            except Exception as e:
+                print(f"{name:<11} {backend:<12} FAILED: {e}")
+                failures += 1
+                continue
+
+            status = "ok" if report["ok"] else "MISMATCH"
+            failures += not report["ok"]
+            print(
+                f"{name:<11} {backend:<12} {status:<9}"
+                f"max_abs={report['max_abs_diff']:.2e}  "
+                f"mean_abs={report['mean_abs_diff']:.2e}  "
+                f"(atol {report['atol']:.0e})"
+            )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import sys
 import numpy as np
 import nibabel as nib
 from PIL import Image
@@ -6,6 +7,10 @@ from pathlib import Path
 import csv
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.image.intensity import percentile_normalize  # noqa: E402
+
 # =========================
 # CONFIG (EDIT CAREFULLY)
 # =========================
@@ -30,15 +35,6 @@ MIN_NONZERO_RATIO = 0.05  # ≥ 5% non‑zero pixels
 # UTILITY FUNCTIONS
 # =========================
 
-def percentile_normalize(slice_2d: np.ndarray) -> np.ndarray | None:
-    p1, p99 = np.percentile(slice_2d, (1, 99))
-    if p99 - p1 < 1e-5:
-        return None
-    slice_2d = np.clip(slice_2d, p1, p99)
-    slice_2d = 255 * (slice_2d - p1) / (p99 - p1)
-    return slice_2d.astype(np.uint8)
-
-
 def resize_with_padding(img: Image.Image, target: int) -> Image.Image:
     w, h = img.size
     scale = target / max(w, h)
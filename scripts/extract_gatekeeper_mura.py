@@ -1,9 +1,14 @@
 import os
+import sys
 import numpy as np
 from PIL import Image
 from pathlib import Path
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.image.intensity import percentile_normalize  # noqa: E402
+
 # ================= CONFIG =================
 RAW_MURA_DIR = r"C:\Users\delta\Datasets\SPECTRA\mura\train"
 OUTPUT_DIR = r"C:\Users\delta\Datasets\SPECTRA\processed_data\mura"
@@ -14,14 +19,8 @@ MIN_NONZERO_RATIO = 0.05
 PREFERRED_PARTS = ["forearm", "humerus", "femur", "tibia"]
 # =========================================
 
-def percentile_normalize(img):
-    img = img.astype(np.float32)
-    p1, p99 = np.percentile(img, (1, 99))
-    if p99 - p1 < 1e-5:
-        return None
-    img = np.clip(img, p1, p99)
-    img = 255 * (img - p1) / (p99 - p1)
-    return img.astype(np.uint8)
+def as_float32(values):
+    return values.astype(np.float32)
 
 def resize_pad(img):
     h, w = img.shape
@@ -58,7 +57,7 @@ def main():
             img = Image.open(path).convert("L")
             img = np.array(img)
 
-            img = percentile_normalize(img)
+            img = percentile_normalize(img, transform=as_float32)
             if img is None or not passes_quality(img):
                 continue
 
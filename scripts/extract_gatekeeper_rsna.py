@@ -1,10 +1,15 @@
 import os
+import sys
 import numpy as np
 import pydicom
 from PIL import Image
 from pathlib import Path
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.image.intensity import percentile_normalize  # noqa: E402
+
 # ================= CONFIG =================
 RAW_RSNA_DIR = r"C:\Users\delta\Datasets\SPECTRA\rsna\stage_2_train_images"
 OUTPUT_DIR = r"C:\Users\delta\Datasets\SPECTRA\data_for_gatekeeper\rsna"
@@ -20,13 +25,17 @@ def apply_lung_window(img, center, width):
     hi = center + width // 2
     return np.clip(img, lo, hi)
 
-def percentile_normalize(img):
-    p1, p99 = np.percentile(img, (1, 99))
-    if p99 - p1 < 1e-5:
-        return None
-    img = np.clip(img, p1, p99)
-    img = 255 * (img - p1) / (p99 - p1)
-    return img.astype(np.uint8)
+def windowed(ds):
+    """
+    Stored values -> rescaled, lung-windowed values (elementwise, so the
+    shared kernels can evaluate it once per stored value).
+    """
+    def transform(values):
+        img = values.astype(np.float32)
+        if hasattr(ds, "RescaleSlope"):
+            img = img * ds.RescaleSlope + ds.RescaleIntercept
+        return apply_lung_window(img, WINDOW_CENTER, WINDOW_WIDTH)
+    return transform
 
 def resize_pad(img):
     h, w = img.shape
@@ -47,13 +56,7 @@ def main():
 
         try:
             ds = pydicom.dcmread(path)
-            img = ds.pixel_array.astype(np.float32)
-
-            if hasattr(ds, "RescaleSlope"):
-                img = img * ds.RescaleSlope + ds.RescaleIntercept
-
-            img = apply_lung_window(img, WINDOW_CENTER, WINDOW_WIDTH)
-            img = percentile_normalize(img)
+            img = percentile_normalize(ds.pixel_array, transform=windowed(ds))
             if img is None:
                 continue
 
@@ -0,0 +1,171 @@
+"""
+INT8 post-training quantization of the 2D classifiers (gatekeeper,
+chest, bone) for CPU inference.
+
+Each model is calibrated on a folder of sample PNG/DICOM inputs
+(<calibration dir>/<model>/, CALIBRATION_DIR by default) run through
+its own production preprocessing, saved to EXPORT_DIR, and
+compared against FP32 on the same inputs:
+  - latency (median ms per batch)
+  - weight memory (FP32 parameters vs int8 artifact)
+  - agreement (top-1 match rate, max / mean probability difference)
+
+The report is printed and written to EXPORT_DIR/int8_report.json.
+Enable a model with INFERENCE_BACKEND[name] = "int8".
+
+Run from the repository root:
+    python scripts/quantize_models.py [--calibration-dir DIR]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+import torch.nn.functional as F
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.core.config import CALIBRATION_DIR, EXPORT_DIR  # noqa: E402
+from backend.ingestion.detect import detect_file_type  # noqa: E402
+from backend.runtime.backends import load_backend_model, quantize_model  # noqa: E402
+from backend.runtime.registry import model_nbytes  # noqa: E402
+from backend.gatekeeper.model import build_gatekeeper_model  # noqa: E402
+from backend.gatekeeper.preprocess import preprocess_gatekeeper  # noqa: E402
+from backend.chest.infer import build_chest_model  # noqa: E402
+from backend.chest.preprocess import preprocess_chest_image  # noqa: E402
+from backend.bone.infer import build_bone_model  # noqa: E402
+from backend.bone.preprocess import preprocess_bone_image  # noqa: E402
+
+# =========================
+# CONFIG (EDIT CAREFULLY)
+# =========================
+
+MAX_FILES = 200        # per model
+BATCH_SIZE = 16
+TIMED_RUNS = 10
+
+DEVICE = torch.device("cpu")
+
+MODELS = {
+    "gatekeeper": (
+        build_gatekeeper_model,
+        lambda path: preprocess_gatekeeper(path, detect_file_type(path)),
+    ),
+    "chest": (build_chest_model, lambda path: preprocess_chest_image(path).unsqueeze(0)),
+    "bone": (build_bone_model, lambda path: preprocess_bone_image(path).unsqueeze(0)),
+}
+
+
+# =========================
+# UTILITY FUNCTIONS
+# =========================
+
+def load_inputs(name: str, folder: Path) -> torch.Tensor:
+    """
+    All calibration samples of one model as a single (N, 3, 224, 224) tensor.
+    """
+    _, preprocess = MODELS[name]
+    files = sorted(
+        p for p in folder.iterdir()
+        if p.suffix.lower() in (".png", ".dcm")
+    )[:MAX_FILES]
+
+    tensors = []
+    for path in files:
+        try:
+            tensors.append(preprocess(path))
+        except Exception as e:
+            print(f"  skipping {path.name}: {e}")
+
+    if not tensors:
+        raise ValueError(f"No usable calibration inputs in {folder}")
+    return torch.cat(tensors, dim=0)
+
+
+def predict(model: torch.nn.Module, inputs: torch.Tensor) -> torch.Tensor:
+    with torch.no_grad():
+        return torch.cat(
+            [F.softmax(model(batch), dim=1) for batch in inputs.split(BATCH_SIZE)]
+        )
+
+
+def median_latency_ms(model: torch.nn.Module, batch: torch.Tensor) -> float:
+    timings = []
+    with torch.no_grad():
+        model(batch)
+        for _ in range(TIMED_RUNS):
+            started = time.perf_counter()
+            model(batch)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 quantization of the 2D classifiers")
+    parser.add_argument(
+        "--calibration-dir",
+        type=Path,
+        default=CALIBRATION_DIR,
+        help="folder with one subfolder of sample inputs per model (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    report = {}
+
+    for name, (build, _) in MODELS.items():
+        print(f"{name}: loading calibration inputs")
+        try:
+            inputs = load_inputs(name, args.calibration_dir / name)
+        except Exception as e:
+            print(f"{name}: skipped ({e})")
+            continue
+
+        fp32 = build(DEVICE)
+        quantize_model(name, fp32, inputs.split(BATCH_SIZE))
+        int8 = load_backend_model(name, "int8", DEVICE)
+
+        fp32_probs = predict(fp32, inputs)
+        int8_probs = predict(int8, inputs)
+        diff = (fp32_probs - int8_probs).abs()
+        batch = inputs[:BATCH_SIZE]
+
+        report[name] = {
+            "samples": len(inputs),
+            "fp32_ms": median_latency_ms(fp32, batch),
+            "int8_ms": median_latency_ms(int8, batch),
+            "fp32_mb": model_nbytes(fp32) / 1e6,
+            "int8_mb": model_nbytes(int8) / 1e6,
+            "top1_agreement": (
+                fp32_probs.argmax(dim=1) == int8_probs.argmax(dim=1)
+            ).float().mean().item(),
+            "max_prob_diff": diff.max().item(),
+            "mean_prob_diff": diff.mean().item(),
+        }
+
+    print()
+    print(
+        f"{'model':<11} {'n':>5} {'fp32 ms':>8} {'int8 ms':>8} {'speedup':>8} "
+        f"{'fp32 MB':>8} {'int8 MB':>8} {'top-1':>7} {'max dp':>7} {'mean dp':>8}"
+    )
+    for name, r in report.items():
+        print(
+            f"{name:<11} {r['samples']:>5} {r['fp32_ms']:>8.1f} {r['int8_ms']:>8.1f} "
+            f"{r['fp32_ms'] / r['int8_ms']:>7.2f}x "
+            f"{r['fp32_mb']:>8.1f} {r['int8_mb']:>8.1f} "
+            f"{r['top1_agreement']:>7.1%} {r['max_prob_diff']:>7.3f} {r['mean_prob_diff']:>8.4f}"
+        )
+    print(f"(latency at batch size {BATCH_SIZE})")
+
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    (EXPORT_DIR / "int8_report.json").write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()